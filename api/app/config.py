@@ -11,3 +11,12 @@ PROJECT_NAME: str = "docTR API template"
 PROJECT_DESCRIPTION: str = "Template API for Optical Character Recognition"
 VERSION: str = doctr.__version__
 DEBUG: bool = os.environ.get("DEBUG", "") != "False"
+# Predictor cache: maximum number of predictors kept in memory and their overall weight budget (in MB)
+PREDICTOR_CACHE_SIZE: int = int(os.environ.get("PREDICTOR_CACHE_SIZE", 4))
+PREDICTOR_CACHE_MEMORY: int = int(os.environ.get("PREDICTOR_CACHE_MEMORY", 4096))
+# Load (and run once) the default predictors when the server starts
+WARMUP_PREDICTORS: bool = os.environ.get("WARMUP_PREDICTORS", "") != "False"
+# Maximum time (in ms) a request waits for concurrent requests to fill its batch
+BATCH_MAX_DELAY: float = float(os.environ.get("BATCH_MAX_DELAY", 10))
+# Record the time spent in each stage of the predictors, exposed by the metrics routes (disabled by default)
+PROFILING: bool = os.environ.get("PROFILING", "") == "True"
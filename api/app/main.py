@@ -9,16 +9,31 @@ from fastapi import FastAPI, Request
 from fastapi.openapi.utils import get_openapi
 
 from app import config as cfg
-from app.routes import detection, kie, ocr, recognition
+from app.routes import detection, kie, metrics, ocr, recognition
+from app.scheduler import scheduler
+from app.vision import warmup_predictors
 
 app = FastAPI(title=cfg.PROJECT_NAME, description=cfg.PROJECT_DESCRIPTION, debug=cfg.DEBUG, version=cfg.VERSION)
 
 
+# Lifecycle
+@app.on_event("startup")
+def load_predictors():
+    if cfg.WARMUP_PREDICTORS:
+        warmup_predictors()
+
+
+@app.on_event("shutdown")
+def stop_scheduler():
+    scheduler.shutdown()
+
+
 # Routing
 app.include_router(recognition.router, prefix="/recognition", tags=["recognition"])
 app.include_router(detection.router, prefix="/detection", tags=["detection"])
 app.include_router(ocr.router, prefix="/ocr", tags=["ocr"])
 app.include_router(kie.router, prefix="/kie", tags=["kie"])
+app.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
 
 
 # Middleware
@@ -7,6 +7,7 @@ from typing import List
 
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
 
+from app.scheduler import scheduler
 from app.schemas import DetectionIn, DetectionOut
 from app.utils import get_documents, resolve_geometry
 from app.vision import init_predictor
@@ -24,6 +25,8 @@ async def text_detection(request: DetectionIn = Depends(), files: List[UploadFil
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+    out = await scheduler.submit(predictor, content)
+
     return [
         DetectionOut(
             name=filename,
@@ -31,5 +34,5 @@ async def text_detection(request: DetectionIn = Depends(), files: List[UploadFil
                 geom[:-1].tolist() if len(geom) == 5 else resolve_geometry(geom.tolist()) for geom in doc[CLASS_NAME]
             ],
         )
-        for doc, filename in zip(predictor(content), filenames)
+        for doc, filename in zip(out, filenames)
     ]
@@ -7,6 +7,7 @@ from typing import List
 
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
 
+from app.scheduler import scheduler
 from app.schemas import KIEElement, KIEIn, KIEOut
 from app.utils import get_documents, resolve_geometry
 from app.vision import init_predictor
@@ -23,7 +24,7 @@ async def perform_kie(request: KIEIn = Depends(), files: List[UploadFile] = [Fil
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-    out = predictor(content)
+    out = await scheduler.submit(predictor, content)
 
     results = [
         KIEOut(
@@ -0,0 +1,74 @@
+# Copyright (C) 2021-2024, Mindee.
+
+# This program is licensed under the Apache License 2.0.
+# See LICENSE or go to <https://opensource.org/licenses/Apache-2.0> for full license details.
+
+from typing import List
+
+from fastapi import APIRouter, status
+from fastapi.responses import PlainTextResponse
+
+from app.scheduler import scheduler
+from app.schemas import MetricsOut
+
+router = APIRouter()
+
+
+@router.get("/", response_model=MetricsOut, status_code=status.HTTP_200_OK, summary="Get the batching metrics")
+async def get_metrics():
+    """Returns the state of the request batching queue and the time spent in each stage of the predictors
+
+    The stages are only recorded when the server runs with the `PROFILING=True` environment variable.
+    """
+    return MetricsOut(**scheduler.metrics())
+
+
+@router.get(
+    "/prometheus",
+    response_class=PlainTextResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get the metrics in the Prometheus text format",
+)
+async def get_prometheus_metrics():
+    """Returns the metrics in the Prometheus text exposition format
+
+    The stage metrics are only recorded when the server runs with the `PROFILING=True` environment variable.
+    """
+    metrics = scheduler.metrics()
+    lines: List[str] = []
+    for name, kind, help in (
+        ("queue_depth", "gauge", "Number of pages waiting to be processed"),
+        ("batches", "counter", "Number of batches processed"),
+        ("pages", "counter", "Number of pages processed"),
+        ("fill_ratio", "gauge", "Average fill ratio of the batches"),
+        ("last_fill_ratio", "gauge", "Fill ratio of the last batch"),
+    ):
+        lines += [f"# HELP doctr_{name} {help}", f"# TYPE doctr_{name} {kind}", f"doctr_{name} {metrics[name]}"]
+
+    stages = metrics["stages"]
+    lines += ["# HELP doctr_stage_calls_total Number of calls of each stage", "# TYPE doctr_stage_calls_total counter"]
+    lines += [f'doctr_stage_calls_total{{stage="{stage}"}} {stats["calls"]}' for stage, stats in stages.items()]
+    lines += [
+        "# HELP doctr_stage_seconds_total Time spent in each stage",
+        "# TYPE doctr_stage_seconds_total counter",
+    ]
+    lines += [f'doctr_stage_seconds_total{{stage="{stage}"}} {stats["time"]}' for stage, stats in stages.items()]
+    lines += [
+        "# HELP doctr_stage_items_total Number of items processed by each stage",
+        "# TYPE doctr_stage_items_total counter",
+    ]
+    lines += [
+        f'doctr_stage_items_total{{stage="{stage}",item="{item}"}} {count}'
+        for stage, stats in stages.items()
+        for item, count in stats["counts"].items()
+    ]
+    lines += [
+        "# HELP doctr_stage_peak_memory_bytes Peak resident memory of the process at the end of each stage",
+        "# TYPE doctr_stage_peak_memory_bytes gauge",
+    ]
+    lines += [
+        f'doctr_stage_peak_memory_bytes{{stage="{stage}"}} {stats["peak_memory"]}'
+        for stage, stats in stages.items()
+        if stats["peak_memory"] is not None
+    ]
+    return PlainTextResponse("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4")
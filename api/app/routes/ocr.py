@@ -5,10 +5,11 @@
 
 from typing import List
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from fastapi import APIRouter, Depends, File, HTTPException, Response, UploadFile, status
 
-from app.schemas import OCRBlock, OCRIn, OCRLine, OCROut, OCRPage, OCRWord
-from app.utils import get_documents, resolve_geometry
+from app.scheduler import scheduler
+from app.schemas import OCRIn, OCROut
+from app.utils import get_documents, ocr_page_as_json
 from app.vision import init_predictor
 
 router = APIRouter()
@@ -24,41 +25,10 @@ async def perform_ocr(request: OCRIn = Depends(), files: List[UploadFile] = [Fil
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-    out = predictor(content)
+    out = await scheduler.submit(predictor, content)
 
-    results = [
-        OCROut(
-            name=filenames[i],
-            orientation=page.orientation,
-            language=page.language,
-            dimensions=page.dimensions,
-            items=[
-                OCRPage(
-                    blocks=[
-                        OCRBlock(
-                            geometry=resolve_geometry(block.geometry),
-                            lines=[
-                                OCRLine(
-                                    geometry=resolve_geometry(line.geometry),
-                                    words=[
-                                        OCRWord(
-                                            value=word.value,
-                                            geometry=resolve_geometry(word.geometry),
-                                            confidence=round(word.confidence, 2),
-                                            crop_orientation=word.crop_orientation,
-                                        )
-                                        for word in line.words
-                                    ],
-                                )
-                                for line in block.lines
-                            ],
-                        )
-                        for block in page.blocks
-                    ]
-                )
-            ],
-        )
-        for i, page in enumerate(out.pages)
-    ]
-
-    return results
+    # Write the JSON from the pages, rather than validating one pydantic model per word
+    return Response(
+        content="[" + ",".join(ocr_page_as_json(filenames[i], page) for i, page in enumerate(out.pages)) + "]",
+        media_type="application/json",
+    )
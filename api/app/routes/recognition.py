@@ -7,6 +7,7 @@ from typing import List
 
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
 
+from app.scheduler import scheduler
 from app.schemas import RecognitionIn, RecognitionOut
 from app.utils import get_documents
 from app.vision import init_predictor
@@ -24,7 +25,10 @@ async def text_recognition(request: RecognitionIn = Depends(), files: List[Uploa
         content, filenames = await get_documents(files)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+
+    out = await scheduler.submit(predictor, content)
+
     return [
         RecognitionOut(name=filename, value=res[0], confidence=round(res[1], 2))
-        for res, filename in zip(predictor(content), filenames)
+        for res, filename in zip(out, filenames)
     ]
@@ -0,0 +1,211 @@
+# Copyright (C) 2021-2024, Mindee.
+
+# This program is licensed under the Apache License 2.0.
+# See LICENSE or go to <https://opensource.org/licenses/Apache-2.0> for full license details.
+
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from contextvars import Context, copy_context
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional
+
+from doctr.io.elements import Document
+from doctr.utils.profiling import Profiler
+
+from . import config as cfg
+from .vision import REQUEST_THRESHOLDS
+
+
+class _Job:
+    """Pages of a single request waiting to be processed"""
+
+    def __init__(
+        self,
+        predictor: Callable,
+        pages: List[Any],
+        key: Hashable,
+        batch_size: int,
+        context: Context,
+        future: asyncio.Future,
+    ) -> None:
+        self.predictor = predictor
+        self.pages = pages
+        self.key = key
+        self.batch_size = batch_size
+        self.context = context
+        self.future = future
+        self.arrival = time.monotonic()
+
+
+def _batch_size(predictor: Any) -> int:
+    # End-to-end predictors are bounded by their detection batches, the other ones by their own preprocessor
+    if hasattr(predictor, "det_predictor"):
+        return predictor.det_predictor.pre_processor.batch_size
+    return predictor.pre_processor.batch_size
+
+
+def _split(out: Any, sizes: List[int]) -> List[Any]:
+    """Scatter the output of a predictor over the requests of a batch"""
+    results, start = [], 0
+    for size in sizes:
+        if isinstance(out, Document):
+            pages = out.pages[start : start + size]
+            for idx, page in enumerate(pages):
+                page.page_idx = idx
+            results.append(type(out)(pages=pages))
+        else:
+            results.append(out[start : start + size])
+        start += size
+    return results
+
+
+def _resolve(future: asyncio.Future, result: Any = None, exception: Optional[BaseException] = None) -> None:
+    if future.cancelled():
+        return
+    if exception is None:
+        future.set_result(result)
+    else:
+        future.set_exception(exception)
+
+
+class BatchScheduler:
+    """Coalesces the pages of concurrent requests into shared batches, which are run by a worker thread
+
+    Args:
+    ----
+        max_delay: maximum time (in ms) a request waits for other requests to fill its batch
+        profiling: whether the stages of the predictors should be profiled
+    """
+
+    def __init__(self, max_delay: float = 10.0, profiling: bool = False) -> None:
+        self.max_delay = max_delay / 1000
+        self.profiler = Profiler() if profiling else None
+        self._jobs: Deque[_Job] = deque()
+        self._condition = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+        self._running = False
+        # Metrics
+        self._batches = 0
+        self._pages = 0
+        self._capacity = 0
+        self._last_fill_ratio = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of pages waiting to be processed"""
+        with self._condition:
+            return sum(len(job.pages) for job in self._jobs)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Export the scheduler metrics as a dictionary"""
+        with self._condition:
+            return dict(
+                queue_depth=sum(len(job.pages) for job in self._jobs),
+                batches=self._batches,
+                pages=self._pages,
+                fill_ratio=self._pages / self._capacity if self._capacity > 0 else 0.0,
+                last_fill_ratio=self._last_fill_ratio,
+                stages=self.profiler.export() if self.profiler is not None else {},
+            )
+
+    def start(self) -> None:
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+            self._worker = threading.Thread(target=self._run, name="batch-scheduler", daemon=True)
+            self._worker.start()
+
+    def shutdown(self) -> None:
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._worker is not None:
+            self._worker.join()
+            self._worker = None
+
+    async def submit(self, predictor: Callable, pages: List[Any]) -> Any:
+        """Queue the pages of a request and wait for the predictor output on those pages
+
+        Args:
+        ----
+            predictor: the predictor to run on the pages
+            pages: list of pages (or crops for recognition predictors)
+
+        Returns:
+        -------
+            the output of the predictor for those pages only
+        """
+        self.start()
+        # Only requests sharing both the predictor and the detection thresholds can be batched together
+        key = (id(predictor), tuple(sorted(REQUEST_THRESHOLDS.get().items())))
+        future = asyncio.get_running_loop().create_future()
+        job = _Job(predictor, pages, key, _batch_size(predictor), copy_context(), future)
+        with self._condition:
+            self._jobs.append(job)
+            self._condition.notify_all()
+        return await future
+
+    def _next_batch(self) -> List[_Job]:
+        with self._condition:
+            while self._running and not self._jobs:
+                self._condition.wait()
+            if not self._running:
+                return []
+            # The oldest request sets the batch configuration and its deadline
+            first = self._jobs[0]
+            deadline = first.arrival + self.max_delay
+            while self._running:
+                num_pages = sum(len(job.pages) for job in self._jobs if job.key == first.key)
+                remaining = deadline - time.monotonic()
+                if num_pages >= first.batch_size or remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+            batch: List[_Job] = []
+            num_pages = 0
+            for job in list(self._jobs):
+                if job.key != first.key:
+                    continue
+                if batch and num_pages + len(job.pages) > first.batch_size:
+                    break
+                batch.append(job)
+                num_pages += len(job.pages)
+            for job in batch:
+                self._jobs.remove(job)
+            return batch
+
+    def _predict(self, predictor: Callable, pages: List[Any]) -> Any:
+        if self.profiler is None:
+            return predictor(pages)
+        with self.profiler:
+            return predictor(pages)
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                return
+            sizes = [len(job.pages) for job in batch]
+            pages = [page for job in batch for page in job.pages]
+            try:
+                # Run in the context of a request to apply its detection thresholds
+                out = batch[0].context.run(self._predict, batch[0].predictor, pages)
+                results = _split(out, sizes)
+            except Exception as e:
+                for job in batch:
+                    job.future.get_loop().call_soon_threadsafe(_resolve, job.future, None, e)
+                continue
+            for job, result in zip(batch, results):
+                job.future.get_loop().call_soon_threadsafe(_resolve, job.future, result)
+            # Update metrics
+            capacity = math.ceil(len(pages) / batch[0].batch_size) * batch[0].batch_size
+            with self._condition:
+                self._batches += 1
+                self._pages += len(pages)
+                self._capacity += capacity
+                self._last_fill_ratio = len(pages) / capacity if capacity > 0 else 0.0
+
+
+scheduler = BatchScheduler(cfg.BATCH_MAX_DELAY, cfg.PROFILING)
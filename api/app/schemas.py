@@ -3,7 +3,7 @@
 # This program is licensed under the Apache License 2.0.
 # See LICENSE or go to <https://opensource.org/licenses/Apache-2.0> for full license details.
 
-from typing import Any, Dict, List, Tuple, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from pydantic import BaseModel, Field
 
@@ -77,6 +77,12 @@ class OCRLine(BaseModel):
     )
 
 
+class OCRArtefact(BaseModel):
+    geometry: List[float] = Field(..., examples=[[0.0, 0.0, 0.0, 0.0]])
+    type: str = Field(..., examples=["qr_code"])
+    confidence: float = Field(..., examples=[0.99])
+
+
 class OCRBlock(BaseModel):
     geometry: List[float] = Field(..., examples=[[0.0, 0.0, 0.0, 0.0]])
     lines: List[OCRLine] = Field(
@@ -95,6 +101,7 @@ class OCRBlock(BaseModel):
             }
         ],
     )
+    artefacts: List[OCRArtefact] = Field(default=[], examples=[[]])
 
 
 class OCRPage(BaseModel):
@@ -170,3 +177,23 @@ class KIEOut(BaseModel):
     language: Dict[str, Union[str, float, None]] = Field(..., examples=[{"value": "en", "confidence": 0.99}])
     dimensions: Tuple[int, int] = Field(..., examples=[(100, 100)])
     predictions: List[KIEElement]
+
+
+class StageOut(BaseModel):
+    calls: int = Field(..., examples=[2])
+    time: float = Field(..., examples=[0.4])
+    counts: Dict[str, int] = Field(..., examples=[{"pages": 4}])
+    shapes: Dict[str, int] = Field(..., examples=[{"2x3x1024x1024": 2}])
+    peak_memory: Optional[int] = Field(None, examples=[1073741824])
+
+
+class MetricsOut(BaseModel):
+    queue_depth: int = Field(..., examples=[0])
+    batches: int = Field(..., examples=[10])
+    pages: int = Field(..., examples=[18])
+    fill_ratio: float = Field(..., examples=[0.9])
+    last_fill_ratio: float = Field(..., examples=[1.0])
+    stages: Dict[str, StageOut] = Field(
+        default_factory=dict,
+        examples=[{"det_forward": {"calls": 2, "time": 0.4, "counts": {"pages": 4}, "shapes": {"2x3x1024x1024": 2}}}],
+    )
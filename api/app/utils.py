@@ -3,13 +3,13 @@
 # This program is licensed under the Apache License 2.0.
 # See LICENSE or go to <https://opensource.org/licenses/Apache-2.0> for full license details.
 
-
+import json
 from typing import Any, List, Tuple, Union
 
 import numpy as np
 from fastapi import UploadFile
 
-from doctr.io import DocumentFile
+from doctr.io import DocumentFile, Page
 
 
 def resolve_geometry(
@@ -20,6 +20,39 @@ def resolve_geometry(
     return (*geom[0], *geom[1])
 
 
+def _json_default(obj: Any) -> Any:
+    # Page attributes may hold numpy scalars (e.g. the orientation)
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
+
+
+def ocr_page_as_json(name: str, page: Page) -> str:
+    """Serialize the OCR result of a page in the `OCROut` format, straight from the page elements
+
+    Args:
+    ----
+        name: name of the file the page comes from
+        page: OCR result of the page
+
+    Returns:
+    -------
+        the JSON string
+    """
+    header = json.dumps(
+        {
+            "name": name,
+            "orientation": page.orientation,
+            "language": page.language,
+            "dimensions": page.dimensions,
+        },
+        separators=(",", ":"),
+        default=_json_default,
+    )
+    blocks = ",".join(block.export_as_json(flatten_geometry=True, precision=2) for block in page.blocks)
+    return f'{header[:-1]},"items":[{{"blocks":[{blocks}]}}]}}'
+
+
 async def get_documents(files: List[UploadFile]) -> Tuple[List[np.ndarray], List[str]]:  # pragma: no cover
     """Convert a list of UploadFile objects to lists of numpy arrays and their corresponding filenames
 
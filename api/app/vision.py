@@ -10,12 +10,132 @@ gpu_devices = tf.config.experimental.list_physical_devices("GPU")
 if any(gpu_devices):
     tf.config.experimental.set_memory_growth(gpu_devices[0], True)
 
-from typing import Callable, Union
+import copy
+import threading
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Hashable, Tuple, Union
+
+import numpy as np
 
 from doctr.models import kie_predictor, ocr_predictor
 
+from . import config as cfg
 from .schemas import DetectionIn, KIEIn, OCRIn, RecognitionIn
 
+# Detection thresholds of the request being processed (each asyncio task works on its own copy of the context)
+REQUEST_THRESHOLDS: ContextVar[Dict[str, float]] = ContextVar("thresholds", default={})
+
+
+class _RequestPostProcessor:
+    """Wraps a shared detection postprocessor so that the thresholds of the current request are used
+    without modifying the wrapped object
+
+    Args:
+    ----
+        postprocessor: the detection postprocessor to wrap
+    """
+
+    def __init__(self, postprocessor: Any) -> None:
+        self._postprocessor = postprocessor
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "_postprocessor":
+            raise AttributeError(name)
+        thresholds = REQUEST_THRESHOLDS.get()
+        if name in thresholds:
+            return thresholds[name]
+        return getattr(self._postprocessor, name)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        thresholds = REQUEST_THRESHOLDS.get()
+        if not thresholds:
+            return self._postprocessor(*args, **kwargs)
+        # Postprocessors are lightweight: a shallow copy is enough to isolate the thresholds
+        postprocessor = copy.copy(self._postprocessor)
+        for name, value in thresholds.items():
+            setattr(postprocessor, name, value)
+        return postprocessor(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        return repr(self._postprocessor)
+
+
+def _predictor_size(predictor: Any) -> int:
+    """Estimate the memory footprint of the weights of a predictor (in bytes)"""
+    size = 0
+    for name in ("det_predictor", "reco_predictor", "crop_orientation_predictor"):
+        sub_predictor = getattr(predictor, name, None)
+        if sub_predictor is None:
+            continue
+        size += sum(weight.shape.num_elements() * weight.dtype.size for weight in sub_predictor.model.weights)
+    return size
+
+
+class PredictorCache:
+    """Process-wide LRU cache of predictors, bounded by a number of entries and a memory budget
+
+    Args:
+    ----
+        max_size: maximum number of predictors to keep
+        max_memory: maximum memory (in MB) taken by the weights of all cached predictors
+    """
+
+    def __init__(self, max_size: int = 4, max_memory: int = 4096) -> None:
+        self.max_size = max_size
+        self.max_memory = max_memory * 1024**2
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    @property
+    def memory(self) -> int:
+        """Memory (in bytes) taken by the weights of the cached predictors"""
+        return sum(size for _, size in self._entries.values())
+
+    def get(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Retrieve the predictor associated with a key, build it with the factory if it isn't cached yet
+
+        Args:
+        ----
+            key: hashable description of the predictor
+            factory: callable building the predictor
+
+        Returns:
+        -------
+            the cached predictor
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key][0]
+            predictor = factory()
+            self._entries[key] = (predictor, _predictor_size(predictor))
+            # Evict the least recently used predictors, but always keep the latest one
+            while len(self._entries) > 1 and (len(self._entries) > self.max_size or self.memory > self.max_memory):
+                self._entries.popitem(last=False)
+            return predictor
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_CACHE = PredictorCache(cfg.PREDICTOR_CACHE_SIZE, cfg.PREDICTOR_CACHE_MEMORY)
+
+
+def _build_predictor(factory: Callable, **kwargs: Any) -> Any:
+    predictor = factory(pretrained=True, **kwargs)
+    # Per-request thresholds are read from the request context instead of the shared postprocessor
+    det_model = predictor.det_predictor.model
+    det_model.postprocessor = _RequestPostProcessor(det_model.postprocessor)
+    return predictor
+
 
 def init_predictor(request: Union[KIEIn, OCRIn, RecognitionIn, DetectionIn]) -> Callable:
     """Initialize the predictor based on the request
@@ -31,17 +151,22 @@ def init_predictor(request: Union[KIEIn, OCRIn, RecognitionIn, DetectionIn]) ->
     params = request.model_dump()
     bin_thresh = params.pop("bin_thresh", None)
     box_thresh = params.pop("box_thresh", None)
-    if isinstance(request, (OCRIn, RecognitionIn, DetectionIn)):
-        predictor = ocr_predictor(pretrained=True, **params)
-        predictor.det_predictor.model.postprocessor.bin_thresh = bin_thresh
-        predictor.det_predictor.model.postprocessor.box_thresh = box_thresh
-        if isinstance(request, DetectionIn):
-            return predictor.det_predictor
-        elif isinstance(request, RecognitionIn):
-            return predictor.reco_predictor
-        return predictor
-    elif isinstance(request, KIEIn):
-        predictor = kie_predictor(pretrained=True, **params)
-        predictor.det_predictor.model.postprocessor.bin_thresh = bin_thresh
-        predictor.det_predictor.model.postprocessor.box_thresh = box_thresh
-        return predictor
+    # Only affects the task handling the current request
+    thresholds = {"bin_thresh": bin_thresh, "box_thresh": box_thresh}
+    REQUEST_THRESHOLDS.set({name: value for name, value in thresholds.items() if value is not None})
+    factory = ocr_predictor if isinstance(request, (OCRIn, RecognitionIn, DetectionIn)) else kie_predictor
+    key = (factory.__name__, *sorted(params.items()))
+    predictor = _CACHE.get(key, lambda: _build_predictor(factory, **params))
+    if isinstance(request, DetectionIn):
+        return predictor.det_predictor
+    elif isinstance(request, RecognitionIn):
+        return predictor.reco_predictor
+    return predictor
+
+
+def warmup_predictors() -> None:
+    """Load the predictors used by default requests and run them once on a blank page"""
+    page = np.zeros((512, 512, 3), dtype=np.uint8)
+    for request in (OCRIn(), KIEIn(), DetectionIn(), RecognitionIn()):
+        predictor = init_predictor(request)
+        predictor([page[:32, :128]] if isinstance(request, RecognitionIn) else [page])
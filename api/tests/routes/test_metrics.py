@@ -0,0 +1,27 @@
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_metrics(test_app_asyncio):
+    response = await test_app_asyncio.get("/metrics")
+    assert response.status_code == 200
+    json_response = response.json()
+    assert isinstance(json_response["queue_depth"], int) and json_response["queue_depth"] >= 0
+    assert isinstance(json_response["batches"], int)
+    assert isinstance(json_response["pages"], int)
+    assert 0 <= json_response["fill_ratio"] <= 1
+    assert 0 <= json_response["last_fill_ratio"] <= 1
+    assert isinstance(json_response["stages"], dict)
+    for stage in json_response["stages"].values():
+        assert stage["calls"] > 0 and stage["time"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_prometheus_metrics(test_app_asyncio):
+    response = await test_app_asyncio.get("/metrics/prometheus")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    lines = response.text.splitlines()
+    assert "# TYPE doctr_queue_depth gauge" in lines
+    assert "# TYPE doctr_stage_seconds_total counter" in lines
+    assert any(line.startswith("doctr_batches ") for line in lines)
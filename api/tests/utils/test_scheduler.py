@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+from app.scheduler import BatchScheduler
+from doctr.utils.profiling import profile_stage
+
+
+class MockPreProcessor:
+    batch_size = 4
+
+
+class MockPredictor:
+    pre_processor = MockPreProcessor()
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, pages):
+        self.calls.append(len(pages))
+        with profile_stage("mock", pages=len(pages)):
+            pass
+        return [page * 2 for page in pages]
+
+
+@pytest.mark.asyncio
+async def test_batch_scheduler():
+    scheduler = BatchScheduler(max_delay=50)
+    predictor = MockPredictor()
+    # Concurrent requests are coalesced into a single batch, and each one gets its own results back
+    results = await asyncio.gather(
+        scheduler.submit(predictor, [1, 2]),
+        scheduler.submit(predictor, [3]),
+        scheduler.submit(predictor, [4]),
+    )
+    assert results == [[2, 4], [6], [8]]
+    assert predictor.calls == [4]
+    metrics = scheduler.metrics()
+    assert metrics["queue_depth"] == 0
+    assert metrics["batches"] == 1 and metrics["pages"] == 4
+    assert metrics["fill_ratio"] == 1.0 and metrics["last_fill_ratio"] == 1.0
+    assert metrics["stages"] == {}
+    # Errors are forwarded to each caller
+    with pytest.raises(TypeError):
+        await scheduler.submit(predictor, [None])
+    scheduler.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_batch_scheduler_profiling():
+    scheduler = BatchScheduler(max_delay=50, profiling=True)
+    predictor = MockPredictor()
+    await asyncio.gather(scheduler.submit(predictor, [1, 2]), scheduler.submit(predictor, [3]))
+    await scheduler.submit(predictor, [4])
+    stages = scheduler.metrics()["stages"]
+    assert list(stages.keys()) == ["mock"]
+    assert stages["mock"]["calls"] == 2 and stages["mock"]["counts"] == {"pages": 4}
+    scheduler.shutdown()
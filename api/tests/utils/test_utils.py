@@ -1,4 +1,10 @@
-from app.utils import resolve_geometry
+import json
+
+import numpy as np
+
+from app.schemas import OCROut
+from app.utils import ocr_page_as_json, resolve_geometry
+from doctr.io import Block, Line, Page, Word
 
 
 def test_resolve_geometry():
@@ -7,3 +13,26 @@ def test_resolve_geometry():
 
     assert resolve_geometry(dummy_box) == (0.0, 0.0, 1.0, 0.0)
     assert resolve_geometry(dummy_polygon) == (0.0, 0.0, 1.0, 0.0, 1.0, 1.0, 0.0, 1.0)
+
+
+def test_ocr_page_as_json():
+    words = [
+        Word("hello", 0.987, ((0.1, 0.1), (0.2, 0.2)), {"value": 0, "confidence": None}),
+        Word("world", np.float32(0.5), ((0.3, 0.1), (0.4, 0.2)), {"value": 0, "confidence": None}),
+    ]
+    page = Page(np.zeros((10, 10, 3)), [Block([Line(words)])], 0, (10, 10), {"value": np.int64(0), "confidence": None})
+
+    out = json.loads(ocr_page_as_json("test.jpg", page))
+    assert out["name"] == "test.jpg" and out["dimensions"] == [10, 10]
+    assert out["orientation"] == {"value": 0, "confidence": None}
+    block = out["items"][0]["blocks"][0]
+    assert block["geometry"] == [0.1, 0.1, 0.4, 0.2]
+    assert block["lines"][0]["words"][0] == {
+        "value": "hello",
+        "geometry": [0.1, 0.1, 0.2, 0.2],
+        "confidence": 0.99,
+        "crop_orientation": {"value": 0, "confidence": None},
+    }
+    assert block["artefacts"] == []
+    # Valid response, without any field missing from the schema
+    assert OCROut(**out).model_dump(mode="json") == out
@@ -1,5 +1,5 @@
 from app.schemas import DetectionIn, KIEIn, OCRIn, RecognitionIn
-from app.vision import init_predictor
+from app.vision import PredictorCache, init_predictor
 from doctr.models.detection.predictor import DetectionPredictor
 from doctr.models.kie_predictor import KIEPredictor
 from doctr.models.predictor import OCRPredictor
@@ -11,3 +11,27 @@ def test_vision():
     assert isinstance(init_predictor(DetectionIn()), DetectionPredictor)
     assert isinstance(init_predictor(RecognitionIn()), RecognitionPredictor)
     assert isinstance(init_predictor(KIEIn()), KIEPredictor)
+
+
+def test_vision_cache():
+    predictor = init_predictor(OCRIn(bin_thresh=0.2, box_thresh=0.3))
+    postprocessor = predictor.det_predictor.model.postprocessor
+    assert postprocessor.bin_thresh == 0.2 and postprocessor.box_thresh == 0.3
+    # Same architecture with other thresholds: the predictor is reused, the thresholds are not shared
+    assert init_predictor(OCRIn(bin_thresh=0.4, box_thresh=0.5)) is predictor
+    assert postprocessor.bin_thresh == 0.4 and postprocessor.box_thresh == 0.5
+    assert postprocessor._postprocessor.bin_thresh != 0.4
+    assert init_predictor(OCRIn(det_arch="fast_base")) is not predictor
+
+
+def test_predictor_cache():
+    cache = PredictorCache(max_size=2)
+    assert cache.get("a", lambda: 1) == 1
+    assert cache.get("b", lambda: 2) == 2
+    # Cached entries are not rebuilt
+    assert cache.get("a", lambda: 3) == 1
+    # "b" is the least recently used entry
+    assert cache.get("c", lambda: 4) == 4
+    assert len(cache) == 2 and "b" not in cache and "a" in cache
+    cache.clear()
+    assert len(cache) == 0
@@ -1,4 +1,5 @@
 from .elements import *
+from .columnar import *
 from .html import *
 from .image import *
 from .pdf import *
@@ -0,0 +1,579 @@
+# Copyright (C) 2021-2024, Mindee.
+
+# This program is licensed under the Apache License 2.0.
+# See LICENSE or go to <https://opensource.org/licenses/Apache-2.0> for full license details.
+
+from json.encoder import encode_basestring_ascii
+from typing import Any, Dict, List, Optional, TextIO, Tuple, cast
+
+import numpy as np
+
+from doctr.file_utils import requires_package
+from doctr.utils.common_types import BoundingBox
+from doctr.utils.geometry import resolve_enclosing_rbbox
+from doctr.utils.reconstitution import synthesize_page
+from doctr.utils.repr import NestedObject
+
+from .elements import Block, Document, Line, Page, Word, _json_confidence, _json_geometries, _json_value
+
+try:  # optional dependency for visualization
+    from doctr.utils.visualization import visualize_page
+except ModuleNotFoundError:
+    pass
+
+__all__ = ["ColumnarPage", "ColumnarDocument"]
+
+
+def _to_tuples(geometry: List[List[float]]) -> Tuple[Tuple[float, ...], ...]:
+    return tuple(tuple(pt) for pt in geometry)
+
+
+def _to_tuple_list(geometries: np.ndarray) -> List[Tuple[Tuple[float, ...], ...]]:
+    # Convert boxes of shape (N, K, 2) to nested tuples, without any python loop
+    points = map(tuple, geometries.reshape(-1, 2).tolist())
+    return list(zip(*[points] * geometries.shape[1]))
+
+
+class ColumnarPage(NestedObject):
+    """Implements a page as flat arrays of words, with the line and block hierarchy encoded as offsets.
+    Block, Line and Word objects are only built on access.
+
+    >>> import numpy as np
+    >>> from doctr.io import ColumnarPage
+    >>> page = ColumnarPage.from_boxes(
+    ...     np.zeros((100, 100, 3), dtype=np.uint8),
+    ...     np.array([[0.1, 0.1, 0.2, 0.2], [0.3, 0.1, 0.4, 0.2]]),
+    ...     [("hello", 0.9), ("world", 0.8)],
+    ...     [{"value": 0, "confidence": None}] * 2,
+    ...     [[[0, 1]]],
+    ...     0,
+    ...     (100, 100),
+    ... )
+    >>> page.render()
+    'hello world'
+
+    Args:
+    ----
+        page: image encoded as a numpy array in uint8
+        values: text of the words, in reading order
+        confidences: confidence of the text predictions, of shape (N,)
+        geometries: word boxes of shape (N, 2, 2) in format ((xmin, ymin), (xmax, ymax)), or (N, 4, 2) for
+            rotated boxes, where coordinates are relative to the page's size
+        crop_orientations: orientation of the word crops in degrees, of shape (N,)
+        crop_orientation_confidences: confidence of the crop orientations, of shape (N,) (NaN when unknown)
+        line_offsets: index of the first word of each line, followed by the number of words, of shape (L + 1,)
+        line_geometries: line boxes of shape (L, 2, 2) or (L, 4, 2)
+        block_offsets: index of the first line of each block, followed by the number of lines, of shape (B + 1,)
+        block_geometries: block boxes of shape (B, 2, 2) or (B, 4, 2)
+        page_idx: the index of the page in the input raw document
+        dimensions: the page size in pixels in format (height, width)
+        orientation: a dictionary with the value of the rotation angle in degress and confidence of the prediction
+        language: a dictionary with the language value and confidence of the prediction
+    """
+
+    def __init__(
+        self,
+        page: np.ndarray,
+        values: List[str],
+        confidences: np.ndarray,
+        geometries: np.ndarray,
+        crop_orientations: np.ndarray,
+        crop_orientation_confidences: np.ndarray,
+        line_offsets: np.ndarray,
+        line_geometries: np.ndarray,
+        block_offsets: np.ndarray,
+        block_geometries: np.ndarray,
+        page_idx: int,
+        dimensions: Tuple[int, int],
+        orientation: Optional[Dict[str, Any]] = None,
+        language: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        if not (
+            len(values)
+            == confidences.shape[0]
+            == geometries.shape[0]
+            == crop_orientations.shape[0]
+            == crop_orientation_confidences.shape[0]
+            == line_offsets[-1]
+        ):
+            raise ValueError("the word arrays are expected to have the same length")
+        if line_geometries.shape[0] != line_offsets.shape[0] - 1 or block_offsets[-1] != line_geometries.shape[0]:
+            raise ValueError("the line offsets don't match the line geometries")
+        if block_geometries.shape[0] != block_offsets.shape[0] - 1:
+            raise ValueError("the block offsets don't match the block geometries")
+        self.page = page
+        self.values = values
+        self.confidences = confidences
+        self.geometries = geometries
+        self.crop_orientations = crop_orientations
+        self.crop_orientation_confidences = crop_orientation_confidences
+        self.line_offsets = line_offsets
+        self.line_geometries = line_geometries
+        self.block_offsets = block_offsets
+        self.block_geometries = block_geometries
+        self.page_idx = page_idx
+        self.dimensions = dimensions
+        self.orientation = orientation if isinstance(orientation, dict) else dict(value=None, confidence=None)
+        self.language = language if isinstance(language, dict) else dict(value=None, confidence=None)
+        self._blocks: Optional[List[Block]] = None
+
+    @classmethod
+    def from_boxes(
+        cls,
+        page: np.ndarray,
+        boxes: np.ndarray,
+        word_preds: List[Tuple[str, float]],
+        crop_orientations: List[Dict[str, Any]],
+        blocks: List[List[List[int]]],
+        page_idx: int,
+        dimensions: Tuple[int, int],
+        orientation: Optional[Dict[str, Any]] = None,
+        language: Optional[Dict[str, Any]] = None,
+    ) -> "ColumnarPage":
+        """Build a page from the predictions of its words, and their grouping in lines and blocks
+
+        Args:
+        ----
+            page: image encoded as a numpy array in uint8
+            boxes: bounding boxes of all detected words of the page, of shape (N, 4+) or (N, 4, 2)
+            word_preds: list of all detected words of the page (text + confidence), of size N
+            crop_orientations: list of N dictionaries containing the orientation of the word crops
+            blocks: nested list of word indices, for each line of each block
+            page_idx: the index of the page in the input raw document
+            dimensions: the page size in pixels in format (height, width)
+            orientation: a dictionary with the value of the rotation angle in degress and confidence of the prediction
+            language: a dictionary with the language value and confidence of the prediction
+
+        Returns:
+        -------
+            columnar page
+        """
+        line_lengths = [len(line) for block in blocks for line in block]
+        line_offsets = np.zeros(len(line_lengths) + 1, dtype=np.int64)
+        np.cumsum(line_lengths, out=line_offsets[1:])
+        block_offsets = np.zeros(len(blocks) + 1, dtype=np.int64)
+        np.cumsum([len(block) for block in blocks], out=block_offsets[1:])
+
+        word_idcs = np.fromiter(
+            (idx for block in blocks for line in block for idx in line), dtype=np.int64, count=int(line_offsets[-1])
+        )
+        geometries = boxes[word_idcs] if boxes.ndim == 3 else boxes[word_idcs, :4].reshape(-1, 2, 2)
+        _preds = [word_preds[idx] for idx in word_idcs.tolist()]
+        _orientations = [crop_orientations[idx] for idx in word_idcs.tolist()]
+
+        if geometries.ndim == 3 and geometries.shape[1] == 4:
+            # Rotated boxes: fit a rotated rectangle to the words of each line & block
+            line_geometries = np.asarray(
+                [
+                    resolve_enclosing_rbbox(list(geometries[start:end]))
+                    for start, end in zip(line_offsets[:-1], line_offsets[1:])
+                ],
+                dtype=geometries.dtype,
+            ).reshape(-1, 4, 2)
+            block_geometries = np.asarray(
+                [
+                    resolve_enclosing_rbbox(list(geometries[line_offsets[start] : line_offsets[end]]))
+                    for start, end in zip(block_offsets[:-1], block_offsets[1:])
+                ],
+                dtype=geometries.dtype,
+            ).reshape(-1, 4, 2)
+        elif geometries.shape[0] > 0:
+            # Straight boxes: reduce the corners of the words of each line & block
+            block_starts = line_offsets[block_offsets[:-1]]
+            line_geometries = np.stack(
+                (
+                    np.minimum.reduceat(geometries[:, 0], line_offsets[:-1], axis=0),
+                    np.maximum.reduceat(geometries[:, 1], line_offsets[:-1], axis=0),
+                ),
+                axis=1,
+            )
+            block_geometries = np.stack(
+                (
+                    np.minimum.reduceat(geometries[:, 0], block_starts, axis=0),
+                    np.maximum.reduceat(geometries[:, 1], block_starts, axis=0),
+                ),
+                axis=1,
+            )
+        else:
+            line_geometries = block_geometries = np.zeros((0, 2, 2), dtype=geometries.dtype)
+
+        return cls(
+            page,
+            [pred[0] for pred in _preds],
+            np.array([pred[1] for pred in _preds], dtype=np.float64),
+            geometries,
+            np.array([orient["value"] for orient in _orientations], dtype=np.int64),
+            np.array(
+                [np.nan if orient["confidence"] is None else orient["confidence"] for orient in _orientations],
+                dtype=np.float64,
+            ),
+            line_offsets,
+            line_geometries,
+            block_offsets,
+            block_geometries,
+            page_idx,
+            dimensions,
+            orientation,
+            language,
+        )
+
+    @property
+    def num_words(self) -> int:
+        return len(self.values)
+
+    @property
+    def num_lines(self) -> int:
+        return self.line_offsets.shape[0] - 1
+
+    @property
+    def num_blocks(self) -> int:
+        return self.block_offsets.shape[0] - 1
+
+    def _geometry(self, geometry: np.ndarray) -> Any:
+        # Enclosing boxes of rotated elements are arrays, like in the element tree
+        return geometry.copy() if geometry.shape[0] == 4 else _to_tuples(geometry.tolist())
+
+    def get_word(self, idx: int) -> Word:
+        """Build the Word object of a given word
+
+        Args:
+        ----
+            idx: index of the word in the page
+
+        Returns:
+        -------
+            the word element
+        """
+        conf = float(self.crop_orientation_confidences[idx])
+        return Word(
+            self.values[idx],
+            float(self.confidences[idx]),
+            cast(BoundingBox, _to_tuples(self.geometries[idx].tolist())),
+            {"value": int(self.crop_orientations[idx]), "confidence": None if np.isnan(conf) else conf},
+        )
+
+    def get_line(self, idx: int) -> Line:
+        """Build the Line object of a given line, with its words
+
+        Args:
+        ----
+            idx: index of the line in the page
+
+        Returns:
+        -------
+            the line element
+        """
+        start, end = self.line_offsets[idx : idx + 2].tolist()
+        return Line(
+            [self.get_word(word_idx) for word_idx in range(start, end)], self._geometry(self.line_geometries[idx])
+        )
+
+    def get_block(self, idx: int) -> Block:
+        """Build the Block object of a given block, with its lines and words
+
+        Args:
+        ----
+            idx: index of the block in the page
+
+        Returns:
+        -------
+            the block element
+        """
+        start, end = self.block_offsets[idx : idx + 2].tolist()
+        return Block(
+            [self.get_line(line_idx) for line_idx in range(start, end)],
+            [],
+            self._geometry(self.block_geometries[idx]),
+        )
+
+    @property
+    def blocks(self) -> List[Block]:
+        """Blocks of the page, built on first access"""
+        if self._blocks is None:
+            self._blocks = [self.get_block(idx) for idx in range(self.num_blocks)]
+        return self._blocks
+
+    def to_page(self) -> Page:
+        """Convert to the equivalent Page object"""
+        return Page(self.page, self.blocks, self.page_idx, self.dimensions, self.orientation, self.language)
+
+    def render(self, block_break: str = "\n\n") -> str:
+        """Renders the full text of the page"""
+        lines = [" ".join(self.values[start:end]) for start, end in zip(self.line_offsets[:-1], self.line_offsets[1:])]
+        return block_break.join(
+            "\n".join(lines[start:end]) for start, end in zip(self.block_offsets[:-1], self.block_offsets[1:])
+        )
+
+    def export(self) -> Dict[str, Any]:
+        """Exports the page into the nested dict format of `Page.export`, straight from the arrays. Geometries are
+        exported as tuples of floats.
+        """
+        confidences = self.confidences.tolist()
+        geometries = _to_tuple_list(self.geometries)
+        orientations = self.crop_orientations.tolist()
+        orientation_confs = [
+            None if conf != conf else conf for conf in self.crop_orientation_confidences.tolist()
+        ]  # NaN != NaN
+        words = [
+            {
+                "value": value,
+                "confidence": conf,
+                "geometry": geometry,
+                "crop_orientation": {"value": orient, "confidence": orient_conf},
+            }
+            for value, conf, geometry, orient, orient_conf in zip(
+                self.values, confidences, geometries, orientations, orientation_confs
+            )
+        ]
+        line_offsets = self.line_offsets.tolist()
+        lines = [
+            {"geometry": geometry, "words": words[start:end]}
+            for geometry, start, end in zip(_to_tuple_list(self.line_geometries), line_offsets[:-1], line_offsets[1:])
+        ]
+        block_offsets = self.block_offsets.tolist()
+        blocks = [
+            {"geometry": geometry, "lines": lines[start:end], "artefacts": []}
+            for geometry, start, end in zip(
+                _to_tuple_list(self.block_geometries), block_offsets[:-1], block_offsets[1:]
+            )
+        ]
+        return {
+            "page_idx": self.page_idx,
+            "dimensions": self.dimensions,
+            "orientation": self.orientation,
+            "language": self.language,
+            "blocks": blocks,
+        }
+
+    def _export_json(self, flatten_geometry: bool, precision: Optional[int]) -> str:
+        orientation_confs = [
+            None if conf != conf else conf for conf in self.crop_orientation_confidences.tolist()
+        ]  # NaN != NaN
+        words = [
+            f'{{"value":{encode_basestring_ascii(value)},"confidence":{_json_confidence(conf, precision)},'
+            f'"geometry":{geometry},"crop_orientation":{_json_value({"value": orient, "confidence": orient_conf})}}}'
+            for value, conf, geometry, orient, orient_conf in zip(
+                self.values,
+                self.confidences.tolist(),
+                _json_geometries(self.geometries, flatten_geometry),
+                self.crop_orientations.tolist(),
+                orientation_confs,
+            )
+        ]
+        line_offsets = self.line_offsets.tolist()
+        lines = [
+            f'{{"geometry":{geometry},"words":[{",".join(words[start:end])}]}}'
+            for geometry, start, end in zip(
+                _json_geometries(self.line_geometries, flatten_geometry), line_offsets[:-1], line_offsets[1:]
+            )
+        ]
+        block_offsets = self.block_offsets.tolist()
+        blocks = [
+            f'{{"geometry":{geometry},"lines":[{",".join(lines[start:end])}],"artefacts":[]}}'
+            for geometry, start, end in zip(
+                _json_geometries(self.block_geometries, flatten_geometry), block_offsets[:-1], block_offsets[1:]
+            )
+        ]
+        page = ",".join(
+            f'"{k}":{_json_value(getattr(self, k))}' for k in ("page_idx", "dimensions", "orientation", "language")
+        )
+        return f'{{{page},"blocks":[{",".join(blocks)}]}}'
+
+    def export_as_json(
+        self, fp: Optional[TextIO] = None, flatten_geometry: bool = False, precision: Optional[int] = None
+    ) -> Optional[str]:
+        """Exports the page in JSON, with the format of `Page.export_as_json`, straight from the arrays
+
+        Args:
+        ----
+            fp: text stream to write the JSON to. If None, the JSON string is returned
+            flatten_geometry: whether geometries should be flat lists of coordinates, e.g. [xmin, ymin, xmax, ymax]
+            precision: number of decimals the confidences are rounded to (unchanged if None)
+
+        Returns:
+        -------
+            the JSON string if no stream was passed
+        """
+        content = self._export_json(flatten_geometry, precision)
+        if fp is None:
+            return content
+        fp.write(content)
+        return None
+
+    def extra_repr(self) -> str:
+        return f"dimensions={self.dimensions}, blocks={self.num_blocks}, lines={self.num_lines}, words={self.num_words}"
+
+    def show(self, interactive: bool = True, preserve_aspect_ratio: bool = False, **kwargs) -> None:
+        """Overlay the result on a given image
+
+        Args:
+            interactive: whether the display should be interactive
+            preserve_aspect_ratio: pass True if you passed True to the predictor
+            **kwargs: additional keyword arguments passed to the matplotlib.pyplot.show method
+        """
+        requires_package("matplotlib", "`.show()` requires matplotlib & mplcursors installed")
+        requires_package("mplcursors", "`.show()` requires matplotlib & mplcursors installed")
+        import matplotlib.pyplot as plt
+
+        visualize_page(self.export(), self.page, interactive=interactive, preserve_aspect_ratio=preserve_aspect_ratio)
+        plt.show(**kwargs)
+
+    def synthesize(self, **kwargs) -> np.ndarray:
+        """Synthesize the page from the predictions
+
+        Returns
+        -------
+            synthesized page
+        """
+        return synthesize_page(self.export(), **kwargs)
+
+    def export_as_xml(self, **kwargs) -> Tuple[bytes, Any]:
+        """Export the page as XML (hOCR-format)
+
+        Args:
+        ----
+            **kwargs: additional keyword arguments passed to the Page.export_as_xml method
+
+        Returns:
+        -------
+            a tuple of the XML byte string, and its ElementTree
+        """
+        return self.to_page().export_as_xml(**kwargs)
+
+
+class ColumnarDocument(NestedObject):
+    """Implements a document as a collection of columnar pages
+
+    Args:
+    ----
+        pages: list of columnar pages
+    """
+
+    _children_names: List[str] = ["pages"]
+
+    def __init__(self, pages: List[ColumnarPage]) -> None:
+        self.pages = pages
+
+    def to_document(self) -> Document:
+        """Convert to the equivalent Document object"""
+        return Document([page.to_page() for page in self.pages])
+
+    def render(self, page_break: str = "\n\n\n\n") -> str:
+        """Renders the full text of the document"""
+        return page_break.join(p.render() for p in self.pages)
+
+    def export(self) -> Dict[str, Any]:
+        """Exports the document into the nested dict format of `Document.export`"""
+        return {"pages": [page.export() for page in self.pages]}
+
+    def export_as_json(
+        self, fp: Optional[TextIO] = None, flatten_geometry: bool = False, precision: Optional[int] = None
+    ) -> Optional[str]:
+        """Exports the document in JSON, with the format of `Document.export_as_json`. When writing to a stream,
+        pages are written one at a time.
+
+        Args:
+        ----
+            fp: text stream to write the JSON to. If None, the JSON string is returned
+            flatten_geometry: whether geometries should be flat lists of coordinates, e.g. [xmin, ymin, xmax, ymax]
+            precision: number of decimals the confidences are rounded to (unchanged if None)
+
+        Returns:
+        -------
+            the JSON string if no stream was passed
+        """
+        pages = (page._export_json(flatten_geometry, precision) for page in self.pages)
+        if fp is None:
+            return '{"pages":[' + ",".join(pages) + "]}"
+        fp.write('{"pages":[')
+        for idx, page in enumerate(pages):
+            if idx > 0:
+                fp.write(",")
+            fp.write(page)
+        fp.write("]}")
+        return None
+
+    def export_as_ndjson(
+        self, fp: Optional[TextIO] = None, flatten_geometry: bool = False, precision: Optional[int] = None
+    ) -> Optional[str]:
+        """Exports the document in newline-delimited JSON, with the JSON export of one page per line
+
+        Args:
+        ----
+            fp: text stream to write the pages to. If None, the NDJSON string is returned
+            flatten_geometry: whether geometries should be flat lists of coordinates, e.g. [xmin, ymin, xmax, ymax]
+            precision: number of decimals the confidences are rounded to (unchanged if None)
+
+        Returns:
+        -------
+            the NDJSON string if no stream was passed
+        """
+        lines = (page._export_json(flatten_geometry, precision) + "\n" for page in self.pages)
+        if fp is None:
+            return "".join(lines)
+        for line in lines:
+            fp.write(line)
+        return None
+
+    def export_as_arrow(self) -> Any:
+        """Export the words of the document as an Arrow table, with one row per word
+
+        Returns:
+        -------
+            a `pyarrow.Table` with the page, block and line indices, value, confidence and geometry of the words
+        """
+        requires_package("pyarrow", "`.export_as_arrow()` requires pyarrow installed")
+        import pyarrow as pa
+
+        columns: Dict[str, List[np.ndarray]] = {k: [] for k in ("page_idx", "block_idx", "line_idx", "confidence")}
+        values: List[str] = []
+        geometries: List[np.ndarray] = []
+        for page in self.pages:
+            line_sizes = np.diff(page.line_offsets)
+            block_sizes = np.add.reduceat(line_sizes, page.block_offsets[:-1]) if page.num_words > 0 else line_sizes
+            columns["page_idx"].append(np.full(page.num_words, page.page_idx, dtype=np.int64))
+            columns["block_idx"].append(np.repeat(np.arange(page.num_blocks), block_sizes))
+            columns["line_idx"].append(np.repeat(np.arange(page.num_lines), line_sizes))
+            columns["confidence"].append(page.confidences)
+            values.extend(page.values)
+            geometries.append(page.geometries.reshape(page.num_words, 2 * page.geometries.shape[1]))
+
+        table = {k: np.concatenate(arrays) if arrays else np.zeros(0) for k, arrays in columns.items()}
+        flat_geometries = np.concatenate(geometries) if geometries else np.zeros((0, 4))
+        return pa.table({
+            "page_idx": table["page_idx"],
+            "block_idx": table["block_idx"],
+            "line_idx": table["line_idx"],
+            "value": pa.array(values, type=pa.string()),
+            "confidence": table["confidence"],
+            "geometry": pa.FixedSizeListArray.from_arrays(
+                flat_geometries.astype(np.float32).ravel(), flat_geometries.shape[1]
+            ),
+        })
+
+    def show(self, **kwargs) -> None:
+        """Overlay the result on a given image"""
+        for result in self.pages:
+            result.show(**kwargs)
+
+    def synthesize(self, **kwargs) -> List[np.ndarray]:
+        """Synthesize all pages from their predictions
+
+        Returns
+        -------
+            list of synthesized pages
+        """
+        return [page.synthesize() for page in self.pages]
+
+    def export_as_xml(self, **kwargs) -> List[Tuple[bytes, Any]]:
+        """Export the document as XML (hOCR-format)
+
+        Args:
+        ----
+            **kwargs: additional keyword arguments passed to the Page.export_as_xml method
+
+        Returns:
+        -------
+            list of tuple of (bytes, ElementTree)
+        """
+        return [page.to_page().export_as_xml(**kwargs) for page in self.pages]
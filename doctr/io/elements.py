@@ -3,7 +3,10 @@
 # This program is licensed under the Apache License 2.0.
 # See LICENSE or go to <https://opensource.org/licenses/Apache-2.0> for full license details.
 
-from typing import Any, Dict, List, Optional, Tuple, Union
+import json
+from functools import lru_cache
+from json.encoder import encode_basestring_ascii
+from typing import Any, Dict, List, Optional, Sequence, TextIO, Tuple, Union
 
 from defusedxml import defuse_stdlib
 
@@ -29,9 +32,111 @@ except ModuleNotFoundError:
 __all__ = ["Element", "Word", "Artefact", "Line", "Prediction", "Block", "Page", "KIEPage", "Document"]
 
 
+def _json_default(obj: Any) -> Any:
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
+
+
+# Encoder of the exported values, with numpy support
+_json_encoder = json.JSONEncoder(separators=(",", ":"), default=_json_default)
+
+
+def _json_value(value: Any) -> str:
+    """Encode a value in JSON. Scalars and flat dicts, e.g. orientations, are encoded without the json encoder, which
+    has a high overhead per call.
+    """
+    if value is None:
+        return "null"
+    if value.__class__ is str:
+        return encode_basestring_ascii(value)
+    if value.__class__ is int:
+        return int.__repr__(value)
+    if value.__class__ is float and value - value == 0:  # finite
+        return float.__repr__(value)
+    if value.__class__ is dict and all(k.__class__ is str for k in value):
+        return "{" + ",".join([f"{encode_basestring_ascii(k)}:{_json_value(v)}" for k, v in value.items()]) + "}"
+    return _json_encoder.encode(value)
+
+
+@lru_cache(maxsize=None)
+def _geometry_template(num_points: int, flatten: bool) -> str:
+    return "[" + ",".join(["%r"] * (2 * num_points) if flatten else ["[%r,%r]"] * num_points) + "]"
+
+
+def _json_geometry(geometry: Any, flatten: bool) -> str:
+    """Encode a geometry (sequence of points) in JSON, as a flat list of coordinates if `flatten` is set"""
+    points = np.asarray(geometry, dtype=np.float64)
+    return _geometry_template(points.shape[0], flatten) % tuple(points.ravel().tolist())
+
+
+def _json_confidence(confidence: Any, precision: Optional[int]) -> str:
+    if confidence is not None and precision is not None:
+        confidence = round(float(confidence), precision)
+    return _json_value(confidence)
+
+
+def _json_geometries(geometries: np.ndarray, flatten: bool) -> List[str]:
+    """Encode geometries of shape (N, K, 2) in JSON, all at once"""
+    # Cast all coordinates to python floats at once, and fill the geometry templates from them
+    coords = iter(geometries.astype(np.float64).ravel().tolist())
+    return list(
+        map(
+            _geometry_template(geometries.shape[1], flatten).__mod__,
+            zip(*[coords] * (2 * geometries.shape[1])),
+        )
+    )
+
+
+def _json_words(words: List["Word"], flatten: bool, precision: Optional[int]) -> List[str]:
+    """Encode words in JSON, all at once"""
+    try:
+        geometries = np.asarray([word.geometry for word in words], dtype=np.float64)
+    except ValueError:  # Mixed box formats
+        geometries = None
+    if geometries is None or geometries.ndim != 3:
+        _geometries = [_json_geometry(word.geometry, flatten) for word in words]
+    else:
+        _geometries = _json_geometries(geometries, flatten)
+    return [
+        f'{{"value":{encode_basestring_ascii(word.value)},"confidence":{_json_confidence(word.confidence, precision)},'
+        f'"geometry":{geometry},"crop_orientation":{_json_value(word.crop_orientation)}}}'
+        for word, geometry in zip(words, _geometries)
+    ]
+
+
+def _json_elements(elements: Sequence["Element"], flatten: bool, precision: Optional[int]) -> str:
+    """Encode a list of elements in JSON"""
+    if len(elements) > 0 and isinstance(elements[0], Word):
+        return "[" + ",".join(_json_words(elements, flatten, precision)) + "]"  # type: ignore[arg-type]
+    return "[" + ",".join([elt._export_json(flatten, precision) for elt in elements]) + "]"
+
+
+def _json_blocks(blocks: List["Block"], flatten: bool, precision: Optional[int]) -> List[str]:
+    """Encode blocks in JSON, with all their words encoded at once"""
+    words = iter(
+        _json_words([word for block in blocks for line in block.lines for word in line.words], flatten, precision)
+    )
+    return [
+        f'{{"geometry":{_json_geometry(block.geometry, flatten)},"lines":['
+        + ",".join([
+            f'{{"geometry":{_json_geometry(line.geometry, flatten)},"words":['
+            + ",".join([next(words) for _ in line.words])
+            + "]}"
+            for line in block.lines
+        ])
+        + f'],"artefacts":{_json_elements(block.artefacts, flatten, precision)}}}'
+        for block in blocks
+    ]
+
+
 class Element(NestedObject):
     """Implements an abstract document element with exporting and text rendering capabilities"""
 
+    __slots__ = ()
+
     _children_names: List[str] = []
     _exported_keys: List[str] = []
 
@@ -55,6 +160,50 @@ class Element(NestedObject):
 
         return export_dict
 
+    def _export_json(self, flatten_geometry: bool, precision: Optional[int]) -> str:
+        items = []
+        for k in self._exported_keys:
+            if k == "geometry":
+                value = _json_geometry(self.geometry, flatten_geometry)  # type: ignore[attr-defined]
+            elif k == "confidence":
+                value = _json_confidence(self.confidence, precision)  # type: ignore[attr-defined]
+            else:
+                value = _json_value(getattr(self, k))
+            items.append(f'"{k}":{value}')
+        for children_name in self._children_names:
+            if children_name in ["predictions"]:
+                value = ",".join(
+                    f"{encode_basestring_ascii(k)}:{_json_elements(c, flatten_geometry, precision)}"
+                    for k, c in getattr(self, children_name).items()
+                )
+                items.append(f'"{children_name}":{{{value}}}')
+            else:
+                value = _json_elements(getattr(self, children_name), flatten_geometry, precision)
+                items.append(f'"{children_name}":{value}')
+
+        return "{" + ",".join(items) + "}"
+
+    def export_as_json(
+        self, fp: Optional[TextIO] = None, flatten_geometry: bool = False, precision: Optional[int] = None
+    ) -> Optional[str]:
+        """Exports the object in JSON, with the nested format of `export`, without building the intermediate dicts
+
+        Args:
+        ----
+            fp: text stream to write the JSON to. If None, the JSON string is returned
+            flatten_geometry: whether geometries should be flat lists of coordinates, e.g. [xmin, ymin, xmax, ymax]
+            precision: number of decimals the confidences are rounded to (unchanged if None)
+
+        Returns:
+        -------
+            the JSON string if no stream was passed
+        """
+        content = self._export_json(flatten_geometry, precision)
+        if fp is None:
+            return content
+        fp.write(content)
+        return None
+
     @classmethod
     def from_dict(cls, save_dict: Dict[str, Any], **kwargs):
         raise NotImplementedError
@@ -75,6 +224,8 @@ class Word(Element):
         crop_orientation: the general orientation of the crop in degrees and its confidence
     """
 
+    __slots__ = ("value", "confidence", "geometry", "crop_orientation")
+
     _exported_keys: List[str] = ["value", "confidence", "geometry", "crop_orientation"]
     _children_names: List[str] = []
 
@@ -98,6 +249,9 @@ class Word(Element):
     def extra_repr(self) -> str:
         return f"value='{self.value}', confidence={self.confidence:.2}"
 
+    def _export_json(self, flatten_geometry: bool, precision: Optional[int]) -> str:
+        return _json_words([self], flatten_geometry, precision)[0]
+
     @classmethod
     def from_dict(cls, save_dict: Dict[str, Any], **kwargs):
         kwargs = {k: save_dict[k] for k in cls._exported_keys}
@@ -115,6 +269,8 @@ class Artefact(Element):
             the page's size.
     """
 
+    __slots__ = ("geometry", "type", "confidence")
+
     _exported_keys: List[str] = ["geometry", "type", "confidence"]
     _children_names: List[str] = []
 
@@ -148,9 +304,11 @@ class Line(Element):
             all words in it.
     """
 
+    __slots__ = ("words", "geometry")
+
     _exported_keys: List[str] = ["geometry"]
     _children_names: List[str] = ["words"]
-    words: List[Word] = []
+    words: List[Word]
 
     def __init__(
         self,
@@ -182,6 +340,8 @@ class Line(Element):
 class Prediction(Word):
     """Implements a prediction element"""
 
+    __slots__ = ()
+
     def render(self) -> str:
         """Renders the full text of the element"""
         return self.value
@@ -229,6 +389,9 @@ class Block(Element):
         """Renders the full text of the element"""
         return line_break.join(line.render() for line in self.lines)
 
+    def _export_json(self, flatten_geometry: bool, precision: Optional[int]) -> str:
+        return _json_blocks([self], flatten_geometry, precision)[0]
+
     @classmethod
     def from_dict(cls, save_dict: Dict[str, Any], **kwargs):
         kwargs = {k: save_dict[k] for k in cls._exported_keys}
@@ -409,6 +572,10 @@ class Page(Element):
 
         return (ET.tostring(page_hocr, encoding="utf-8", method="xml"), ET.ElementTree(page_hocr))
 
+    def _export_json(self, flatten_geometry: bool, precision: Optional[int]) -> str:
+        page = ",".join(f'"{k}":{_json_value(getattr(self, k))}' for k in self._exported_keys)
+        return f'{{{page},"blocks":[{",".join(_json_blocks(self.blocks, flatten_geometry, precision))}]}}'
+
     @classmethod
     def from_dict(cls, save_dict: Dict[str, Any], **kwargs):
         kwargs = {k: save_dict[k] for k in cls._exported_keys}
@@ -609,6 +776,54 @@ class Document(Element):
         """
         return [page.export_as_xml(**kwargs) for page in self.pages]
 
+    def export_as_json(
+        self, fp: Optional[TextIO] = None, flatten_geometry: bool = False, precision: Optional[int] = None
+    ) -> Optional[str]:
+        """Exports the document in JSON, with the nested format of `export`. When writing to a stream, pages are
+        written one at a time.
+
+        Args:
+        ----
+            fp: text stream to write the JSON to. If None, the JSON string is returned
+            flatten_geometry: whether geometries should be flat lists of coordinates, e.g. [xmin, ymin, xmax, ymax]
+            precision: number of decimals the confidences are rounded to (unchanged if None)
+
+        Returns:
+        -------
+            the JSON string if no stream was passed
+        """
+        if fp is None:
+            return self._export_json(flatten_geometry, precision)
+        fp.write('{"pages":[')
+        for idx, page in enumerate(self.pages):
+            if idx > 0:
+                fp.write(",")
+            fp.write(page._export_json(flatten_geometry, precision))
+        fp.write("]}")
+        return None
+
+    def export_as_ndjson(
+        self, fp: Optional[TextIO] = None, flatten_geometry: bool = False, precision: Optional[int] = None
+    ) -> Optional[str]:
+        """Exports the document in newline-delimited JSON, with the JSON export of one page per line
+
+        Args:
+        ----
+            fp: text stream to write the pages to. If None, the NDJSON string is returned
+            flatten_geometry: whether geometries should be flat lists of coordinates, e.g. [xmin, ymin, xmax, ymax]
+            precision: number of decimals the confidences are rounded to (unchanged if None)
+
+        Returns:
+        -------
+            the NDJSON string if no stream was passed
+        """
+        lines = (page._export_json(flatten_geometry, precision) + "\n" for page in self.pages)
+        if fp is None:
+            return "".join(lines)
+        for line in lines:
+            fp.write(line)
+        return None
+
     @classmethod
     def from_dict(cls, save_dict: Dict[str, Any], **kwargs):
         kwargs = {k: save_dict[k] for k in cls._exported_keys}
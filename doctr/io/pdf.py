@@ -3,14 +3,93 @@
 # This program is licensed under the Apache License 2.0.
 # See LICENSE or go to <https://opensource.org/licenses/Apache-2.0> for full license details.
 
-from typing import Any, List, Optional
+import math
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Union, overload
 
 import numpy as np
 import pypdfium2 as pdfium
 
 from doctr.utils.common_types import AbstractFile
 
-__all__ = ["read_pdf"]
+__all__ = ["read_pdf", "PDFPages"]
+
+
+def _resolve_page_indices(num_pages: int, pages: Optional[Sequence[int]] = None) -> List[int]:
+    if pages is None:
+        return list(range(num_pages))
+    indices = []
+    for idx in pages:
+        if not -num_pages <= idx < num_pages:
+            raise IndexError(f"page index {idx} is out of range for a document of {num_pages} pages")
+        indices.append(idx % num_pages)
+    return indices
+
+
+def _render_page(
+    pdf: pdfium.PdfDocument,
+    idx: int,
+    scale: float = 2,
+    rgb_mode: bool = True,
+    max_pixels: Optional[int] = None,
+    **kwargs: Any,
+) -> np.ndarray:
+    page = pdf[idx]
+    if max_pixels is not None:
+        # Pick the scale matching the pixel budget (page sizes are in points, 1 point = 1 pixel at scale 1)
+        width, height = page.get_size()
+        scale = math.sqrt(max_pixels / (width * height))
+    return page.render(scale=scale, rev_byteorder=rgb_mode, **kwargs).to_numpy()
+
+
+def _render_pages(
+    file: AbstractFile, password: Optional[str], indices: List[int], render_kwargs: Dict[str, Any]
+) -> List[np.ndarray]:
+    # PDF documents can't be shared across processes: each worker opens its own
+    pdf = pdfium.PdfDocument(file, password=password, autoclose=True)
+    return [_render_page(pdf, idx, **render_kwargs) for idx in indices]
+
+
+class PDFPages(Sequence[np.ndarray]):
+    """Sequence of pages from a PDF file, which are only rendered when they are accessed
+
+    >>> from doctr.io import read_pdf
+    >>> doc = read_pdf("path/to/your/doc.pdf", lazy=True)
+    >>> first_page = doc[0]
+
+    Args:
+    ----
+        pdf: the opened PDF document
+        indices: indices of the pages of the document included in the sequence
+        **kwargs: rendering parameters of :func:`read_pdf`
+    """
+
+    def __init__(self, pdf: pdfium.PdfDocument, indices: List[int], **kwargs: Any) -> None:
+        self.pdf = pdf
+        self.indices = indices
+        self.render_kwargs = kwargs
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    @overload
+    def __getitem__(self, idx: int) -> np.ndarray: ...
+
+    @overload
+    def __getitem__(self, idx: slice) -> "PDFPages": ...
+
+    def __getitem__(self, idx: Union[int, slice]) -> Union[np.ndarray, "PDFPages"]:
+        if isinstance(idx, slice):
+            return PDFPages(self.pdf, self.indices[idx], **self.render_kwargs)
+        return _render_page(self.pdf, self.indices[idx], **self.render_kwargs)
+
+    def close(self) -> None:
+        """Close the underlying PDF document"""
+        self.pdf.close()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(num_pages={len(self)})"
 
 
 def read_pdf(
@@ -18,8 +97,12 @@ def read_pdf(
     scale: float = 2,
     rgb_mode: bool = True,
     password: Optional[str] = None,
+    pages: Optional[Sequence[int]] = None,
+    max_pixels: Optional[int] = None,
+    lazy: bool = False,
+    num_workers: Optional[int] = None,
     **kwargs: Any,
-) -> List[np.ndarray]:
+) -> Union[List[np.ndarray], PDFPages]:
     """Read a PDF file and convert it into an image in numpy format
 
     >>> from doctr.io import read_pdf
@@ -31,12 +114,31 @@ def read_pdf(
         scale: rendering scale (1 corresponds to 72dpi)
         rgb_mode: if True, the output will be RGB, otherwise BGR
         password: a password to unlock the document, if encrypted
+        pages: indices of the pages to read (e.g. `range(10)`), all of them by default
+        max_pixels: if specified, each page is rendered with the scale matching this number of pixels,
+            instead of `scale`
+        lazy: if True, returns a sequence which only renders pages when they are accessed
+        num_workers: if specified, pages are rendered in parallel by this number of spawned processes (fork isn't
+            safe once the deep learning frameworks are initialized). A file passed as bytes is pickled once per
+            process.
         **kwargs: additional parameters to :meth:`pypdfium2.PdfPage.render`
 
     Returns:
     -------
         the list of pages decoded as numpy ndarray of shape H x W x C
     """
+    if lazy and isinstance(num_workers, int):
+        raise ValueError("`lazy` and `num_workers` are mutually exclusive.")
+    render_kwargs = dict(scale=scale, rgb_mode=rgb_mode, max_pixels=max_pixels, **kwargs)
     # Rasterise pages to numpy ndarrays with pypdfium2
     pdf = pdfium.PdfDocument(file, password=password, autoclose=True)
-    return [page.render(scale=scale, rev_byteorder=rgb_mode, **kwargs).to_numpy() for page in pdf]
+    indices = _resolve_page_indices(len(pdf), pages)
+    if lazy:
+        return PDFPages(pdf, indices, **render_kwargs)
+    if isinstance(num_workers, int) and num_workers > 1 and len(indices) > 1:
+        pdf.close()
+        chunks = [chunk.tolist() for chunk in np.array_split(indices, min(num_workers, len(indices)))]
+        with ProcessPoolExecutor(max_workers=len(chunks), mp_context=mp.get_context("spawn")) as executor:
+            futures = [executor.submit(_render_pages, file, password, chunk, render_kwargs) for chunk in chunks]
+            return [page for future in futures for page in future.result()]
+    return [_render_page(pdf, idx, **render_kwargs) for idx in indices]
@@ -13,7 +13,7 @@ from doctr.utils.common_types import AbstractFile
 
 from .html import read_html
 from .image import read_img_as_numpy
-from .pdf import read_pdf
+from .pdf import PDFPages, read_pdf
 
 __all__ = ["DocumentFile"]
 
@@ -22,7 +22,7 @@ class DocumentFile:
     """Read a document from multiple extensions"""
 
     @classmethod
-    def from_pdf(cls, file: AbstractFile, **kwargs) -> List[np.ndarray]:
+    def from_pdf(cls, file: AbstractFile, **kwargs) -> Union[List[np.ndarray], PDFPages]:
         """Read a PDF file
 
         >>> from doctr.io import DocumentFile
@@ -31,16 +31,17 @@ class DocumentFile:
         Args:
         ----
             file: the path to the PDF file or a binary stream
-            **kwargs: additional parameters to :meth:`pypdfium2.PdfPage.render`
+            **kwargs: additional parameters to :func:`doctr.io.read_pdf` (e.g. `lazy`, `pages`, `max_pixels`)
+                and :meth:`pypdfium2.PdfPage.render`
 
         Returns:
         -------
-            the list of pages decoded as numpy ndarray of shape H x W x 3
+            the list of pages decoded as numpy ndarray of shape H x W x 3 (a lazy sequence if `lazy` is True)
         """
         return read_pdf(file, **kwargs)
 
     @classmethod
-    def from_url(cls, url: str, **kwargs) -> List[np.ndarray]:
+    def from_url(cls, url: str, **kwargs) -> Union[List[np.ndarray], PDFPages]:
         """Interpret a web page as a PDF document
 
         >>> from doctr.io import DocumentFile
@@ -49,11 +50,12 @@ class DocumentFile:
         Args:
         ----
             url: the URL of the target web page
-            **kwargs: additional parameters to :meth:`pypdfium2.PdfPage.render`
+            **kwargs: additional parameters to :func:`doctr.io.read_pdf` (e.g. `lazy`, `pages`, `max_pixels`)
+                and :meth:`pypdfium2.PdfPage.render`
 
         Returns:
         -------
-            the list of pages decoded as numpy ndarray of shape H x W x 3
+            the list of pages decoded as numpy ndarray of shape H x W x 3 (a lazy sequence if `lazy` is True)
         """
         requires_package(
             "weasyprint",
@@ -3,19 +3,45 @@
 # This program is licensed under the Apache License 2.0.
 # See LICENSE or go to <https://opensource.org/licenses/Apache-2.0> for full license details.
 
-
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 from scipy.cluster.hierarchy import fclusterdata
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from scipy.spatial import cKDTree
 
+from doctr.io.columnar import ColumnarDocument, ColumnarPage
 from doctr.io.elements import Block, Document, KIEDocument, KIEPage, Line, Page, Prediction, Word
 from doctr.utils.geometry import estimate_page_angle, resolve_enclosing_bbox, resolve_enclosing_rbbox, rotate_boxes
+from doctr.utils.profiling import profiled
 from doctr.utils.repr import NestedObject
 
 __all__ = ["DocumentBuilder"]
 
 
+def _link_clusters(features: np.ndarray, threshold: float) -> np.ndarray:
+    """Flat clusters of the single-linkage clustering of points cut at a distance threshold, i.e. the connected
+    components of the graph linking the points closer than the threshold. The pairs of close points are retrieved
+    with a k-d tree, which avoids computing all pairwise distances.
+
+    Args:
+    ----
+        features: points of shape (N, D)
+        threshold: maximum (euclidean) distance between two linked points
+
+    Returns:
+    -------
+        the cluster index of each point, of shape (N,)
+    """
+    num_points = features.shape[0]
+    pairs = cKDTree(features).query_pairs(threshold, output_type="ndarray")
+    adjacency = coo_matrix(
+        (np.ones(pairs.shape[0], dtype=bool), (pairs[:, 0], pairs[:, 1])), shape=(num_points, num_points)
+    )
+    return connected_components(adjacency, directed=False)[1]
+
+
 class DocumentBuilder(NestedObject):
     """Implements a document builder
 
@@ -26,6 +52,10 @@ class DocumentBuilder(NestedObject):
         paragraph_break: relative length of the minimum space separating paragraphs
         export_as_straight_boxes: if True, force straight boxes in the export (fit a rectangle
             box to all rotated boxes). Else, keep the boxes format unchanged, no matter what it is.
+        block_resolution: clustering of the lines into blocks, either "hierarchical" (scipy's `fclusterdata`,
+            quadratic in the number of lines) or "spatial" (same clusters, linked through a k-d tree)
+        columnar: if True, build a `ColumnarDocument`, which stores the words of each page in arrays and only builds
+            the Block, Line and Word objects on access
     """
 
     def __init__(
@@ -34,11 +64,17 @@ class DocumentBuilder(NestedObject):
         resolve_blocks: bool = True,
         paragraph_break: float = 0.035,
         export_as_straight_boxes: bool = False,
+        block_resolution: str = "hierarchical",
+        columnar: bool = False,
     ) -> None:
+        if block_resolution not in ("hierarchical", "spatial"):
+            raise ValueError(f"unsupported block resolution: {block_resolution}")
         self.resolve_lines = resolve_lines
         self.resolve_blocks = resolve_blocks
         self.paragraph_break = paragraph_break
         self.export_as_straight_boxes = export_as_straight_boxes
+        self.block_resolution = block_resolution
+        self.columnar = columnar
 
     @staticmethod
     def _sort_boxes(boxes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
@@ -65,45 +101,39 @@ class DocumentBuilder(NestedObject):
             boxes = np.concatenate((boxes.min(1), boxes.max(1)), -1)
         return (boxes[:, 0] + 2 * boxes[:, 3] / np.median(boxes[:, 3] - boxes[:, 1])).argsort(), boxes
 
-    def _resolve_sub_lines(self, boxes: np.ndarray, word_idcs: List[int]) -> List[List[int]]:
-        """Split a line in sub_lines
+    def _resolve_sub_lines(
+        self, boxes: np.ndarray, word_idcs: List[int], line_idcs: Optional[List[int]] = None
+    ) -> List[List[int]]:
+        """Split lines in sub_lines
 
         Args:
         ----
             boxes: bounding boxes of shape (N, 4)
-            word_idcs: list of indexes for the words of the line
+            word_idcs: list of indexes for the words of the lines
+            line_idcs: index of the line of each word, all words belong to the same line by default
 
         Returns:
         -------
-            A list of (sub-)lines computed from the original line (words)
+            A list of (sub-)lines computed from the original lines (words)
         """
-        lines = []
-        # Sort words horizontally
-        word_idcs = [word_idcs[idx] for idx in boxes[word_idcs, 0].argsort().tolist()]
-
-        # Eventually split line horizontally
-        if len(word_idcs) < 2:
-            lines.append(word_idcs)
-        else:
-            sub_line = [word_idcs[0]]
-            for i in word_idcs[1:]:
-                horiz_break = True
-
-                prev_box = boxes[sub_line[-1]]
-                # Compute distance between boxes
-                dist = boxes[i, 0] - prev_box[2]
-                # If distance between boxes is lower than paragraph break, same sub-line
-                if dist < self.paragraph_break:
-                    horiz_break = False
-
-                if horiz_break:
-                    lines.append(sub_line)
-                    sub_line = []
-
-                sub_line.append(i)
-            lines.append(sub_line)
-
-        return lines
+        _word_idcs = np.asarray(word_idcs, dtype=np.int64)
+        _line_idcs = np.zeros_like(_word_idcs) if line_idcs is None else np.asarray(line_idcs)
+        # Group words line by line, keeping their order within each line
+        order = np.argsort(_line_idcs, kind="stable")
+        _word_idcs, _line_idcs = _word_idcs[order], _line_idcs[order]
+        # Sort each line horizontally with its own argsort: words sharing the same xmin must keep the order of the
+        # per-line sort, as the gap to the previous word depends on it
+        line_starts = np.flatnonzero(_line_idcs[1:] != _line_idcs[:-1]) + 1
+        _word_idcs = np.concatenate([line[boxes[line, 0].argsort()] for line in np.split(_word_idcs, line_starts)])
+
+        # Eventually split lines horizontally: same sub-line if the distance between consecutive boxes is lower
+        # than the paragraph break
+        dists = boxes[_word_idcs[1:], 0] - boxes[_word_idcs[:-1], 2]
+        breaks = np.flatnonzero((_line_idcs[1:] != _line_idcs[:-1]) | ~(dists < self.paragraph_break)) + 1
+
+        bounds = [0, *breaks.tolist(), _word_idcs.shape[0]]
+        words = _word_idcs.tolist()
+        return [words[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
 
     def _resolve_lines(self, boxes: np.ndarray) -> List[List[int]]:
         """Order boxes to group them in lines
@@ -121,39 +151,26 @@ class DocumentBuilder(NestedObject):
 
         # Compute median for boxes heights
         y_med = np.median(boxes[:, 3] - boxes[:, 1])
+        # y-centers of the sorted boxes
+        y_centers = ((boxes[idxs, 1] + boxes[idxs, 3]) / 2).tolist()
+        y_thresh = float(y_med / 2)
+
+        # A box starts a new line when its y-center is too far from the mean y-center of the current line
+        # The running mean is sequential by nature, but only involves python floats
+        is_start = [False] * len(y_centers)
+        y_center_sum, num_words = y_centers[0], 1
+        for idx, y_center in enumerate(y_centers[1:], 1):
+            if abs(y_center - y_center_sum / num_words) < y_thresh:
+                y_center_sum += y_center
+                num_words += 1
+            else:
+                is_start[idx] = True
+                y_center_sum, num_words = y_center, 1
 
-        lines = []
-        words = [idxs[0]]  # Assign the top-left word to the first line
-        # Define a mean y-center for the line
-        y_center_sum = boxes[idxs[0]][[1, 3]].mean()
-
-        for idx in idxs[1:]:
-            vert_break = True
-
-            # Compute y_dist
-            y_dist = abs(boxes[idx][[1, 3]].mean() - y_center_sum / len(words))
-            # If y-center of the box is close enough to mean y-center of the line, same line
-            if y_dist < y_med / 2:
-                vert_break = False
-
-            if vert_break:
-                # Compute sub-lines (horizontal split)
-                lines.extend(self._resolve_sub_lines(boxes, words))
-                words = []
-                y_center_sum = 0
-
-            words.append(idx)
-            y_center_sum += boxes[idx][[1, 3]].mean()
-
-        # Use the remaining words to form the last(s) line(s)
-        if len(words) > 0:
-            # Compute sub-lines (horizontal split)
-            lines.extend(self._resolve_sub_lines(boxes, words))
-
-        return lines
+        # Compute sub-lines (horizontal split)
+        return self._resolve_sub_lines(boxes, idxs, np.cumsum(is_start))  # type: ignore[arg-type]
 
-    @staticmethod
-    def _resolve_blocks(boxes: np.ndarray, lines: List[List[int]]) -> List[List[List[int]]]:
+    def _resolve_blocks(self, boxes: np.ndarray, lines: List[List[int]]) -> List[List[List[int]]]:
         """Order lines to group them in blocks
 
         Args:
@@ -205,7 +222,10 @@ class DocumentBuilder(NestedObject):
                 axis=-1,
             )
         # Compute clusters
-        clusters = fclusterdata(box_features, t=0.1, depth=4, criterion="distance", metric="euclidean")
+        if self.block_resolution == "spatial":
+            clusters = _link_clusters(box_features, 0.1)
+        else:
+            clusters = fclusterdata(box_features, t=0.1, depth=4, criterion="distance", metric="euclidean")
 
         _blocks: Dict[int, List[int]] = {}
         # Form clusters
@@ -220,28 +240,17 @@ class DocumentBuilder(NestedObject):
 
         return blocks
 
-    def _build_blocks(
-        self,
-        boxes: np.ndarray,
-        word_preds: List[Tuple[str, float]],
-        crop_orientations: List[Dict[str, Any]],
-    ) -> List[Block]:
-        """Gather independent words in structured blocks
+    def _group_words(self, boxes: np.ndarray) -> List[List[List[int]]]:
+        """Group the words of a page in lines, and the lines in blocks
 
         Args:
         ----
             boxes: bounding boxes of all detected words of the page, of shape (N, 5) or (N, 4, 2)
-            word_preds: list of all detected words of the page, of shape N
-            crop_orientations: list of dictoinaries containing
-                the general orientation (orientations + confidences) of the crops
 
         Returns:
         -------
-            list of block elements
+            nested list of box indices
         """
-        if boxes.shape[0] != len(word_preds):
-            raise ValueError(f"Incompatible argument lengths: {boxes.shape[0]}, {len(word_preds)}")
-
         if boxes.shape[0] == 0:
             return []
 
@@ -259,6 +268,32 @@ class DocumentBuilder(NestedObject):
             lines = [self._sort_boxes(_boxes if _boxes.ndim == 3 else _boxes[:, :4])[0]]  # type: ignore[list-item]
             _blocks = [lines]
 
+        return _blocks
+
+    def _build_blocks(
+        self,
+        boxes: np.ndarray,
+        word_preds: List[Tuple[str, float]],
+        crop_orientations: List[Dict[str, Any]],
+    ) -> List[Block]:
+        """Gather independent words in structured blocks
+
+        Args:
+        ----
+            boxes: bounding boxes of all detected words of the page, of shape (N, 5) or (N, 4, 2)
+            word_preds: list of all detected words of the page, of shape N
+            crop_orientations: list of dictoinaries containing
+                the general orientation (orientations + confidences) of the crops
+
+        Returns:
+        -------
+            list of block elements
+        """
+        if boxes.shape[0] != len(word_preds):
+            raise ValueError(f"Incompatible argument lengths: {boxes.shape[0]}, {len(word_preds)}")
+
+        _blocks = self._group_words(boxes)
+
         blocks = [
             Block([
                 Line([
@@ -286,19 +321,21 @@ class DocumentBuilder(NestedObject):
         return (
             f"resolve_lines={self.resolve_lines}, resolve_blocks={self.resolve_blocks}, "
             f"paragraph_break={self.paragraph_break}, "
-            f"export_as_straight_boxes={self.export_as_straight_boxes}"
+            f"export_as_straight_boxes={self.export_as_straight_boxes}, "
+            f"block_resolution='{self.block_resolution}'" + (", columnar=True" if self.columnar else "")
         )
 
+    @profiled("build")
     def __call__(
         self,
         pages: List[np.ndarray],
         boxes: List[np.ndarray],
         text_preds: List[List[Tuple[str, float]]],
         page_shapes: List[Tuple[int, int]],
-        crop_orientations: List[Dict[str, Any]],
+        crop_orientations: List[List[Dict[str, Any]]],
         orientations: Optional[List[Dict[str, Any]]] = None,
         languages: Optional[List[Dict[str, Any]]] = None,
-    ) -> Document:
+    ) -> Union[Document, ColumnarDocument]:
         """Re-arrange detected words into structured blocks
 
         Args:
@@ -308,8 +345,8 @@ class DocumentBuilder(NestedObject):
                 or (*, 6) for all words for a given page
             text_preds: list of N elements, where each element is the list of all word prediction (text + confidence)
             page_shapes: shape of each page, of size N
-            crop_orientations: list of N elements, where each element is
-                a dictionary containing the general orientation (orientations + confidences) of the crops
+            crop_orientations: list of N elements, where each element is the list of
+                dictionaries containing the orientation (orientation + confidence) of each crop of the page
             orientations: optional, list of N elements,
                 where each element is a dictionary containing the orientation (orientation + confidence)
             languages: optional, list of N elements,
@@ -317,7 +354,7 @@ class DocumentBuilder(NestedObject):
 
         Returns:
         -------
-            document object
+            document object (columnar document if the builder is columnar)
         """
         if len(boxes) != len(text_preds) != len(crop_orientations) or len(boxes) != len(page_shapes) != len(
             crop_orientations
@@ -334,6 +371,33 @@ class DocumentBuilder(NestedObject):
                 # Iterate over pages and boxes
                 boxes = [np.concatenate((p_boxes.min(1), p_boxes.max(1)), 1) for p_boxes in boxes]
 
+        if self.columnar:
+            if any(page_boxes.shape[0] != len(word_preds) for page_boxes, word_preds in zip(boxes, text_preds)):
+                raise ValueError("Incompatible argument lengths between boxes and text predictions")
+            return ColumnarDocument([
+                ColumnarPage.from_boxes(
+                    page,
+                    page_boxes,
+                    word_preds,
+                    word_crop_orientations,
+                    self._group_words(page_boxes),
+                    _idx,
+                    shape,
+                    orientation,
+                    language,
+                )
+                for page, _idx, shape, page_boxes, word_preds, word_crop_orientations, orientation, language in zip(
+                    pages,
+                    range(len(boxes)),
+                    page_shapes,
+                    boxes,
+                    text_preds,
+                    crop_orientations,
+                    _orientations,
+                    _languages,
+                )
+            ])
+
         _pages = [
             Page(
                 page,
@@ -365,8 +429,11 @@ class KIEDocumentBuilder(DocumentBuilder):
         paragraph_break: relative length of the minimum space separating paragraphs
         export_as_straight_boxes: if True, force straight boxes in the export (fit a rectangle
             box to all rotated boxes). Else, keep the boxes format unchanged, no matter what it is.
+        block_resolution: clustering of the lines into blocks, either "hierarchical" (scipy's `fclusterdata`,
+            quadratic in the number of lines) or "spatial" (same clusters, linked through a k-d tree)
     """
 
+    @profiled("build")
     def __call__(  # type: ignore[override]
         self,
         pages: List[np.ndarray],
@@ -3,15 +3,33 @@
 # This program is licensed under the Apache License 2.0.
 # See LICENSE or go to <https://opensource.org/licenses/Apache-2.0> for full license details.
 
+import threading
 from typing import List
 
 import cv2
 import numpy as np
 
+from doctr.utils.multithreading import multithread_exec
+from doctr.utils.profiling import profiled
 from doctr.utils.repr import NestedObject
 
 __all__ = ["DetectionPostProcessor"]
 
+# Scratch buffer to rasterize polygons, one per thread
+_SCRATCH = threading.local()
+
+
+def _get_mask(height: int, width: int) -> np.ndarray:
+    """Get a blank mask from the scratch buffer of the current thread, which is only reallocated to grow"""
+    buffer = getattr(_SCRATCH, "mask", None)
+    if buffer is None or buffer.shape[0] < height or buffer.shape[1] < width:
+        shape = (height, width) if buffer is None else (max(height, buffer.shape[0]), max(width, buffer.shape[1]))
+        buffer = np.empty(shape, dtype=np.uint8)
+        _SCRATCH.mask = buffer
+    mask = buffer[:height, :width]
+    mask.fill(0)
+    return mask
+
 
 class DetectionPostProcessor(NestedObject):
     """Abstract class to postprocess the raw output of the model
@@ -56,9 +74,13 @@ class DetectionPostProcessor(NestedObject):
             return pred[ymin : ymax + 1, xmin : xmax + 1].mean()
 
         else:
-            mask: np.ndarray = np.zeros((h, w), np.int32)
-            cv2.fillPoly(mask, [points.astype(np.int32)], 1.0)  # type: ignore[call-overload]
-            product = pred * mask
+            # Only rasterize the polygon within its bounding rectangle
+            points = points.reshape(-1, 2).astype(np.int32)
+            xmin, ymin = np.clip(points.min(axis=0), 0, [w - 1, h - 1])
+            xmax, ymax = np.clip(points.max(axis=0), 0, [w - 1, h - 1])
+            mask = _get_mask(ymax - ymin + 1, xmax - xmin + 1)
+            cv2.fillPoly(mask, [points - np.array([xmin, ymin], dtype=np.int32)], 1)  # type: ignore[call-overload]
+            product = pred[ymin : ymax + 1, xmin : xmax + 1] * mask
             return np.sum(product) / np.count_nonzero(product)
 
     def bitmap_to_boxes(
@@ -68,6 +90,7 @@ class DetectionPostProcessor(NestedObject):
     ) -> np.ndarray:
         raise NotImplementedError
 
+    @profiled("det_postprocess")
     def __call__(
         self,
         proba_map,
@@ -86,16 +109,14 @@ class DetectionPostProcessor(NestedObject):
         if proba_map.ndim != 4:
             raise AssertionError(f"arg `proba_map` is expected to be 4-dimensional, got {proba_map.ndim}.")
 
+        num_classes = proba_map.shape[-1]
+        pmaps = [pmaps[..., idx] for pmaps in proba_map for idx in range(num_classes)]
+        # OpenCV releases the GIL: each page & class is processed by a separate thread
+        boxes = list(multithread_exec(self._process_map, pmaps, chunksize=1))
+
+        return [boxes[idx : idx + num_classes] for idx in range(0, len(boxes), num_classes)]
+
+    def _process_map(self, pmap: np.ndarray) -> np.ndarray:
         # Erosion + dilation on the binary map
-        bin_map = [
-            [
-                cv2.morphologyEx(bmap[..., idx], cv2.MORPH_OPEN, self._opening_kernel)
-                for idx in range(proba_map.shape[-1])
-            ]
-            for bmap in (proba_map >= self.bin_thresh).astype(np.uint8)
-        ]
-
-        return [
-            [self.bitmap_to_boxes(pmaps[..., idx], bmaps[idx]) for idx in range(proba_map.shape[-1])]
-            for pmaps, bmaps in zip(proba_map, bin_map)
-        ]
+        bmap = cv2.morphologyEx((pmap >= self.bin_thresh).astype(np.uint8), cv2.MORPH_OPEN, self._opening_kernel)
+        return self.bitmap_to_boxes(pmap, bmap)
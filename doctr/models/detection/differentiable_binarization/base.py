@@ -5,7 +5,7 @@
 
 # Credits: post-processing adapted from https://github.com/xuannianz/DifferentiableBinarization
 
-from typing import Dict, List, Tuple, Union
+from typing import Dict, List, Tuple
 
 import cv2
 import numpy as np
@@ -99,8 +99,6 @@ class DBPostProcessor(DetectionPostProcessor):
         ----
             pred: Pred map from differentiable binarization output
             bitmap: Bitmap map computed from pred (binarized)
-            angle_tol: Comparison tolerance of the angle with the median angle across the page
-            ratio_tol: Under this limit aspect ratio, we cannot resolve the direction of the crop
 
         Returns:
         -------
@@ -109,53 +107,128 @@ class DBPostProcessor(DetectionPostProcessor):
         """
         height, width = bitmap.shape[:2]
         min_size_box = 2
-        boxes: List[Union[np.ndarray, List[float]]] = []
-        # get contours from connected components on the bitmap
-        contours, _ = cv2.findContours(bitmap.astype(np.uint8), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        bitmap = bitmap.astype(np.uint8)
+        # get connected components on the bitmap (label 0 is the background), labeled in raster order
+        num_labels, labels, stats, _ = cv2.connectedComponentsWithStatsWithAlgorithm(bitmap, 8, cv2.CV_32S, cv2.CCL_WU)
+
+        if self.assume_straight_pages:
+            # Only keep the components reached by the outer background, like external contours
+            is_external = _external_components(bitmap, labels, num_labels)
+            # Same order as the external contours
+            x, y, w, h = stats[1:][is_external[1:], :4][::-1].T.astype(np.float64)
+            # Check whether smallest enclosing bounding box is not too small
+            is_kept = (w > min_size_box) & (h > min_size_box)
+            x, y, w, h = x[is_kept], y[is_kept], w[is_kept], h[is_kept]
+            # Compute objectness: mean of the p values over the enclosing rectangle, using the integral image
+            integral = cv2.integral(np.ascontiguousarray(pred, dtype=np.float32), sdepth=cv2.CV_64F)
+            xmin, ymin = x.astype(np.int64), y.astype(np.int64)
+            xmax = np.minimum(xmin + w.astype(np.int64), width - 1) + 1
+            ymax = np.minimum(ymin + h.astype(np.int64), height - 1) + 1
+            scores = (integral[ymax, xmax] - integral[ymin, xmax] - integral[ymax, xmin] + integral[ymin, xmin]) / (
+                (xmax - xmin) * (ymax - ymin)
+            )
+            # remove polygons with a weak objectness
+            is_kept = scores >= self.box_thresh
+            x, y, w, h, scores = x[is_kept], y[is_kept], w[is_kept], h[is_kept], scores[is_kept]
+            if x.shape[0] == 0:
+                return np.zeros((0, 5), dtype=pred.dtype)
+            # Expand rectangles by the unclip distance (rounded like pyclipper), the enclosing box includes the
+            # last pixel
+            distance = w * h * self.unclip_ratio / (2 * (w + h))
+            boxes = np.stack(
+                [
+                    _round_half_away(x - distance) / width,
+                    _round_half_away(y - distance) / height,
+                    (_round_half_away(x + w + distance) + 1) / width,
+                    (_round_half_away(y + h + distance) + 1) / height,
+                    scores,
+                ],
+                axis=1,
+            )
+            return np.clip(boxes, 0, 1)
+
+        # Compute objectness: mean of the p values over each connected component
+        counts = np.bincount(labels.ravel(), minlength=num_labels)
+        label_scores = np.bincount(labels.ravel(), weights=pred.ravel(), minlength=num_labels) / np.maximum(counts, 1)
+        rects, scores = [], []
+        contours, _ = cv2.findContours(bitmap, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
         for contour in contours:
             # Check whether smallest enclosing bounding box is not too small
             if np.any(contour[:, 0].max(axis=0) - contour[:, 0].min(axis=0) < min_size_box):
                 continue
-            # Compute objectness
-            if self.assume_straight_pages:
-                x, y, w, h = cv2.boundingRect(contour)
-                points: np.ndarray = np.array([[x, y], [x, y + h], [x + w, y + h], [x + w, y]])
-                score = self.box_score(pred, points, assume_straight_pages=True)
-            else:
-                score = self.box_score(pred, contour, assume_straight_pages=False)
-
+            # Any point of the external contour belongs to the connected component
+            score = label_scores[labels[contour[0, 0, 1], contour[0, 0, 0]]]
             if score < self.box_thresh:  # remove polygons with a weak objectness
                 continue
+            # Compute the rectangle polygon enclosing the raw polygon
+            (center_x, center_y), (rect_w, rect_h), rect_angle = cv2.minAreaRect(contour)
+            rects.append([center_x, center_y, rect_w, rect_h, rect_angle])
+        if len(rects) == 0:
+            return np.zeros((0, 4, 2), dtype=pred.dtype)
+        cx, cy, rw, rh, angle = np.asarray(rects, dtype=np.float64).T
+        # Use the same corner order as the enclosing rectangle of the unclipped polygon (angle in [0, 90))
+        is_swapped = angle >= 90
+        rw, rh = np.where(is_swapped, rh, rw), np.where(is_swapped, rw, rh)
+        angle = np.where(is_swapped, angle - 90, angle)
+        # Expand rectangles by the unclip distance (add 1 pixel to correct cv2 approx)
+        distance = (rw + 1) * (rh + 1) * self.unclip_ratio / (2 * (rw + rh) + 2)
+        _boxes = _box_points(np.stack([cx, cy], axis=1), rw + 2 * distance, rh + 2 * distance, angle)
+        _boxes = np.roll(_boxes, -1, axis=1)
+        # Remove too small boxes
+        _boxes = _boxes[np.linalg.norm(_boxes[:, 2] - _boxes[:, 0], axis=-1) >= min_size_box]
+        if _boxes.shape[0] == 0:
+            return np.zeros((0, 4, 2), dtype=pred.dtype)
+        # compute relative boxes to get rid of img shape
+        _boxes[..., 0] /= width
+        _boxes[..., 1] /= height
+        return np.clip(_boxes.astype(np.float32), 0, 1)
+
+
+def _external_components(bitmap: np.ndarray, labels: np.ndarray, num_labels: int) -> np.ndarray:
+    """Flag the connected components which are not nested in the hole of another component
 
-            if self.assume_straight_pages:
-                _box = self.polygon_to_box(points)
-            else:
-                _box = self.polygon_to_box(np.squeeze(contour))
+    Args:
+    ----
+        bitmap: binary map of shape (H, W)
+        labels: connected components of the bitmap (8-connectivity) of shape (H, W)
+        num_labels: number of labels, including the background
 
-            # Remove too small boxes
-            if self.assume_straight_pages:
-                if _box is None or _box[2] < min_size_box or _box[3] < min_size_box:
-                    continue
-            elif np.linalg.norm(_box[2, :] - _box[0, :], axis=-1) < min_size_box:
-                continue
+    Returns:
+    -------
+        boolean array of shape (num_labels,)
+    """
+    # The background is 4-connected when the foreground is 8-connected
+    background = cv2.copyMakeBorder(1 - bitmap, 1, 1, 1, 1, cv2.BORDER_CONSTANT, value=(1,))
+    _, background_labels = cv2.connectedComponents(background, connectivity=4)
+    outer = (background_labels == background_labels[0, 0]).astype(np.uint8)
+    outer = cv2.dilate(outer, cv2.getStructuringElement(cv2.MORPH_CROSS, (3, 3)))[1:-1, 1:-1]
+    return np.bincount(labels[outer.astype(bool)], minlength=num_labels) > 0
 
-            if self.assume_straight_pages:
-                x, y, w, h = _box
-                # compute relative polygon to get rid of img shape
-                xmin, ymin, xmax, ymax = x / width, y / height, (x + w) / width, (y + h) / height
-                boxes.append([xmin, ymin, xmax, ymax, score])
-            else:
-                # compute relative box to get rid of img shape, in that case _box is a 4pt polygon
-                if not isinstance(_box, np.ndarray) and _box.shape == (4, 2):
-                    raise AssertionError("When assume straight pages is false a box is a (4, 2) array (polygon)")
-                _box[:, 0] /= width
-                _box[:, 1] /= height
-                boxes.append(_box)
 
-        if not self.assume_straight_pages:
-            return np.clip(np.asarray(boxes), 0, 1) if len(boxes) > 0 else np.zeros((0, 4, 2), dtype=pred.dtype)
-        else:
-            return np.clip(np.asarray(boxes), 0, 1) if len(boxes) > 0 else np.zeros((0, 5), dtype=pred.dtype)
+def _round_half_away(x: np.ndarray) -> np.ndarray:
+    """Round half away from zero (the rounding used by pyclipper)"""
+    return np.sign(x) * np.floor(np.abs(x) + 0.5)
+
+
+def _box_points(centers: np.ndarray, widths: np.ndarray, heights: np.ndarray, angles: np.ndarray) -> np.ndarray:
+    """Batched version of `cv2.boxPoints`
+
+    Args:
+    ----
+        centers: rotated rectangle centers of shape (N, 2)
+        widths: rotated rectangle widths of shape (N,)
+        heights: rotated rectangle heights of shape (N,)
+        angles: rotated rectangle angles (in degrees) of shape (N,)
+
+    Returns:
+    -------
+        the corners of the rectangles, of shape (N, 4, 2)
+    """
+    b = np.cos(np.deg2rad(angles)) * 0.5
+    a = np.sin(np.deg2rad(angles)) * 0.5
+    pt0 = np.stack([centers[:, 0] - a * heights - b * widths, centers[:, 1] + b * heights - a * widths], axis=1)
+    pt1 = np.stack([centers[:, 0] + a * heights - b * widths, centers[:, 1] - b * heights - a * widths], axis=1)
+    return np.stack([pt0, pt1, 2 * centers - pt0, 2 * centers - pt1], axis=1)
 
 
 class _DBNet:
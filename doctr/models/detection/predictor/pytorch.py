@@ -11,6 +11,7 @@ from torch import nn
 
 from doctr.models.preprocessor import PreProcessor
 from doctr.models.utils import set_device_and_dtype
+from doctr.utils.profiling import profile_stage
 
 __all__ = ["DetectionPredictor"]
 
@@ -44,14 +45,16 @@ class DetectionPredictor(nn.Module):
         if any(page.ndim != 3 for page in pages):
             raise ValueError("incorrect input shape: all pages are expected to be multi-channel 2D images.")
 
-        processed_batches = self.pre_processor(pages)
+        with profile_stage("det_preprocess", pages=len(pages)):
+            processed_batches = self.pre_processor(pages)
         _params = next(self.model.parameters())
         self.model, processed_batches = set_device_and_dtype(
             self.model, processed_batches, _params.device, _params.dtype
         )
-        predicted_batches = [
-            self.model(batch, return_preds=True, return_model_output=True, **kwargs) for batch in processed_batches
-        ]
+        predicted_batches = []
+        for batch in processed_batches:
+            with profile_stage("det_forward", shape=batch.shape, pages=batch.shape[0]):
+                predicted_batches.append(self.model(batch, return_preds=True, return_model_output=True, **kwargs))
         preds = [pred for batch in predicted_batches for pred in batch["preds"]]
         if return_maps:
             seg_maps = [
@@ -10,6 +10,7 @@ import tensorflow as tf
 from tensorflow import keras
 
 from doctr.models.preprocessor import PreProcessor
+from doctr.utils.profiling import profile_stage
 from doctr.utils.repr import NestedObject
 
 __all__ = ["DetectionPredictor"]
@@ -44,11 +45,14 @@ class DetectionPredictor(NestedObject):
         if any(page.ndim != 3 for page in pages):
             raise ValueError("incorrect input shape: all pages are expected to be multi-channel 2D images.")
 
-        processed_batches = self.pre_processor(pages)
-        predicted_batches = [
-            self.model(batch, return_preds=True, return_model_output=True, training=False, **kwargs)
-            for batch in processed_batches
-        ]
+        with profile_stage("det_preprocess", pages=len(pages)):
+            processed_batches = self.pre_processor(pages)
+        predicted_batches = []
+        for batch in processed_batches:
+            with profile_stage("det_forward", shape=batch.shape, pages=batch.shape[0]):
+                predicted_batches.append(
+                    self.model(batch, return_preds=True, return_model_output=True, training=False, **kwargs)
+                )
 
         preds = [pred for batch in predicted_batches for pred in batch["preds"]]
         if return_maps:
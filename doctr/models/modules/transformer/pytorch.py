@@ -6,7 +6,7 @@
 # This module 'transformer.py' is inspired by https://github.com/wenwenyu/MASTER-pytorch and Decoder is borrowed
 
 import math
-from typing import Any, Callable, Optional, Tuple
+from typing import Any, Callable, List, Optional, Tuple
 
 import torch
 from torch import nn
@@ -29,18 +29,19 @@ class PositionalEncoding(nn.Module):
         pe[:, 1::2] = torch.cos(position * div_term)
         self.register_buffer("pe", pe.unsqueeze(0))
 
-    def forward(self, x: torch.Tensor) -> torch.Tensor:
+    def forward(self, x: torch.Tensor, offset: int = 0) -> torch.Tensor:
         """Forward pass
 
         Args:
         ----
             x: embeddings (batch, max_len, d_model)
+            offset: position of the first embedding in the sequence
 
         Returns
         -------
             positional embeddings (batch, max_len, d_model)
         """
-        x = x + self.pe[:, : x.size(1)]
+        x = x + self.pe[:, offset : offset + x.size(1)]
         return self.dropout(x)
 
 
@@ -85,13 +86,32 @@ class MultiHeadAttention(nn.Module):
         self.output_linear = nn.Linear(d_model, d_model)
 
     def forward(self, query: torch.Tensor, key: torch.Tensor, value: torch.Tensor, mask=None) -> torch.Tensor:
-        batch_size = query.size(0)
+        return self.attend(query, *self.project_key_value(key, value), mask=mask)
+
+    def project_key_value(self, key: torch.Tensor, value: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+        """Linear projections of K, V split by head, which can be cached to attend them with several queries
+
+        Args:
+        ----
+            key: keys of shape (batch_size, seq_len, d_model)
+            value: values of shape (batch_size, seq_len, d_model)
 
-        # linear projections of Q, K, V
-        query, key, value = [
-            linear(x).view(batch_size, -1, self.num_heads, self.d_k).transpose(1, 2)
-            for linear, x in zip(self.linear_layers, (query, key, value))
+        Returns:
+        -------
+            the projected keys and values, of shape (batch_size, num_heads, seq_len, d_k)
+        """
+        key, value = [
+            linear(x).view(x.size(0), -1, self.num_heads, self.d_k).transpose(1, 2)
+            for linear, x in zip(self.linear_layers[1:], (key, value))
         ]
+        return key, value
+
+    def attend(self, query: torch.Tensor, key: torch.Tensor, value: torch.Tensor, mask=None) -> torch.Tensor:
+        """Attention of the queries over keys and values already projected with `project_key_value`"""
+        batch_size = query.size(0)
+
+        # linear projection of Q
+        query = self.linear_layers[0](query).view(batch_size, -1, self.num_heads, self.d_k).transpose(1, 2)
 
         # apply attention on all the projected vectors in batch
         x, attn = scaled_dot_product_attention(query, key, value, mask=mask)
@@ -200,3 +220,57 @@ class Decoder(nn.Module):
 
         # (batch_size, seq_len, d_model)
         return self.layer_norm_output(output)
+
+    def project_memory(self, memory: torch.Tensor) -> List[Tuple[torch.Tensor, torch.Tensor]]:
+        """Project the memory into the keys & values of the source attention of each layer, to decode step by step
+
+        Args:
+        ----
+            memory: encoded features of shape (batch_size, seq_len, d_model)
+
+        Returns:
+        -------
+            the keys & values of each layer, of shape (batch_size, num_heads, seq_len, d_k)
+        """
+        return [attention.project_key_value(memory, memory) for attention in self.source_attention]  # type: ignore[operator]
+
+    def decode_step(
+        self,
+        tgt: torch.Tensor,
+        offset: int,
+        memory_kv: List[Tuple[torch.Tensor, torch.Tensor]],
+        cache: List[Tuple[torch.Tensor, torch.Tensor]],
+        target_mask: Optional[torch.Tensor] = None,
+    ) -> torch.Tensor:
+        """Decode the last tokens of the target, which attend to the previous tokens through their cached keys & values
+
+        Args:
+        ----
+            tgt: last tokens of the target, of shape (batch_size, seq_len)
+            offset: position of the first of those tokens in the target
+            memory_kv: keys & values of the memory, as returned by `project_memory`
+            cache: keys & values of the self attention of each layer over the previous tokens (empty at the first
+                step), updated in place with those of the decoded tokens
+            target_mask: mask of the previous and decoded tokens which can be attended to
+
+        Returns:
+        -------
+            the decoded tokens, of shape (batch_size, seq_len, d_model)
+        """
+        output = self.positional_encoding(self.embed(tgt) * math.sqrt(self.d_model), offset=offset)
+
+        for i in range(self.num_layers):
+            normed_output = self.layer_norm_input(output)
+            key, value = self.attention[i].project_key_value(normed_output, normed_output)  # type: ignore[operator]
+            if len(cache) > i:
+                key, value = torch.cat([cache[i][0], key], dim=2), torch.cat([cache[i][1], value], dim=2)
+                cache[i] = (key, value)
+            else:
+                cache.append((key, value))
+            output = output + self.dropout(self.attention[i].attend(normed_output, key, value, target_mask))  # type: ignore[operator]
+            normed_output = self.layer_norm_masked_attention(output)
+            output = output + self.dropout(self.source_attention[i].attend(normed_output, *memory_kv[i]))  # type: ignore[operator]
+            normed_output = self.layer_norm_attention(output)
+            output = output + self.dropout(self.position_feed_forward[i](normed_output))
+
+        return self.layer_norm_output(output)
@@ -3,12 +3,17 @@
 # This program is licensed under the Apache License 2.0.
 # See LICENSE or go to <https://opensource.org/licenses/Apache-2.0> for full license details.
 
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from functools import partial
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import numpy as np
 
+from doctr.io.columnar import ColumnarPage
+from doctr.io.elements import KIEPage, Page
 from doctr.models.builder import DocumentBuilder
 from doctr.utils.geometry import extract_crops, extract_rcrops
+from doctr.utils.profiling import profile_stage
 
 from .._utils import rectify_crops, rectify_loc_preds
 from ..classification import crop_orientation_predictor
@@ -57,7 +62,8 @@ class _OCRPredictor:
         channels_last: bool,
         assume_straight_pages: bool = False,
     ) -> List[List[np.ndarray]]:
-        extraction_fn = extract_crops if assume_straight_pages else extract_rcrops
+        # Straight crops are views on the pages, they only get copied when resized by the recognition pre-processor
+        extraction_fn = partial(extract_crops, copy=False) if assume_straight_pages else extract_rcrops
 
         crops = [
             extraction_fn(page, _boxes[:, :4], channels_last=channels_last)  # type: ignore[operator]
@@ -72,15 +78,17 @@ class _OCRPredictor:
         channels_last: bool,
         assume_straight_pages: bool = False,
     ) -> Tuple[List[List[np.ndarray]], List[np.ndarray]]:
-        crops = _OCRPredictor._generate_crops(pages, loc_preds, channels_last, assume_straight_pages)
-
-        # Avoid sending zero-sized crops
-        is_kept = [[all(s > 0 for s in crop.shape) for crop in page_crops] for page_crops in crops]
-        crops = [
-            [crop for crop, _kept in zip(page_crops, page_kept) if _kept]
-            for page_crops, page_kept in zip(crops, is_kept)
-        ]
-        loc_preds = [_boxes[_kept] for _boxes, _kept in zip(loc_preds, is_kept)]
+        with profile_stage("crop", pages=len(pages)) as counts:
+            crops = _OCRPredictor._generate_crops(pages, loc_preds, channels_last, assume_straight_pages)
+
+            # Avoid sending zero-sized crops
+            is_kept = [[all(s > 0 for s in crop.shape) for crop in page_crops] for page_crops in crops]
+            crops = [
+                [crop for crop, _kept in zip(page_crops, page_kept) if _kept]
+                for page_crops, page_kept in zip(crops, is_kept)
+            ]
+            loc_preds = [_boxes[_kept] for _boxes, _kept in zip(loc_preds, is_kept)]
+            counts["crops"] = sum(len(page_crops) for page_crops in crops)
 
         return crops, loc_preds
 
@@ -90,8 +98,11 @@ class _OCRPredictor:
         loc_preds: List[np.ndarray],
     ) -> Tuple[List[List[np.ndarray]], List[np.ndarray], List[Tuple[int, float]]]:
         # Work at a page level
-        orientations, classes, probs = zip(*[self.crop_orientation_predictor(page_crops) for page_crops in crops])  # type: ignore[misc]
-        rect_crops = [rectify_crops(page_crops, orientation) for page_crops, orientation in zip(crops, orientations)]
+        with profile_stage("orientation", crops=sum(len(page_crops) for page_crops in crops)):
+            orientations, classes, probs = zip(*[self.crop_orientation_predictor(page_crops) for page_crops in crops])  # type: ignore[misc]
+            rect_crops = [
+                rectify_crops(page_crops, orientation) for page_crops, orientation in zip(crops, orientations)
+            ]
         rect_loc_preds = [
             rectify_loc_preds(page_loc_preds, orientation) if len(page_loc_preds) > 0 else page_loc_preds
             for page_loc_preds, orientation in zip(loc_preds, orientations)
@@ -168,3 +179,44 @@ class _OCRPredictor:
             hook: a callable that takes as input the `loc_preds` and returns the modified `loc_preds`
         """
         self.hooks.append(hook)
+
+    def stream(
+        self,
+        pages: Iterable[np.ndarray],
+        window: Optional[int] = None,
+        **kwargs: Any,
+    ) -> Iterator[Union[Page, KIEPage, ColumnarPage]]:
+        """Run the predictor on pages coming from an iterable (e.g. a lazily rendered document), and yield each page
+        prediction as soon as it is built
+
+        >>> from doctr.io import DocumentFile
+        >>> from doctr.models import ocr_predictor
+        >>> model = ocr_predictor(pretrained=True)
+        >>> for page in model.stream(DocumentFile.from_pdf("path/to/your/doc.pdf", lazy=True)):
+        ...     print(page.render())
+
+        Args:
+        ----
+            pages: iterable of pages
+            window: maximum number of pages pulled from the iterable at once (defaults to the detection batch size)
+            **kwargs: keyword args of the predictor call
+
+        Returns:
+        -------
+            iterator of page predictions, in the same order as the input pages
+        """
+        if window is None:
+            window = self.det_predictor.pre_processor.batch_size  # type: ignore[attr-defined]
+        if window < 1:
+            raise ValueError("`window` is expected to be a positive integer.")
+        page_iterator = iter(pages)
+        page_idx = 0
+        while True:
+            page_batch = list(islice(page_iterator, window))
+            if not page_batch:
+                return
+            for page in self(page_batch, **kwargs).pages:  # type: ignore[operator]
+                # Index pages in the whole stream
+                page.page_idx = page_idx
+                page_idx += 1
+                yield page
@@ -3,17 +3,19 @@
 # This program is licensed under the Apache License 2.0.
 # See LICENSE or go to <https://opensource.org/licenses/Apache-2.0> for full license details.
 
-from typing import Any, List, Union
+from typing import Any, List, Tuple, Union
 
 import numpy as np
 import torch
 from torch import nn
 
+from doctr.io.columnar import ColumnarDocument
 from doctr.io.elements import Document
 from doctr.models._utils import estimate_orientation, get_language
 from doctr.models.detection.predictor import DetectionPredictor
 from doctr.models.recognition.predictor import RecognitionPredictor
 from doctr.utils.geometry import rotate_image
+from doctr.utils.multithreading import prefetch_exec
 
 from .base import _OCRPredictor
 
@@ -36,6 +38,8 @@ class OCRPredictor(nn.Module, _OCRPredictor):
             page. Doing so will slightly deteriorate the overall latency.
         detect_language: if True, the language prediction will be added to the predictions for each
             page. Doing so will slightly deteriorate the overall latency.
+        pipelined: if True, the text detection of the next page batches runs in a background thread while the
+            current one goes through text recognition. Hooks are then called on each page batch separately.
         **kwargs: keyword args of `DocumentBuilder`
     """
 
@@ -49,6 +53,7 @@ class OCRPredictor(nn.Module, _OCRPredictor):
         symmetric_pad: bool = True,
         detect_orientation: bool = False,
         detect_language: bool = False,
+        pipelined: bool = False,
         **kwargs: Any,
     ) -> None:
         nn.Module.__init__(self)
@@ -59,19 +64,15 @@ class OCRPredictor(nn.Module, _OCRPredictor):
         )
         self.detect_orientation = detect_orientation
         self.detect_language = detect_language
+        self.pipelined = pipelined
+        self.queue_size = 2  # Maximum number of localized page batches waiting for recognition
 
     @torch.inference_mode()
-    def forward(
+    def _localize(
         self,
         pages: List[Union[np.ndarray, torch.Tensor]],
         **kwargs: Any,
-    ) -> Document:
-        # Dimension check
-        if any(page.ndim != 3 for page in pages):
-            raise ValueError("incorrect input shape: all pages are expected to be multi-channel 2D images.")
-
-        origin_page_shapes = [page.shape[:2] if isinstance(page, np.ndarray) else page.shape[-2:] for page in pages]
-
+    ) -> Tuple[List[Union[np.ndarray, torch.Tensor]], List[np.ndarray], List[List[np.ndarray]], Any, Any]:
         # Localize text elements
         loc_preds, out_maps = self.det_predictor(pages, return_maps=True, **kwargs)
 
@@ -127,12 +128,46 @@ class OCRPredictor(nn.Module, _OCRPredictor):
                 {"value": orientation[0], "confidence": orientation[1]} for orientation in _crop_orientations
             ]
 
-        # Identify character sequences
-        word_preds = self.reco_predictor([crop for page_crops in crops for crop in page_crops], **kwargs)
-        if not crop_orientations:
-            crop_orientations = [{"value": 0, "confidence": None} for _ in word_preds]
+        return pages, loc_preds, crops, crop_orientations, orientations
 
-        boxes, text_preds, crop_orientations = self._process_predictions(loc_preds, word_preds, crop_orientations)
+    @torch.inference_mode()
+    def forward(
+        self,
+        pages: List[Union[np.ndarray, torch.Tensor]],
+        **kwargs: Any,
+    ) -> Union[Document, ColumnarDocument]:
+        # Dimension check
+        if any(page.ndim != 3 for page in pages):
+            raise ValueError("incorrect input shape: all pages are expected to be multi-channel 2D images.")
+
+        origin_page_shapes = [page.shape[:2] if isinstance(page, np.ndarray) else page.shape[-2:] for page in pages]
+
+        if self.pipelined:
+            # Localize the text elements of the next page batches while the current one is being recognized
+            det_bs = self.det_predictor.pre_processor.batch_size
+            page_batches = [pages[idx : idx + det_bs] for idx in range(0, len(pages), det_bs)]
+            localized = prefetch_exec(lambda _pages: self._localize(_pages, **kwargs), page_batches, self.queue_size)
+        else:
+            localized = iter([self._localize(pages, **kwargs)])
+
+        processed_pages: List[Union[np.ndarray, torch.Tensor]] = []
+        boxes, text_preds, crop_orientations = [], [], []
+        orientations: Any = [] if self.detect_orientation else None
+        for _pages, _loc_preds, _crops, _crop_orientations, _orientations in localized:
+            # Identify character sequences
+            word_preds = self.reco_predictor([crop for page_crops in _crops for crop in page_crops], **kwargs)
+            if not _crop_orientations:
+                _crop_orientations = [{"value": 0, "confidence": None} for _ in word_preds]
+
+            _boxes, _text_preds, _crop_orientations = self._process_predictions(
+                _loc_preds, word_preds, _crop_orientations
+            )
+            processed_pages.extend(_pages)
+            boxes.extend(_boxes)
+            text_preds.extend(_text_preds)
+            crop_orientations.extend(_crop_orientations)
+            if self.detect_orientation:
+                orientations.extend(_orientations)
 
         if self.detect_language:
             languages = [get_language(" ".join([item[0] for item in text_pred])) for text_pred in text_preds]
@@ -141,7 +176,7 @@ class OCRPredictor(nn.Module, _OCRPredictor):
             languages_dict = None
 
         out = self.doc_builder(
-            pages,  # type: ignore[arg-type]
+            processed_pages,  # type: ignore[arg-type]
             boxes,
             text_preds,
             origin_page_shapes,  # type: ignore[arg-type]
@@ -62,15 +62,22 @@ class PreProcessor(nn.Module):
 
         return batches
 
-    def sample_transforms(self, x: Union[np.ndarray, torch.Tensor]) -> torch.Tensor:
+    def _to_tensor(self, x: Union[np.ndarray, torch.Tensor]) -> torch.Tensor:
         if x.ndim != 3:
             raise AssertionError("expected list of 3D Tensors")
         if isinstance(x, np.ndarray):
             if x.dtype not in (np.uint8, np.float32):
                 raise TypeError("unsupported data type for numpy.ndarray")
-            x = torch.from_numpy(x.copy()).permute(2, 0, 1)
+            # Views on a page (e.g. crops) are used as is, only negative strides (e.g. rotations) need a copy
+            if any(stride < 0 for stride in x.strides) or not x.flags.writeable:
+                x = x.copy()
+            x = torch.from_numpy(x).permute(2, 0, 1)
         elif x.dtype not in (torch.uint8, torch.float16, torch.float32):
             raise TypeError("unsupported data type for torch.Tensor")
+        return x
+
+    def sample_transforms(self, x: Union[np.ndarray, torch.Tensor]) -> torch.Tensor:
+        x = self._to_tensor(x)
         # Resizing
         x = self.resize(x)
         # Data type
@@ -81,6 +88,59 @@ class PreProcessor(nn.Module):
 
         return x
 
+    def _resized_region(self, height: int, width: int) -> Tuple[int, int, int, int]:
+        """Region of the output taken by a sample once resized (the rest being padding), following `Resize`
+
+        Args:
+        ----
+            height: height of the sample
+            width: width of the sample
+
+        Returns:
+        -------
+            the offsets (top, left) and the size (height, width) of the resized sample
+        """
+        out_h, out_w = self.resize.size
+        target_ratio, actual_ratio = out_h / out_w, height / width
+        if not self.resize.preserve_aspect_ratio or target_ratio == actual_ratio:
+            return 0, 0, out_h, out_w
+        if actual_ratio > target_ratio:
+            tmp_h, tmp_w = out_h, max(int(out_h / actual_ratio), 1)
+        else:
+            tmp_h, tmp_w = max(int(out_w * actual_ratio), 1), out_w
+        if self.resize.symmetric_pad:
+            return math.ceil((out_h - tmp_h) / 2), math.ceil((out_w - tmp_w) / 2), tmp_h, tmp_w
+        return 0, 0, tmp_h, tmp_w
+
+    def build_batch(self, samples: List[Union[np.ndarray, torch.Tensor]]) -> torch.Tensor:
+        """Resize, scale and normalize samples straight into a preallocated batch
+
+        Args:
+        ----
+            samples: list of samples of shape (H, W, C) for numpy arrays or (C, H, W) for tensors
+
+        Returns:
+        -------
+            the normalized batch of shape (N, C, *output_size)
+        """
+        tensors = [self._to_tensor(sample) for sample in samples]
+        # Padding is left to 0, as in `Resize`
+        batch = torch.zeros((len(tensors), tensors[0].shape[0], *self.resize.size), dtype=torch.float32)
+
+        def _fill(idx: int) -> None:
+            x = tensors[idx]
+            top, left, height, width = self._resized_region(*x.shape[-2:])
+            if x.shape[-2:] != (height, width):
+                x = F.resize(x, [height, width], interpolation=self.resize.interpolation, antialias=True)
+            region = batch[idx, :, top : top + height, left : left + width]
+            region.copy_(x)
+            if x.dtype == torch.uint8:
+                region.div_(255)
+
+        list(multithread_exec(_fill, range(len(tensors))))
+        # Normalize the whole batch in place
+        return F.normalize(batch, self.normalize.mean, self.normalize.std, inplace=True)
+
     def __call__(self, x: Union[torch.Tensor, np.ndarray, List[Union[torch.Tensor, np.ndarray]]]) -> List[torch.Tensor]:
         """Prepare document data for model forwarding
 
@@ -115,10 +175,8 @@ class PreProcessor(nn.Module):
             batches = [x]
 
         elif isinstance(x, list) and all(isinstance(sample, (np.ndarray, torch.Tensor)) for sample in x):
-            # Sample transform (to tensor, resize)
-            samples = list(multithread_exec(self.sample_transforms, x))
-            # Batching
-            batches = self.batch_inputs(samples)
+            # Resize, scale & normalize each sample directly into its batch
+            return [self.build_batch(x[idx : idx + self.batch_size]) for idx in range(0, len(x), self.batch_size)]
         else:
             raise TypeError(f"invalid input type: {type(x)}")
 
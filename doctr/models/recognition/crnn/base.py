@@ -0,0 +1,46 @@
+# Copyright (C) 2021-2024, Mindee.
+
+# This program is licensed under the Apache License 2.0.
+# See LICENSE or go to <https://opensource.org/licenses/Apache-2.0> for full license details.
+
+from functools import lru_cache
+from typing import List, Tuple
+
+import numpy as np
+
+
+@lru_cache(maxsize=8)
+def _vocab_lookup(vocab: str) -> np.ndarray:
+    # Unicode code point of each character of the vocab
+    return np.array([ord(char) for char in vocab], dtype="<u4")
+
+
+def decode_best_path(
+    best_path: np.ndarray,
+    char_probs: np.ndarray,
+    vocab: str,
+    blank: int,
+) -> Tuple[List[str], List[List[float]]]:
+    """Collapse best paths (merge repeated labels, then remove blanks) and map them to characters
+
+    Args:
+    ----
+        best_path: most likely label of each time step, of shape N x T
+        char_probs: probability of the most likely label of each time step, of shape N x T
+        vocab: vocabulary to use
+        blank: index of blank label
+
+    Returns:
+    -------
+        the list of words and the list of the probabilities of their characters
+    """
+    # Keep the first label of each run of repeated labels, except blanks
+    is_kept = best_path != blank
+    is_kept[:, 1:] &= best_path[:, 1:] != best_path[:, :-1]
+    # Map all the characters of the batch at once, then split them by sequence
+    chars = _vocab_lookup(vocab)[best_path[is_kept]].tobytes().decode("utf-32-le")
+    probs = char_probs[is_kept].tolist()
+    bounds = np.concatenate([[0], np.cumsum(is_kept.sum(axis=1))]).tolist()
+    words = [chars[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+    char_confs = [probs[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+    return words, char_confs
@@ -4,18 +4,19 @@
 # See LICENSE or go to <https://opensource.org/licenses/Apache-2.0> for full license details.
 
 from copy import deepcopy
-from itertools import groupby
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 import torch
 from torch import nn
 from torch.nn import functional as F
 
-from doctr.datasets import VOCABS, decode_sequence
+from doctr.datasets import VOCABS
+from doctr.utils.profiling import profiled
 
 from ...classification import mobilenet_v3_large_r, mobilenet_v3_small_r, vgg16_bn_r
 from ...utils.pytorch import load_pretrained_params
 from ..core import RecognitionModel, RecognitionPostProcessor
+from .base import decode_best_path
 
 __all__ = ["CRNN", "crnn_vgg16_bn", "crnn_mobilenet_v3_small", "crnn_mobilenet_v3_large"]
 
@@ -57,7 +58,8 @@ class CTCPostProcessor(RecognitionPostProcessor):
         logits: torch.Tensor,
         vocab: str = VOCABS["french"],
         blank: int = 0,
-    ) -> List[Tuple[str, float]]:
+        return_char_confs: bool = False,
+    ) -> Union[List[Tuple[str, float]], List[Tuple[str, float, List[float]]]]:
         """Implements best path decoding as shown by Graves (Dissertation, p63), highly inspired from
         <https://github.com/githubharald/CTCDecoder>`_.
 
@@ -66,37 +68,44 @@ class CTCPostProcessor(RecognitionPostProcessor):
             logits: model output, shape: N x T x C
             vocab: vocabulary to use
             blank: index of blank label
+            return_char_confs: if True, the confidence of each character is returned as well
 
         Returns:
         -------
-            A list of tuples: (word, confidence)
+            A list of tuples: (word, confidence), or (word, confidence, character confidences)
         """
         # Gather the most confident characters, and assign the smallest conf among those to the sequence prob
-        probs = F.softmax(logits, dim=-1).max(dim=-1).values.min(dim=1).values
+        char_probs, best_path = F.softmax(logits, dim=-1).max(dim=-1)
+        probs = char_probs.min(dim=1).values
 
-        # collapse best path (using itertools.groupby), map to chars, join char list to string
-        words = [
-            decode_sequence([k for k, _ in groupby(seq.tolist()) if k != blank], vocab)
-            for seq in torch.argmax(logits, dim=-1)
-        ]
+        # collapse best path for the whole batch, map to chars
+        words, char_confs = decode_best_path(best_path.cpu().numpy(), char_probs.cpu().numpy(), vocab, blank)
 
+        if return_char_confs:
+            return list(zip(words, probs.tolist(), char_confs))
         return list(zip(words, probs.tolist()))
 
-    def __call__(self, logits: torch.Tensor) -> List[Tuple[str, float]]:
+    @profiled("reco_decode")
+    def __call__(
+        self, logits: torch.Tensor, return_char_confs: bool = False
+    ) -> Union[List[Tuple[str, float]], List[Tuple[str, float, List[float]]]]:
         """Performs decoding of raw output with CTC and decoding of CTC predictions
         with label_to_idx mapping dictionnary
 
         Args:
         ----
             logits: raw output of the model, shape (N, C + 1, seq_len)
+            return_char_confs: if True, the confidence of each character is returned as well
 
         Returns:
         -------
-            A tuple of 2 lists: a list of str (words) and a list of float (probs)
+            A list of tuples: (word, confidence), or (word, confidence, character confidences)
 
         """
         # Decode CTC
-        return self.ctc_best_path(logits=logits, vocab=self.vocab, blank=len(self.vocab))
+        return self.ctc_best_path(
+            logits=logits, vocab=self.vocab, blank=len(self.vocab), return_char_confs=return_char_confs
+        )
 
 
 class CRNN(RecognitionModel, nn.Module):
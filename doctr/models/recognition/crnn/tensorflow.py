@@ -11,10 +11,12 @@ from tensorflow.keras import layers
 from tensorflow.keras.models import Model, Sequential
 
 from doctr.datasets import VOCABS
+from doctr.utils.profiling import profiled
 
 from ...classification import mobilenet_v3_large_r, mobilenet_v3_small_r, vgg16_bn_r
 from ...utils.tensorflow import _bf16_to_float32, load_pretrained_params
 from ..core import RecognitionModel, RecognitionPostProcessor
+from .base import decode_best_path
 
 __all__ = ["CRNN", "crnn_vgg16_bn", "crnn_mobilenet_v3_small", "crnn_mobilenet_v3_large"]
 
@@ -53,12 +55,47 @@ class CTCPostProcessor(RecognitionPostProcessor):
         ignore_accents: if True, ignore accents of letters
     """
 
+    @staticmethod
+    def ctc_best_path(
+        logits: tf.Tensor,
+        vocab: str = VOCABS["french"],
+        blank: int = 0,
+        return_char_confs: bool = False,
+    ) -> Union[List[Tuple[str, float]], List[Tuple[str, float, List[float]]]]:
+        """Implements best path decoding as shown by Graves (Dissertation, p63), highly inspired from
+        <https://github.com/githubharald/CTCDecoder>`_.
+
+        Args:
+        ----
+            logits: model output, shape: N x T x C
+            vocab: vocabulary to use
+            blank: index of blank label
+            return_char_confs: if True, the confidence of each character is returned as well
+
+        Returns:
+        -------
+            A list of tuples: (word, confidence), or (word, confidence, character confidences)
+        """
+        # Gather the most confident characters, and assign the smallest conf among those to the sequence prob
+        char_probs = tf.math.reduce_max(tf.nn.softmax(logits, axis=-1), axis=-1)
+        probs = tf.math.reduce_min(char_probs, axis=1)
+
+        # collapse best path for the whole batch, map to chars
+        best_path = tf.math.argmax(logits, axis=-1)
+        words, char_confs = decode_best_path(best_path.numpy(), char_probs.numpy(), vocab, blank)
+
+        if return_char_confs:
+            return list(zip(words, probs.numpy().tolist(), char_confs))
+        return list(zip(words, probs.numpy().tolist()))
+
+    @profiled("reco_decode")
     def __call__(
         self,
         logits: tf.Tensor,
         beam_width: int = 1,
         top_paths: int = 1,
-    ) -> Union[List[Tuple[str, float]], List[Tuple[List[str], List[float]]]]:
+        return_char_confs: bool = False,
+    ) -> Union[List[Tuple[str, float]], List[Tuple[List[str], List[float]]], List[Tuple[str, float, List[float]]]]:
         """Performs decoding of raw output with CTC and decoding of CTC predictions
         with label_to_idx mapping dictionnary
 
@@ -67,6 +104,7 @@ class CTCPostProcessor(RecognitionPostProcessor):
             logits: raw output of the model, shape BATCH_SIZE X SEQ_LEN X NUM_CLASSES + 1
             beam_width: An int scalar >= 0 (beam search beam width).
             top_paths: An int scalar >= 0, <= beam_width (controls output size).
+            return_char_confs: if True, uses best path decoding and returns the confidence of each character as well
 
         Returns:
         -------
@@ -74,6 +112,11 @@ class CTCPostProcessor(RecognitionPostProcessor):
 
 
         """
+        if return_char_confs:
+            if beam_width > 1 or top_paths > 1:
+                raise ValueError("character confidences are only available with best path decoding.")
+            return self.ctc_best_path(logits, self.vocab, len(self.vocab), return_char_confs=True)
+
         # Decode CTC
         _decoded, _log_prob = tf.nn.ctc_beam_search_decoder(
             tf.transpose(logits, perm=[1, 0, 2]),
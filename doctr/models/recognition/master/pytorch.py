@@ -14,6 +14,7 @@ from torchvision.models._utils import IntermediateLayerGetter
 from doctr.datasets import VOCABS
 from doctr.models.classification import magc_resnet31
 from doctr.models.modules.transformer import Decoder, PositionalEncoding
+from doctr.utils.profiling import profiled
 
 from ...utils.pytorch import _bf16_to_float32, load_pretrained_params
 from .base import _MASTER, _MASTERPostProcessor
@@ -228,6 +229,9 @@ class MASTER(_MASTER, nn.Module):
         -------
             A Tuple of torch.Tensor: predictions, logits
         """
+        if not self.exportable:
+            return self.decode_incremental(encoded)
+
         b = encoded.size(0)
 
         # Padding symbol + SOS at the beginning
@@ -247,10 +251,56 @@ class MASTER(_MASTER, nn.Module):
         # Shape (N, max_length, vocab_size + 1)
         return logits
 
+    def decode_incremental(self, encoded: torch.Tensor) -> torch.Tensor:
+        """Decode function for prediction, which only decodes the last token at each step: the keys & values of the
+        previous tokens and of the encoded features are cached, and sequences are dropped from the batch once they
+        reach the EOS token.
+
+        Args:
+        ----
+            encoded: input tensor
+
+        Returns:
+        -------
+            the logits of shape (N, max_length, vocab_size + 3), set to 0 after the EOS token of each sequence
+        """
+        b = encoded.size(0)
+        # Indices of the sequences being decoded and their last token (starting with SOS)
+        active = torch.arange(b, device=encoded.device)
+        tokens = torch.full((b, 1), self.vocab_size + 1, dtype=torch.long, device=encoded.device)
+        # Padding tokens can't be attended to
+        target_mask = torch.ones((b, 1, 1, 0), dtype=torch.int, device=encoded.device)
+        memory_kv = self.decoder.project_memory(encoded)
+        cache: List[Tuple[torch.Tensor, torch.Tensor]] = []
+
+        logits = encoded.new_zeros((b, self.max_length, self.vocab_size + 3))
+        for i in range(self.max_length):
+            target_mask = torch.cat([target_mask, (tokens != self.vocab_size + 2).int()[:, None, None]], dim=-1)
+            output = self.decoder.decode_step(tokens, i, memory_kv, cache, target_mask)
+            step_logits = self.linear(output)
+            logits[active, i] = step_logits[:, 0].to(dtype=logits.dtype)
+            if i + 1 == self.max_length:
+                break
+            # Update with the next token, and drop the sequences which have reached the EOS token
+            tokens = step_logits.argmax(-1)
+            is_active = tokens[:, 0] != self.vocab_size
+            if not torch.all(is_active):
+                if not torch.any(is_active):
+                    break
+                active, tokens, target_mask = active[is_active], tokens[is_active], target_mask[is_active]
+                memory_kv = [(key[is_active], value[is_active]) for key, value in memory_kv]
+                cache[:] = [(key[is_active], value[is_active]) for key, value in cache]
+            if i + 2 == self.max_length:
+                # The full decoding loop never feeds the last predicted token: the last step decodes a padding token
+                tokens = torch.full_like(tokens, self.vocab_size + 2)
+
+        return logits
+
 
 class MASTERPostProcessor(_MASTERPostProcessor):
     """Post processor for MASTER architectures"""
 
+    @profiled("reco_decode")
     def __call__(
         self,
         logits: torch.Tensor,
@@ -259,7 +309,9 @@ class MASTERPostProcessor(_MASTERPostProcessor):
         out_idxs = logits.argmax(-1)
         # N x L
         probs = torch.gather(torch.softmax(logits, -1), -1, out_idxs.unsqueeze(-1)).squeeze(-1)
-        # Take the minimum confidence of the sequence
+        # Take the minimum confidence of the sequence, up to the EOS token (the next steps aren't decoded)
+        is_eos = (out_idxs == len(self.vocab)).int()
+        probs = probs.masked_fill(is_eos.cumsum(dim=1) - is_eos > 0, 1)
         probs = probs.min(dim=1).values.detach().cpu()
 
         # Manual decoding
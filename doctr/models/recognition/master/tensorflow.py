@@ -12,6 +12,7 @@ from tensorflow.keras import Model, layers
 from doctr.datasets import VOCABS
 from doctr.models.classification import magc_resnet31
 from doctr.models.modules.transformer import Decoder, PositionalEncoding
+from doctr.utils.profiling import profiled
 
 from ...utils.tensorflow import _bf16_to_float32, load_pretrained_params
 from .base import _MASTER, _MASTERPostProcessor
@@ -251,6 +252,7 @@ class MASTERPostProcessor(_MASTERPostProcessor):
         vocab: string containing the ordered sequence of supported characters
     """
 
+    @profiled("reco_decode")
     def __call__(
         self,
         logits: tf.Tensor,
@@ -259,7 +261,9 @@ class MASTERPostProcessor(_MASTERPostProcessor):
         out_idxs = tf.math.argmax(logits, axis=2)
         # N x L
         probs = tf.gather(tf.nn.softmax(logits, axis=-1), out_idxs, axis=-1, batch_dims=2)
-        # Take the minimum confidence of the sequence
+        # Take the minimum confidence of the sequence, up to the EOS token
+        is_eos = tf.cast(out_idxs == len(self.vocab), dtype=tf.int32)
+        probs = tf.where(tf.math.cumsum(is_eos, axis=1, exclusive=True) > 0, tf.ones_like(probs), probs)
         probs = tf.math.reduce_min(probs, axis=1)
 
         # decode raw output of the model with tf_label_to_idx
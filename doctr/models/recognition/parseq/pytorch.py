@@ -16,6 +16,7 @@ from torchvision.models._utils import IntermediateLayerGetter
 
 from doctr.datasets import VOCABS
 from doctr.models.modules.transformer import MultiHeadAttention, PositionwiseFeedForward
+from doctr.utils.profiling import profiled
 
 from ...classification import vit_s
 from ...utils.pytorch import _bf16_to_float32, load_pretrained_params
@@ -94,13 +95,40 @@ class PARSeqDecoder(nn.Module):
         memory,
         target_mask: Optional[torch.Tensor] = None,
     ):
-        query_norm = self.query_norm(target)
         content_norm = self.content_norm(content)
+        return self.decode_projected(
+            target,
+            self.attention.project_key_value(content_norm, content_norm),
+            self.cross_attention.project_key_value(memory, memory),
+            target_mask,
+        )
+
+    def decode_projected(
+        self,
+        target: torch.Tensor,
+        content_kv: Tuple[torch.Tensor, torch.Tensor],
+        memory_kv: Tuple[torch.Tensor, torch.Tensor],
+        target_mask: Optional[torch.Tensor] = None,
+    ) -> torch.Tensor:
+        """Same as `forward`, but with the (normalized) content and the memory already projected into keys & values
+
+        Args:
+        ----
+            target: target queries of shape (batch_size, target_len, d_model)
+            content_kv: keys & values of the content, of shape (batch_size, num_heads, content_len, d_k)
+            memory_kv: keys & values of the memory, of shape (batch_size, num_heads, memory_len, d_k)
+            target_mask: attention mask of the target queries over the content
+
+        Returns:
+        -------
+            the decoded target, of shape (batch_size, target_len, d_model)
+        """
+        query_norm = self.query_norm(target)
         target = target.clone() + self.attention_dropout(
-            self.attention(query_norm, content_norm, content_norm, mask=target_mask)
+            self.attention.attend(query_norm, *content_kv, mask=target_mask)
         )
         target = target.clone() + self.cross_attention_dropout(
-            self.cross_attention(self.query_norm(target), memory, memory)
+            self.cross_attention.attend(self.query_norm(target), *memory_kv)
         )
         target = target.clone() + self.feed_forward_dropout(self.position_feed_forward(self.feed_forward_norm(target)))
         return self.output_norm(target)
@@ -265,28 +293,27 @@ class PARSeq(_PARSeq, nn.Module):
             torch.tril(torch.ones((max_length, max_length), device=features.device), diagonal=0).to(dtype=torch.bool)
         ).int()
 
-        pos_logits = []
-        for i in range(max_length):
-            # Decode one token at a time without providing information about the future tokens
-            tgt_out = self.decode(
-                ys[:, : i + 1],
-                features,
-                query_mask[i : i + 1, : i + 1],
-                target_query=pos_queries[:, i : i + 1],
-            )
-            pos_prob = self.head(tgt_out)
-            pos_logits.append(pos_prob)
-
-            if i + 1 < max_length:
-                # Update with the next token
-                ys[:, i + 1] = pos_prob.squeeze().argmax(-1)
-
-                # Stop decoding if all sequences have reached the EOS token
-                # NOTE: `break` isn't correctly translated to Onnx so we don't break here if we want to export
-                if not self.exportable and max_len is None and (ys == self.vocab_size).any(dim=-1).all():
-                    break
-
-        logits = torch.cat(pos_logits, dim=1)  # (N, max_length, vocab_size + 1)
+        if self.exportable:
+            pos_logits = []
+            for i in range(max_length):
+                # Decode one token at a time without providing information about the future tokens
+                tgt_out = self.decode(
+                    ys[:, : i + 1],
+                    features,
+                    query_mask[i : i + 1, : i + 1],
+                    target_query=pos_queries[:, i : i + 1],
+                )
+                pos_prob = self.head(tgt_out)
+                pos_logits.append(pos_prob)
+
+                if i + 1 < max_length:
+                    # Update with the next token
+                    # NOTE: `break` isn't correctly translated to Onnx so we don't stop when all sequences are done
+                    ys[:, i + 1] = pos_prob.squeeze().argmax(-1)
+
+            logits = torch.cat(pos_logits, dim=1)  # (N, max_length, vocab_size + 1)
+        else:
+            logits = self.decode_incremental(features, max_length, stop_early=max_len is None)
 
         # One refine iteration
         # Update query mask
@@ -304,6 +331,61 @@ class PARSeq(_PARSeq, nn.Module):
 
         return logits  # (N, max_length, vocab_size + 1)
 
+    def decode_incremental(self, features: torch.Tensor, max_length: int, stop_early: bool = True) -> torch.Tensor:
+        """Autoregressive decoding, which only decodes the last token at each step: the keys & values of the previous
+        tokens and of the features are cached, and sequences are dropped from the batch once they reach the EOS token.
+
+        Args:
+        ----
+            features: features of the images, of shape (N, patches_seqlen, d_model)
+            max_length: maximum number of decoding steps
+            stop_early: whether decoding stops when all sequences have reached the EOS token
+
+        Returns:
+        -------
+            the logits of the decoding steps, of shape (N, num_steps, vocab_size + 1). The logits of the steps
+            following the EOS token of a sequence are set to 0.
+        """
+        batch_size = features.size(0)
+        # Indices of the sequences being decoded and their last token (starting with SOS)
+        active = torch.arange(batch_size, device=features.device)
+        tokens = torch.full((batch_size, 1), self.vocab_size + 1, dtype=torch.long, device=features.device)
+        memory_k, memory_v = self.decoder.cross_attention.project_key_value(features, features)
+        content_k, content_v = None, None
+
+        pos_logits: List[torch.Tensor] = []
+        for i in range(max_length):
+            # Positional information is added to all the tokens except SOS
+            content = self.embed(tokens) if i == 0 else self.pos_queries[:, i - 1 : i] + self.embed(tokens)
+            content_norm = self.decoder.content_norm(self.dropout(content))
+            key, value = self.decoder.attention.project_key_value(content_norm, content_norm)
+            content_k = key if content_k is None else torch.cat([content_k, key], dim=2)
+            content_v = value if content_v is None else torch.cat([content_v, value], dim=2)
+            # The last position attends to all the previous tokens
+            target_query = self.dropout(self.pos_queries[:, i : i + 1].expand(active.size(0), -1, -1))
+            pos_prob = self.head(
+                self.decoder.decode_projected(target_query, (content_k, content_v), (memory_k, memory_v))
+            )
+            step_logits = pos_prob.new_zeros((batch_size, 1, pos_prob.size(-1)))
+            step_logits[active] = pos_prob
+            pos_logits.append(step_logits)
+
+            if i + 1 < max_length:
+                # Update with the next token, and drop the sequences which have reached the EOS token
+                tokens = pos_prob.argmax(-1)
+                is_active = tokens[:, 0] != self.vocab_size
+                if not torch.all(is_active):
+                    active, tokens = active[is_active], tokens[is_active]
+                    content_k, content_v = content_k[is_active], content_v[is_active]
+                    memory_k, memory_v = memory_k[is_active], memory_v[is_active]
+                if active.numel() == 0:
+                    if stop_early:
+                        break
+                    pos_logits.extend([torch.zeros_like(step_logits)] * (max_length - i - 1))
+                    break
+
+        return torch.cat(pos_logits, dim=1)
+
     def forward(
         self,
         x: torch.Tensor,
@@ -391,6 +473,7 @@ class PARSeqPostProcessor(_PARSeqPostProcessor):
         vocab: string containing the ordered sequence of supported characters
     """
 
+    @profiled("reco_decode")
     def __call__(
         self,
         logits: torch.Tensor,
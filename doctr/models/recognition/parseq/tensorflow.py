@@ -14,6 +14,7 @@ from tensorflow.keras import Model, layers
 
 from doctr.datasets import VOCABS
 from doctr.models.modules.transformer import MultiHeadAttention, PositionwiseFeedForward
+from doctr.utils.profiling import profiled
 
 from ...classification import vit_s
 from ...utils.tensorflow import _bf16_to_float32, load_pretrained_params
@@ -422,6 +423,7 @@ class PARSeqPostProcessor(_PARSeqPostProcessor):
         vocab: string containing the ordered sequence of supported characters
     """
 
+    @profiled("reco_decode")
     def __call__(
         self,
         logits: tf.Tensor,
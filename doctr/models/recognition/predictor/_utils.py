@@ -3,13 +3,13 @@
 # This program is licensed under the Apache License 2.0.
 # See LICENSE or go to <https://opensource.org/licenses/Apache-2.0> for full license details.
 
-from typing import List, Tuple, Union
+from typing import List, Sequence, Tuple, Union
 
 import numpy as np
 
 from ..utils import merge_multi_strings
 
-__all__ = ["split_crops", "remap_preds"]
+__all__ = ["split_crops", "remap_preds", "bucket_crops"]
 
 
 def split_crops(
@@ -84,3 +84,34 @@ def remap_preds(
             # Merge the string values
             remapped_out.append((merge_multi_strings(vals, dilation), min(probs)))  # type: ignore[arg-type]
     return remapped_out
+
+
+def bucket_crops(
+    crops: Sequence[np.ndarray],
+    height: int,
+    widths: Sequence[int],
+    channels_last: bool = True,
+) -> List[Tuple[int, List[int]]]:
+    """Group crops by the narrowest width fitting them once resized to a given height (with their aspect ratio
+    preserved)
+
+    Args:
+    ----
+        crops: list of numpy array of shape (H, W, 3) if channels_last or (3, H, W) otherwise
+        height: target height of the crops
+        widths: available widths, crops wider than all of them are assigned the largest one
+        channels_last: whether the numpy array has dimensions in channels last order
+
+    Returns:
+    -------
+        list of non-empty buckets, each being a tuple with its width and the indices of its crops sorted by aspect ratio
+    """
+    shapes = np.asarray(
+        [tuple(crop.shape[:2] if channels_last else crop.shape[-2:]) for crop in crops], dtype=np.float64
+    )
+    aspect_ratios = shapes[:, 1] / shapes[:, 0]
+    order = np.argsort(aspect_ratios, kind="stable")
+    _widths = sorted(widths)
+    bucket_idx = np.minimum(np.searchsorted(_widths, aspect_ratios * height), len(_widths) - 1)
+    buckets = [(width, order[bucket_idx[order] == idx].tolist()) for idx, width in enumerate(_widths)]
+    return [(width, indices) for width, indices in buckets if len(indices) > 0]
@@ -3,7 +3,8 @@
 # This program is licensed under the Apache License 2.0.
 # See LICENSE or go to <https://opensource.org/licenses/Apache-2.0> for full license details.
 
-from typing import Any, List, Sequence, Tuple, Union
+import copy
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 import torch
@@ -11,8 +12,9 @@ from torch import nn
 
 from doctr.models.preprocessor import PreProcessor
 from doctr.models.utils import set_device_and_dtype
+from doctr.utils.profiling import profile_stage
 
-from ._utils import remap_preds, split_crops
+from ._utils import bucket_crops, remap_preds, split_crops
 
 __all__ = ["RecognitionPredictor"]
 
@@ -25,6 +27,9 @@ class RecognitionPredictor(nn.Module):
         pre_processor: transform inputs for easier batched model inference
         model: core detection architecture
         split_wide_crops: wether to use crop splitting for high aspect ratio crops
+        bucket_widths: if specified, crops are resized to the narrowest of these widths fitting their aspect ratio
+            (e.g. `(32, 64, 128, 256)`) and each width is batched separately, only for models accepting variable
+            input widths (e.g. CRNN)
     """
 
     def __init__(
@@ -32,14 +37,39 @@ class RecognitionPredictor(nn.Module):
         pre_processor: PreProcessor,
         model: nn.Module,
         split_wide_crops: bool = True,
+        bucket_widths: Optional[Sequence[int]] = None,
     ) -> None:
         super().__init__()
         self.pre_processor = pre_processor
         self.model = model.eval()
         self.split_wide_crops = split_wide_crops
+        self.bucket_widths = bucket_widths
         self.critical_ar = 8  # Critical aspect ratio
         self.dil_factor = 1.4  # Dilation factor to overlap the crops
         self.target_ar = 6  # Target aspect ratio
+        self._bucket_pre_processors: Dict[int, PreProcessor] = {}
+
+    @property
+    def bucket_widths(self) -> Optional[Sequence[int]]:
+        return self._bucket_widths
+
+    @bucket_widths.setter
+    def bucket_widths(self, bucket_widths: Optional[Sequence[int]]) -> None:
+        # Buckets only change the width of the crops: the pre-processor must resize them to a fixed height
+        if bucket_widths is not None:
+            size = self.pre_processor.resize.size  # type: ignore[attr-defined]
+            if not isinstance(size, (tuple, list)) or len(size) != 2:
+                raise ValueError("bucket_widths requires the pre-processor to resize crops to a fixed (H, W) size")
+            self._bucket_height: int = size[0]
+        self._bucket_widths = bucket_widths
+
+    def _get_pre_processor(self, width: int) -> PreProcessor:
+        # Same preprocessing, except for the output width
+        if width not in self._bucket_pre_processors:
+            pre_processor = copy.deepcopy(self.pre_processor)
+            pre_processor.resize.size = (self._bucket_height, width)  # type: ignore[attr-defined]
+            self._bucket_pre_processors[width] = pre_processor
+        return self._bucket_pre_processors[width]
 
     @torch.inference_mode()
     def forward(
@@ -56,31 +86,58 @@ class RecognitionPredictor(nn.Module):
         # Split crops that are too wide
         remapped = False
         if self.split_wide_crops:
-            new_crops, crop_map, remapped = split_crops(
-                crops,  # type: ignore[arg-type]
-                self.critical_ar,
-                self.target_ar,
-                self.dil_factor,
-                isinstance(crops[0], np.ndarray),
-            )
+            with profile_stage("reco_split", crops=len(crops)) as counts:
+                new_crops, crop_map, remapped = split_crops(
+                    crops,  # type: ignore[arg-type]
+                    self.critical_ar,
+                    self.target_ar,
+                    self.dil_factor,
+                    isinstance(crops[0], np.ndarray),
+                )
+                counts["splits"] = len(new_crops) - len(crops) if remapped else 0
             if remapped:
                 crops = new_crops
 
+        if self.bucket_widths is None:
+            out = self._predict(self.pre_processor, crops, **kwargs)
+        else:
+            # Batch crops of similar aspect ratios together, then restore their order
+            out = [("", 0.0)] * len(crops)
+            for width, indices in bucket_crops(
+                crops,  # type: ignore[arg-type]
+                self._bucket_height,
+                self.bucket_widths,
+                isinstance(crops[0], np.ndarray),
+            ):
+                preds = self._predict(self._get_pre_processor(width), [crops[idx] for idx in indices], **kwargs)
+                for idx, pred in zip(indices, preds):
+                    out[idx] = pred
+
+        # Remap crops
+        if self.split_wide_crops and remapped:
+            out = remap_preds(out, crop_map, self.dil_factor)
+
+        return out
+
+    def _predict(
+        self,
+        pre_processor: PreProcessor,
+        crops: Sequence[Union[np.ndarray, torch.Tensor]],
+        **kwargs: Any,
+    ) -> List[Tuple[str, float]]:
         # Resize & batch them
-        processed_batches = self.pre_processor(crops)
+        with profile_stage("reco_preprocess", crops=len(crops)):
+            processed_batches = pre_processor(crops)
 
         # Forward it
         _params = next(self.model.parameters())
         self.model, processed_batches = set_device_and_dtype(
             self.model, processed_batches, _params.device, _params.dtype
         )
-        raw = [self.model(batch, return_preds=True, **kwargs)["preds"] for batch in processed_batches]
+        raw = []
+        for batch in processed_batches:
+            with profile_stage("reco_forward", shape=batch.shape, crops=batch.shape[0]):
+                raw.append(self.model(batch, return_preds=True, **kwargs)["preds"])
 
         # Process outputs
-        out = [charseq for batch in raw for charseq in batch]
-
-        # Remap crops
-        if self.split_wide_crops and remapped:
-            out = remap_preds(out, crop_map, self.dil_factor)
-
-        return out
+        return [charseq for batch in raw for charseq in batch]
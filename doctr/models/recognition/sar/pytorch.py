@@ -12,6 +12,7 @@ from torch.nn import functional as F
 from torchvision.models._utils import IntermediateLayerGetter
 
 from doctr.datasets import VOCABS
+from doctr.utils.profiling import profiled
 
 from ...classification import resnet31
 from ...utils.pytorch import _bf16_to_float32, load_pretrained_params
@@ -55,11 +56,13 @@ class AttentionModule(nn.Module):
         self,
         features: torch.Tensor,  # (N, C, H, W)
         hidden_state: torch.Tensor,  # (N, C)
+        feat_projection: Optional[torch.Tensor] = None,  # (N, attention_units, H, W)
     ) -> torch.Tensor:
         H_f, W_f = features.shape[2:]
 
         # (N, feat_chans, H, W) --> (N, attention_units, H, W)
-        feat_projection = self.feat_conv(features)
+        if feat_projection is None:
+            feat_projection = self.feat_conv(features)
         # (N, state_chans, 1, 1) --> (N, attention_units, 1, 1)
         hidden_state = hidden_state.view(hidden_state.size(0), hidden_state.size(1), 1, 1)
         state_projection = self.state_conv(hidden_state)
@@ -160,6 +163,56 @@ class SARDecoder(nn.Module):
         # (max_length + 1, N, vocab_size + 1) --> (N, max_length + 1, vocab_size + 1)
         return torch.stack(logits_list[1:]).permute(1, 0, 2)
 
+    def decode_greedy(
+        self,
+        features: torch.Tensor,  # (N, C, H, W)
+        holistic: torch.Tensor,  # (N, C)
+    ) -> torch.Tensor:
+        """Greedy decoding for inference, which drops the sequences from the batch once they reach the EOS token
+        and stops when all of them are done. The logits following the EOS token of a sequence are set to 0.
+        """
+        batch_size = features.size(0)
+        # Indices of the sequences being decoded
+        active = torch.arange(batch_size, device=features.device)
+        # The projection of the features by the attention module is the same at each step
+        feat_projection = self.attention_module.feat_conv(features)
+
+        # step to init the first states of the LSTMCell
+        hidden_state_init = cell_state_init = torch.zeros(
+            batch_size, features.size(1), device=features.device, dtype=features.dtype
+        )
+        hidden_state, cell_state = hidden_state_init, cell_state_init
+        hidden_state_init, cell_state_init = self.lstm_cell(holistic, (hidden_state_init, cell_state_init))
+        hidden_state, cell_state = self.lstm_cell(hidden_state_init, (hidden_state, cell_state))
+        # 'blank' symbol of the first step (N, vocab_size + 1) --> (N, embedding_units)
+        prev_symbol = self.embed(
+            torch.zeros(batch_size, self.vocab_size + 1, device=features.device, dtype=features.dtype)
+        )
+
+        logits: Optional[torch.Tensor] = None
+        for t in range(self.max_length):
+            hidden_state_init, cell_state_init = self.lstm_cell(prev_symbol, (hidden_state_init, cell_state_init))
+            hidden_state, cell_state = self.lstm_cell(hidden_state_init, (hidden_state, cell_state))
+            glimpse = self.attention_module(features, hidden_state, feat_projection)
+            # (N, C), (N, C) --> (N, vocab_size + 1)
+            step_logits = self.output_dense(self.dropout(torch.cat([hidden_state, glimpse], dim=1)))
+            if logits is None:
+                logits = step_logits.new_zeros((batch_size, self.max_length, self.vocab_size + 1))
+            logits[active, t] = step_logits
+
+            index = step_logits.argmax(-1)
+            is_active = index != self.vocab_size
+            if not torch.all(is_active):
+                if not torch.any(is_active):
+                    break
+                active, index = active[is_active], index[is_active]
+                hidden_state_init, cell_state_init = hidden_state_init[is_active], cell_state_init[is_active]
+                hidden_state, cell_state = hidden_state[is_active], cell_state[is_active]
+                features, feat_projection = features[is_active], feat_projection[is_active]
+            prev_symbol = self.embed(self.embed_tgt(index))
+
+        return logits  # type: ignore[return-value]
+
 
 class SAR(nn.Module, RecognitionModel):
     """Implements a SAR architecture as described in `"Show, Attend and Read:A Simple and Strong Baseline for
@@ -252,7 +305,10 @@ class SAR(nn.Module, RecognitionModel):
         if self.training and target is None:
             raise ValueError("Need to provide labels during training for teacher forcing")
 
-        decoded_features = _bf16_to_float32(self.decoder(features, encoded, gt=None if target is None else gt))
+        if target is None and not self.exportable:
+            decoded_features = _bf16_to_float32(self.decoder.decode_greedy(features, encoded))
+        else:
+            decoded_features = _bf16_to_float32(self.decoder(features, encoded, gt=None if target is None else gt))
 
         out: Dict[str, Any] = {}
         if self.exportable:
@@ -312,6 +368,7 @@ class SARPostProcessor(RecognitionPostProcessor):
         vocab: string containing the ordered sequence of supported characters
     """
 
+    @profiled("reco_decode")
     def __call__(
         self,
         logits: torch.Tensor,
@@ -320,7 +377,9 @@ class SARPostProcessor(RecognitionPostProcessor):
         out_idxs = logits.argmax(-1)
         # N x L
         probs = torch.gather(torch.softmax(logits, -1), -1, out_idxs.unsqueeze(-1)).squeeze(-1)
-        # Take the minimum confidence of the sequence
+        # Take the minimum confidence of the sequence, up to the EOS token (the next steps aren't decoded)
+        is_eos = (out_idxs == len(self.vocab)).int()
+        probs = probs.masked_fill(is_eos.cumsum(dim=1) - is_eos > 0, 1)
         probs = probs.min(dim=1).values.detach().cpu()
 
         # Manual decoding
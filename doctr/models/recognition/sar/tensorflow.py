@@ -10,6 +10,7 @@ import tensorflow as tf
 from tensorflow.keras import Model, Sequential, layers
 
 from doctr.datasets import VOCABS
+from doctr.utils.profiling import profiled
 from doctr.utils.repr import NestedObject
 
 from ...classification import resnet31
@@ -344,6 +345,7 @@ class SARPostProcessor(RecognitionPostProcessor):
         vocab: string containing the ordered sequence of supported characters
     """
 
+    @profiled("reco_decode")
     def __call__(
         self,
         logits: tf.Tensor,
@@ -352,7 +354,9 @@ class SARPostProcessor(RecognitionPostProcessor):
         out_idxs = tf.math.argmax(logits, axis=2)
         # N x L
         probs = tf.gather(tf.nn.softmax(logits, axis=-1), out_idxs, axis=-1, batch_dims=2)
-        # Take the minimum confidence of the sequence
+        # Take the minimum confidence of the sequence, up to the EOS token
+        is_eos = tf.cast(out_idxs == len(self.vocab), dtype=tf.int32)
+        probs = tf.where(tf.math.cumsum(is_eos, axis=1, exclusive=True) > 0, tf.ones_like(probs), probs)
         probs = tf.math.reduce_min(probs, axis=1)
 
         # decode raw output of the model with tf_label_to_idx
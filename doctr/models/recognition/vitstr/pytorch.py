@@ -12,6 +12,7 @@ from torch.nn import functional as F
 from torchvision.models._utils import IntermediateLayerGetter
 
 from doctr.datasets import VOCABS
+from doctr.utils.profiling import profiled
 
 from ...classification import vit_b, vit_s
 from ...utils.pytorch import _bf16_to_float32, load_pretrained_params
@@ -157,6 +158,7 @@ class ViTSTRPostProcessor(_ViTSTRPostProcessor):
         vocab: string containing the ordered sequence of supported characters
     """
 
+    @profiled("reco_decode")
     def __call__(
         self,
         logits: torch.Tensor,
@@ -10,6 +10,7 @@ import tensorflow as tf
 from tensorflow.keras import Model, layers
 
 from doctr.datasets import VOCABS
+from doctr.utils.profiling import profiled
 
 from ...classification import vit_b, vit_s
 from ...utils.tensorflow import _bf16_to_float32, load_pretrained_params
@@ -162,6 +163,7 @@ class ViTSTRPostProcessor(_ViTSTRPostProcessor):
         vocab: string containing the ordered sequence of supported characters
     """
 
+    @profiled("reco_decode")
     def __call__(
         self,
         logits: tf.Tensor,
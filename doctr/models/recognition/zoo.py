@@ -42,12 +42,15 @@ def _predictor(arch: Any, pretrained: bool, **kwargs: Any) -> RecognitionPredict
         _model = arch
 
     kwargs.pop("pretrained_backbone", None)
+    bucket_widths = kwargs.pop("bucket_widths", None)
 
     kwargs["mean"] = kwargs.get("mean", _model.cfg["mean"])
     kwargs["std"] = kwargs.get("std", _model.cfg["std"])
     kwargs["batch_size"] = kwargs.get("batch_size", 128)
     input_shape = _model.cfg["input_shape"][:2] if is_tf_available() else _model.cfg["input_shape"][-2:]
-    predictor = RecognitionPredictor(PreProcessor(input_shape, preserve_aspect_ratio=True, **kwargs), _model)
+    predictor = RecognitionPredictor(
+        PreProcessor(input_shape, preserve_aspect_ratio=True, **kwargs), _model, bucket_widths=bucket_widths
+    )
 
     return predictor
 
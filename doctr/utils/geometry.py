@@ -373,7 +373,9 @@ def convert_to_relative_coords(geoms: np.ndarray, img_shape: Tuple[int, int]) ->
     raise ValueError(f"invalid format for arg `geoms`: {geoms.shape}")
 
 
-def extract_crops(img: np.ndarray, boxes: np.ndarray, channels_last: bool = True) -> List[np.ndarray]:
+def extract_crops(
+    img: np.ndarray, boxes: np.ndarray, channels_last: bool = True, copy: bool = True
+) -> List[np.ndarray]:
     """Created cropped images from list of bounding boxes
 
     Args:
@@ -382,6 +384,7 @@ def extract_crops(img: np.ndarray, boxes: np.ndarray, channels_last: bool = True
         boxes: bounding boxes of shape (N, 4) where N is the number of boxes, and the relative
             coordinates (xmin, ymin, xmax, ymax)
         channels_last: whether the channel dimensions is the last one instead of the last one
+        copy: whether the crops are copied, rather than being views on the input image
 
     Returns:
     -------
@@ -402,9 +405,11 @@ def extract_crops(img: np.ndarray, boxes: np.ndarray, channels_last: bool = True
         # Add last index
         _boxes[2:] += 1
     if channels_last:
-        return deepcopy([img[box[1] : box[3], box[0] : box[2]] for box in _boxes])
+        crops = [img[box[1] : box[3], box[0] : box[2]] for box in _boxes]
+    else:
+        crops = [img[:, box[1] : box[3], box[0] : box[2]] for box in _boxes]
 
-    return deepcopy([img[:, box[1] : box[3], box[0] : box[2]] for box in _boxes])
+    return deepcopy(crops) if copy else crops
 
 
 def extract_rcrops(
@@ -416,7 +421,7 @@ def extract_rcrops(
     ----
         img: input image
         polys: bounding boxes of shape (N, 4, 2)
-        dtype: target data type of bounding boxes
+        dtype: data type of the transformation matrices
         channels_last: whether the channel dimensions is the last one instead of the last one
 
     Returns:
@@ -435,22 +440,24 @@ def extract_rcrops(
         _boxes[:, :, 0] *= width
         _boxes[:, :, 1] *= height
 
-    src_pts = _boxes[:, :3].astype(np.float32)
+    src_pts = _boxes[:, :3].astype(dtype)
     # Preserve size
     d1 = np.linalg.norm(src_pts[:, 0] - src_pts[:, 1], axis=-1)
     d2 = np.linalg.norm(src_pts[:, 1] - src_pts[:, 2], axis=-1)
-    # (N, 3, 2)
-    dst_pts = np.zeros((_boxes.shape[0], 3, 2), dtype=dtype)
-    dst_pts[:, 1, 0] = dst_pts[:, 2, 0] = d1 - 1
-    dst_pts[:, 2, 1] = d2 - 1
-    # Use a warp transformation to extract the crop
+    # Transformations from the crops to the page, which map (0, 0), (d1 - 1, 0) & (d1 - 1, d2 - 1)
+    # to the first 3 points of the polygons, for all polygons at once: (N, 2, 3)
+    mats = np.empty((_boxes.shape[0], 2, 3), dtype=dtype)
+    mats[..., 0] = (src_pts[:, 1] - src_pts[:, 0]) / np.where(d1 > 1, d1 - 1, 1)[:, None]
+    mats[..., 1] = (src_pts[:, 2] - src_pts[:, 1]) / np.where(d2 > 1, d2 - 1, 1)[:, None]
+    mats[..., 2] = src_pts[:, 0]
+    # OpenCV expects contiguous channels last images, convert the page once rather than for each crop
+    _img = img if channels_last else np.ascontiguousarray(img.transpose(1, 2, 0))
+    widths, heights = d1.astype(int), d2.astype(int)
+    # Use a warp transformation to extract the crop (an output size of 0 would yield a page-sized crop in OpenCV)
     crops = [
-        cv2.warpAffine(
-            img if channels_last else img.transpose(1, 2, 0),
-            # Transformation matrix
-            cv2.getAffineTransform(src_pts[idx], dst_pts[idx]),
-            (int(d1[idx]), int(d2[idx])),
-        )
-        for idx in range(_boxes.shape[0])
+        cv2.warpAffine(_img, mat, (int(width), int(height)), flags=cv2.INTER_LINEAR | cv2.WARP_INVERSE_MAP)
+        if width > 0 and height > 0
+        else np.zeros((height, width, *_img.shape[2:]), dtype=_img.dtype)
+        for mat, width, height in zip(mats, widths, heights)
     ]
     return crops
@@ -4,17 +4,111 @@
 # See LICENSE or go to <https://opensource.org/licenses/Apache-2.0> for full license details.
 
 
+import atexit
+import contextvars
+import math
 import multiprocessing as mp
 import os
-from multiprocessing.pool import ThreadPool
-from typing import Any, Callable, Iterable, Iterator, Optional
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
 
 from doctr.file_utils import ENV_VARS_TRUE_VALUES
 
-__all__ = ["multithread_exec"]
+__all__ = ["multithread_exec", "prefetch_exec", "get_num_threads", "set_num_threads", "shutdown_thread_pools"]
 
+_NUM_THREADS: Optional[int] = None
+# Thread pools shared by the whole process, by number of workers
+_THREAD_POOLS: Dict[int, ThreadPoolExecutor] = {}
+_THREAD_POOLS_LOCK = threading.Lock()
+# Set in the threads of the shared pools
+_POOL_WORKER = threading.local()
 
-def multithread_exec(func: Callable[[Any], Any], seq: Iterable[Any], threads: Optional[int] = None) -> Iterator[Any]:
+
+def get_num_threads() -> int:
+    """Get the default number of workers used by multithreaded executions
+
+    Returns:
+    -------
+        the number of workers set with `set_num_threads`, else with the 'DOCTR_NUM_THREADS' environment variable, or
+        `min(16, cpu_count)` by default
+    """
+    if isinstance(_NUM_THREADS, int):
+        return _NUM_THREADS
+    env_threads = os.environ.get("DOCTR_NUM_THREADS", "")
+    return int(env_threads) if env_threads.isdigit() and int(env_threads) > 0 else min(16, mp.cpu_count())
+
+
+def set_num_threads(threads: Optional[int] = None) -> None:
+    """Set the default number of workers used by multithreaded executions
+
+    >>> from doctr.utils.multithreading import set_num_threads
+    >>> set_num_threads(4)
+
+    Args:
+    ----
+        threads: number of workers, None to restore the default one
+    """
+    global _NUM_THREADS
+    if isinstance(threads, int) and threads < 1:
+        raise ValueError("`threads` is expected to be a positive integer.")
+    _NUM_THREADS = threads
+
+
+def _mark_pool_worker() -> None:
+    _POOL_WORKER.active = True
+
+
+def _get_thread_pool(threads: int) -> ThreadPoolExecutor:
+    with _THREAD_POOLS_LOCK:
+        if threads not in _THREAD_POOLS:
+            # Threads are only started when tasks are submitted
+            _THREAD_POOLS[threads] = ThreadPoolExecutor(
+                threads, thread_name_prefix="doctr", initializer=_mark_pool_worker
+            )
+        return _THREAD_POOLS[threads]
+
+
+def shutdown_thread_pools(wait: bool = True) -> None:
+    """Shut down the thread pools shared by multithreaded executions, they are created again when needed
+
+    >>> from doctr.utils.multithreading import shutdown_thread_pools
+    >>> shutdown_thread_pools()
+
+    Args:
+    ----
+        wait: whether to wait for the pending tasks to complete
+    """
+    with _THREAD_POOLS_LOCK:
+        pools = list(_THREAD_POOLS.values())
+        _THREAD_POOLS.clear()
+    for pool in pools:
+        pool.shutdown(wait=wait)
+
+
+def _reset_thread_pools() -> None:
+    # The threads of the parent process don't exist in a forked child (e.g. a gunicorn worker)
+    global _THREAD_POOLS_LOCK
+    _THREAD_POOLS_LOCK = threading.Lock()
+    _THREAD_POOLS.clear()
+
+
+atexit.register(shutdown_thread_pools)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_thread_pools)
+
+
+def _map_chunk(func: Callable[[Any], Any], chunk: List[Any]) -> List[Any]:
+    return [func(element) for element in chunk]
+
+
+def multithread_exec(
+    func: Callable[[Any], Any],
+    seq: Iterable[Any],
+    threads: Optional[int] = None,
+    chunksize: Optional[int] = None,
+) -> Iterator[Any]:
     """Execute a given function in parallel for each element of a given sequence
 
     >>> from doctr.utils.multithreading import multithread_exec
@@ -25,7 +119,9 @@ def multithread_exec(func: Callable[[Any], Any], seq: Iterable[Any], threads: Op
     ----
         func: function to be executed on each element of the iterable
         seq: iterable
-        threads: number of workers to be used for multiprocessing
+        threads: number of workers to be used for multithreading, defaults to `get_num_threads()`
+        chunksize: number of consecutive elements processed by each task, by default the sequence is split into
+            4 chunks per worker
 
     Returns:
     -------
@@ -33,18 +129,94 @@ def multithread_exec(func: Callable[[Any], Any], seq: Iterable[Any], threads: Op
 
     Notes:
     -----
-        This function uses ThreadPool from multiprocessing package, which uses `/dev/shm` directory for shared memory.
-        If you do not have write permissions for this directory (if you run `doctr` on AWS Lambda for instance),
-        you might want to disable multiprocessing. To achieve that, set 'DOCTR_MULTIPROCESSING_DISABLE' to 'TRUE'.
+        The workers belong to a thread pool shared by the whole process, created on first use and shut down at exit.
+        Nested calls from these workers are executed in the calling worker.
+        To disable multithreading, set 'DOCTR_MULTIPROCESSING_DISABLE' to 'TRUE'.
     """
-    threads = threads if isinstance(threads, int) else min(16, mp.cpu_count())
+    threads = threads if isinstance(threads, int) else get_num_threads()
     # Single-thread
-    if threads < 2 or os.environ.get("DOCTR_MULTIPROCESSING_DISABLE", "").upper() in ENV_VARS_TRUE_VALUES:
-        results = map(func, seq)
+    if (
+        threads < 2
+        or os.environ.get("DOCTR_MULTIPROCESSING_DISABLE", "").upper() in ENV_VARS_TRUE_VALUES
+        or getattr(_POOL_WORKER, "active", False)
+    ):
+        return map(func, seq)
     # Multi-threading
-    else:
-        with ThreadPool(threads) as tp:
-            # ThreadPool's map function returns a list, but seq could be of a different type
-            # That's why wrapping result in map to return iterator
-            results = map(lambda x: x, tp.map(func, seq))  # noqa: C417
-    return results
+    elements = list(seq)
+    if chunksize is None:
+        chunksize = max(math.ceil(len(elements) / (4 * threads)), 1)
+    elif chunksize < 1:
+        raise ValueError("`chunksize` is expected to be a positive integer.")
+    pool = _get_thread_pool(threads)
+    futures = [
+        pool.submit(_map_chunk, func, elements[idx : idx + chunksize]) for idx in range(0, len(elements), chunksize)
+    ]
+    # Wait for all the tasks, so that errors are raised here
+    return iter([result for future in futures for result in future.result()])
+
+
+def prefetch_exec(func: Callable[[Any], Any], seq: Iterable[Any], queue_size: int = 2) -> Iterator[Any]:
+    """Execute a given function for each element of a given sequence in a background thread, so that the next results
+    are computed while the current ones are being consumed
+
+    >>> from doctr.utils.multithreading import prefetch_exec
+    >>> entries = [1, 4, 8]
+    >>> for result in prefetch_exec(lambda x: x ** 2, entries):
+    ...     print(result)
+
+    Args:
+    ----
+        func: function to be executed on each element of the iterable
+        seq: iterable
+        queue_size: maximum number of results computed ahead of their consumption
+
+    Returns:
+    -------
+        iterator of the function's results using the iterable as inputs, in the same order
+
+    Notes:
+    -----
+        If 'DOCTR_MULTIPROCESSING_DISABLE' is set to 'TRUE', the function is executed lazily in the calling thread.
+    """
+    if os.environ.get("DOCTR_MULTIPROCESSING_DISABLE", "").upper() in ENV_VARS_TRUE_VALUES:
+        yield from map(func, seq)
+        return
+
+    results: queue.Queue = queue.Queue(maxsize=max(1, queue_size))
+    stop = threading.Event()
+    end = object()
+
+    def _put(item: Any) -> bool:
+        # Don't block forever if the consumer stopped iterating
+        while not stop.is_set():
+            try:
+                results.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce() -> None:
+        try:
+            for element in seq:
+                if not _put((func(element), None)):
+                    return
+        except Exception as e:
+            _put((end, e))
+            return
+        _put((end, None))
+
+    # The function runs in the context of the caller (e.g. with its active profiler)
+    worker = threading.Thread(target=contextvars.copy_context().run, args=(_produce,), daemon=True)
+    worker.start()
+    try:
+        while True:
+            result, error = results.get()
+            if error is not None:
+                raise error
+            if result is end:
+                return
+            yield result
+    finally:
+        stop.set()
+        worker.join()
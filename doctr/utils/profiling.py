@@ -0,0 +1,231 @@
+# Copyright (C) 2021-2024, Mindee.
+
+# This program is licensed under the Apache License 2.0.
+# See LICENSE or go to <https://opensource.org/licenses/Apache-2.0> for full license details.
+
+import functools
+import logging
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional, Sequence, TypeVar, cast
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore[assignment]
+
+__all__ = ["Profiler", "profile_stage", "profiled"]
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Profiler of the current context, None when profiling is disabled
+_PROFILER: ContextVar[Optional["Profiler"]] = ContextVar("profiler", default=None)
+
+
+class _NullStage:
+    """Stage which isn't recorded"""
+
+    def __enter__(self) -> Dict[str, int]:
+        return {}
+
+    def __exit__(self, *args: Any) -> None:
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+def _peak_memory() -> Optional[int]:
+    # Peak resident set size of the process (in bytes)
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else 1024 * peak
+
+
+class _StageStats:
+    """Statistics of a profiled stage"""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.time = 0.0
+        self.counts: Dict[str, int] = {}
+        self.shapes: Dict[str, int] = {}
+        self.peak_memory: Optional[int] = None
+
+    def export(self) -> Dict[str, Any]:
+        return dict(
+            calls=self.calls,
+            time=self.time,
+            counts=dict(self.counts),
+            shapes=dict(self.shapes),
+            peak_memory=self.peak_memory,
+        )
+
+
+class Profiler:
+    """Records the wall time, item counts, batch shapes and peak memory of the stages of the predictors called while
+    it is active. The time of a stage excludes the time spent in the stages it calls (e.g. the detection postprocessing
+    called by the detection model).
+
+    >>> from doctr.models import ocr_predictor
+    >>> from doctr.utils.profiling import Profiler
+    >>> model = ocr_predictor(pretrained=True)
+    >>> with Profiler() as profiler:
+    ...     out = model([input_page])
+    >>> profiler.export()
+
+    The same profiler can be activated several times to aggregate the statistics of several runs.
+    When no profiler is active, stages aren't recorded at all.
+    """
+
+    def __init__(self) -> None:
+        self._stages: Dict[str, _StageStats] = {}
+        self._lock = threading.Lock()
+        # Stacks of the time spent in the nested stages of the stages being recorded, per thread
+        self._local = threading.local()
+        self._tokens: List[Token] = []
+
+    def __enter__(self) -> "Profiler":
+        self._tokens.append(_PROFILER.set(self))
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        _PROFILER.reset(self._tokens.pop())
+
+    @contextmanager
+    def stage(self, name: str, shape: Optional[Sequence[int]] = None, **counts: int) -> Iterator[Dict[str, int]]:
+        """Record a stage
+
+        Args:
+        ----
+            name: name of the stage
+            shape: shape of the batch processed by the stage
+            **counts: number of items processed by the stage (e.g. `pages=2`)
+
+        Returns:
+        -------
+            the item counts of the stage, which can be updated until the end of the stage
+        """
+        stack = self._local.__dict__.setdefault("stack", [])
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield counts
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            self.record(name, elapsed - nested, shape, **counts)
+
+    def record(self, name: str, duration: float, shape: Optional[Sequence[int]] = None, **counts: int) -> None:
+        """Add a call to the statistics of a stage
+
+        Args:
+        ----
+            name: name of the stage
+            duration: time spent in the stage (in seconds)
+            shape: shape of the batch processed by the stage
+            **counts: number of items processed by the stage
+        """
+        peak_memory = _peak_memory()
+        with self._lock:
+            stats = self._stages.setdefault(name, _StageStats())
+            stats.calls += 1
+            stats.time += duration
+            for key, count in counts.items():
+                stats.counts[key] = stats.counts.get(key, 0) + count
+            if shape is not None:
+                _shape = "x".join(str(dim) for dim in shape)
+                stats.shapes[_shape] = stats.shapes.get(_shape, 0) + 1
+            if peak_memory is not None:
+                stats.peak_memory = max(stats.peak_memory or 0, peak_memory)
+
+    def export(self) -> Dict[str, Dict[str, Any]]:
+        """Export the statistics of each stage as a dictionary
+
+        Returns:
+        -------
+            dictionary mapping each stage to its number of calls, overall time (in seconds), item counts,
+            number of batches of each shape and peak memory (in bytes)
+        """
+        with self._lock:
+            return {name: stats.export() for name, stats in self._stages.items()}
+
+    def log(self, logger: Optional[logging.Logger] = None, level: int = logging.INFO) -> None:
+        """Log the statistics of each stage
+
+        Args:
+        ----
+            logger: the logger to use, the root one by default
+            level: the logging level
+        """
+        _logger = logger or logging.getLogger()
+        for name, stats in self.export().items():
+            counts = ", ".join(f"{count} {key}" for key, count in stats["counts"].items())
+            _logger.log(
+                level,
+                f"{name}: {stats['calls']} calls, {1000 * stats['time']:.2f}ms" + (f" ({counts})" if counts else ""),
+            )
+
+    def reset(self) -> None:
+        """Clear the statistics of all stages"""
+        with self._lock:
+            self._stages.clear()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(stages={list(self._stages.keys())})"
+
+
+def profile_stage(name: str, shape: Optional[Sequence[int]] = None, **counts: int) -> ContextManager:
+    """Record a stage with the active profiler, if any
+
+    >>> from doctr.utils.profiling import profile_stage
+    >>> with profile_stage("reco_split", crops=len(crops)) as counts:
+    ...     new_crops, crop_map, remapped = split_crops(crops, 8, 6, 1.4, True)
+    ...     counts["splits"] = len(new_crops) - len(crops)
+
+    Args:
+    ----
+        name: name of the stage
+        shape: shape of the batch processed by the stage
+        **counts: number of items processed by the stage (e.g. `pages=2`)
+
+    Returns:
+    -------
+        the context manager recording the stage, which returns the item counts of the stage
+    """
+    profiler = _PROFILER.get()
+    if profiler is None:
+        return _NULL_STAGE
+    return profiler.stage(name, shape, **counts)
+
+
+def profiled(name: str) -> Callable[[F], F]:
+    """Decorator recording each call of a function as a stage with the active profiler, if any
+
+    Args:
+    ----
+        name: name of the stage
+
+    Returns:
+    -------
+        the decorator
+    """
+
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            profiler = _PROFILER.get()
+            if profiler is None:
+                return func(*args, **kwargs)
+            with profiler.stage(name):
+                return func(*args, **kwargs)
+
+        return cast(F, wrapper)
+
+    return decorator
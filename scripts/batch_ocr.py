@@ -0,0 +1,287 @@
+# Copyright (C) 2021-2024, Mindee.
+
+# This program is licensed under the Apache License 2.0.
+# See LICENSE or go to <https://opensource.org/licenses/Apache-2.0> for full license details.
+
+"""OCR of many documents with a pool of worker processes, which can resume where a previous run stopped"""
+
+import os
+
+os.environ["TF_CPP_MIN_LOG_LEVEL"] = "2"
+
+import json
+import multiprocessing as mp
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from doctr.file_utils import is_tf_available
+from doctr.io import DocumentFile
+from doctr.models import ocr_predictor
+from doctr.utils.multithreading import set_num_threads
+
+DOC_EXTENSIONS = {".pdf", ".jpg", ".jpeg", ".png", ".tif", ".tiff", ".bmp", ".webp"}
+MANIFEST_NAME = "manifest.ndjson"
+
+# Predictor of the worker process, loaded once by `init_worker`
+_predictor: Any = None
+_worker_config: Dict[str, Any] = {}
+
+
+def list_documents(input_dir: Path) -> List[Path]:
+    """Documents (PDF files or images) found in a directory and its sub-directories, in a stable order"""
+    return sorted(path for path in input_dir.rglob("*") if path.is_file() and path.suffix.lower() in DOC_EXTENSIONS)
+
+
+def load_manifest(manifest_path: Path) -> Set[str]:
+    """Documents already processed by previous runs, read from the manifest (a truncated last line is skipped)"""
+    done: Set[str] = set()
+    if not manifest_path.is_file():
+        return done
+    with open(manifest_path, "r") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if entry.get("status") == "done":
+                done.add(entry["document"])
+    return done
+
+
+def init_worker(
+    detection: str, recognition: str, threads: int, output_format: str, predictor_kwargs: Dict[str, Any]
+) -> None:
+    """Load the predictor of a worker process, with as many threads as its share of the cores"""
+    global _predictor
+    _worker_config["output_format"] = output_format
+    # Each process gets its share of the cores, so that they aren't oversubscribed
+    set_num_threads(threads)
+    if is_tf_available():
+        import tensorflow as tf
+
+        tf.config.threading.set_intra_op_parallelism_threads(threads)
+        tf.config.threading.set_inter_op_parallelism_threads(1)
+    else:
+        import torch
+
+        torch.set_num_threads(threads)
+    try:
+        _predictor = ocr_predictor(detection, recognition, pretrained=True, **predictor_kwargs)
+    except Exception as e:
+        # A failing initializer would break the pool: report the error for each document instead
+        _worker_config["error"] = e
+
+
+def _write_pages(f: Any, pages: Iterator[Any], output_format: str) -> int:
+    # `Page` and `ColumnarPage` (with `columnar=True`) both write themselves to the stream
+    num_pages = 0
+    if output_format == "json":
+        f.write('{"pages":[')
+    for page in pages:
+        if output_format == "json" and num_pages > 0:
+            f.write(",")
+        page.export_as_json(f)
+        if output_format == "ndjson":
+            f.write("\n")
+        num_pages += 1
+    if output_format == "json":
+        f.write("]}")
+    return num_pages
+
+
+def process_document(task: Dict[str, str]) -> Dict[str, Any]:
+    """OCR a document in a worker process, writing its pages to the output file as soon as they are predicted
+
+    Args:
+    ----
+        task: dictionary with the document's name, input path and output path
+
+    Returns:
+    -------
+        the manifest entry of the document
+    """
+    start = time.perf_counter()
+    output_path = Path(task["output"])
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+    entry: Dict[str, Any] = {"document": task["document"], "output": task["output"]}
+    try:
+        if "error" in _worker_config:
+            raise RuntimeError(f"the predictor could not be loaded ({_worker_config['error']})")
+        if task["input"].lower().endswith(".pdf"):
+            pages = DocumentFile.from_pdf(task["input"], lazy=True)
+        else:
+            pages = DocumentFile.from_images(task["input"])
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "w") as f:
+            entry["pages"] = _write_pages(f, _predictor.stream(pages), _worker_config["output_format"])
+        # Only complete results get the final name
+        os.replace(tmp_path, output_path)
+        entry["status"] = "done"
+    except Exception as e:
+        tmp_path.unlink(missing_ok=True)
+        entry["status"] = "error"
+        entry["error"] = f"{type(e).__name__}: {e}"
+    entry["duration"] = round(time.perf_counter() - start, 3)
+    return entry
+
+
+def _start_pool(workers: int, init_args: Tuple[Any, ...]) -> ProcessPoolExecutor:
+    # Fork isn't safe once the deep learning frameworks are initialized
+    return ProcessPoolExecutor(workers, mp_context=mp.get_context("spawn"), initializer=init_worker, initargs=init_args)
+
+
+def run(
+    input_dir: Path,
+    output_dir: Path,
+    detection: str = "fast_base",
+    recognition: str = "crnn_vgg16_bn",
+    workers: int = 1,
+    threads: Optional[int] = None,
+    output_format: str = "json",
+    resume: bool = True,
+    **kwargs: Any,
+) -> Dict[str, int]:
+    """OCR all the documents of a directory with a pool of worker processes
+
+    Each worker loads the predictor once, then takes the documents one at a time from the queue of the pool. The result
+    of each document is written next to the others in the output directory, and recorded in the manifest, so that an
+    interrupted run can be resumed. If a worker process dies (e.g. killed when out of memory), the documents in progress
+    are recorded as errors, and the pool is restarted for the remaining ones.
+
+    Args:
+    ----
+        input_dir: directory of the documents (PDF files or images)
+        output_dir: directory of the results, with the same layout as the input directory
+        detection: text detection architecture
+        recognition: text recognition architecture
+        workers: number of worker processes
+        threads: number of threads of each worker, defaults to sharing the cores between the workers
+        output_format: "json" for a JSON file per document, "ndjson" for a file per document with a page per line
+        resume: whether to skip the documents processed by previous runs, according to the manifest
+        **kwargs: keyword args of `ocr_predictor`
+
+    Returns:
+    -------
+        the number of documents per status ("done", "error", "skipped")
+    """
+    if output_format not in ("json", "ndjson"):
+        raise ValueError(f"unsupported output format: {output_format}")
+    if workers < 1:
+        raise ValueError("`workers` is expected to be a positive integer.")
+    threads = threads or max((os.cpu_count() or 1) // workers, 1)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = output_dir / MANIFEST_NAME
+    done = load_manifest(manifest_path) if resume else set()
+
+    counts = {"done": 0, "error": 0, "skipped": 0}
+    tasks = []
+    for path in list_documents(input_dir):
+        document = path.relative_to(input_dir).as_posix()
+        if document in done:
+            counts["skipped"] += 1
+            continue
+        output = output_dir / f"{document}.{output_format}"
+        tasks.append({"document": document, "input": str(path), "output": str(output)})
+    if not tasks:
+        return counts
+
+    init_args = (detection, recognition, threads, output_format, kwargs)
+    queue = iter(tasks)
+    running: Dict[Future, Dict[str, str]] = {}
+    num_recorded = 0
+
+    def record(entry: Dict[str, Any]) -> None:
+        nonlocal num_recorded
+        # Each result is recorded as soon as it is written
+        manifest.write(json.dumps(entry) + "\n")
+        manifest.flush()
+        num_recorded += 1
+        counts[entry["status"]] += 1
+        status = entry["status"] if entry["status"] == "done" else f"error ({entry['error']})"
+        print(f"[{num_recorded}/{len(tasks)}] {entry['document']}: {status}")
+
+    pool = _start_pool(workers, init_args)
+    try:
+        with open(manifest_path, "a" if resume else "w") as manifest:
+            while True:
+                # Documents are handed out one at a time, so that a long document doesn't hold others back
+                for task in queue:
+                    running[pool.submit(process_document, task)] = task
+                    if len(running) >= workers:
+                        break
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                try:
+                    for future in finished:
+                        entry = future.result()
+                        del running[future]
+                        record(entry)
+                except BrokenProcessPool:
+                    # A dead worker breaks the whole pool: the document that killed it can't be told apart from the
+                    # others in progress, so they are all recorded as errors, to be retried by a later run
+                    pool.shutdown(wait=True)
+                    for task in running.values():
+                        record({
+                            "document": task["document"],
+                            "output": task["output"],
+                            "status": "error",
+                            "error": "BrokenProcessPool: a worker process died while processing the document",
+                        })
+                    running.clear()
+                    pool = _start_pool(workers, init_args)
+    finally:
+        pool.shutdown(wait=True)
+
+    return counts
+
+
+def main(args):
+    counts = run(
+        Path(args.input),
+        Path(args.output),
+        args.detection,
+        args.recognition,
+        workers=args.workers,
+        threads=args.threads,
+        output_format=args.format,
+        resume=not args.overwrite,
+        det_bs=args.det_bs,
+        reco_bs=args.reco_bs,
+    )
+    print(f"{counts['done']} documents processed, {counts['error']} errors, {counts['skipped']} skipped")
+
+
+def parse_args():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="DocTR batch OCR of a directory of documents",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+
+    parser.add_argument("input", type=str, help="Directory of the documents (PDF files or images)")
+    parser.add_argument("output", type=str, help="Directory of the results")
+    parser.add_argument("--detection", type=str, default="fast_base", help="Text detection model to use")
+    parser.add_argument("--recognition", type=str, default="crnn_vgg16_bn", help="Text recognition model to use")
+    parser.add_argument("--workers", type=int, default=1, help="Number of worker processes")
+    parser.add_argument(
+        "--threads", type=int, default=None, help="Number of threads of each worker (defaults to cores / workers)"
+    )
+    parser.add_argument("--format", type=str, default="json", choices=["json", "ndjson"], help="Format of the results")
+    parser.add_argument("--det-bs", type=int, default=2, help="Batch size of the text detection")
+    parser.add_argument("--reco-bs", type=int, default=128, help="Batch size of the text recognition")
+    parser.add_argument(
+        "--overwrite", dest="overwrite", help="Process all documents again, ignoring the manifest", action="store_true"
+    )
+    args = parser.parse_args()
+
+    return args
+
+
+if __name__ == "__main__":
+    parsed_args = parse_args()
+    main(parsed_args)
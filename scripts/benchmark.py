@@ -0,0 +1,257 @@
+# Copyright (C) 2021-2024, Mindee.
+
+# This program is licensed under the Apache License 2.0.
+# See LICENSE or go to <https://opensource.org/licenses/Apache-2.0> for full license details.
+
+"""End-to-end OCR benchmark on synthetic documents, with per-stage timings"""
+
+import os
+
+os.environ["TF_CPP_MIN_LOG_LEVEL"] = "2"
+
+import io
+import json
+import platform
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+
+import doctr
+from doctr.datasets import VOCABS
+from doctr.file_utils import is_tf_available, is_torch_available
+from doctr.io import DocumentFile
+from doctr.models import ocr_predictor
+from doctr.utils.profiling import Profiler, profile_stage
+
+# Enable GPU growth if using TF
+if is_tf_available():
+    import tensorflow as tf
+
+    gpu_devices = tf.config.experimental.list_physical_devices("GPU")
+    if any(gpu_devices):
+        tf.config.experimental.set_memory_growth(gpu_devices[0], True)
+else:
+    import torch
+
+
+def run(
+    predictor: Any,
+    pages: List[np.ndarray],
+    pdf: Optional[bytes] = None,
+    synchronize: Optional[Callable[[], None]] = None,
+) -> Tuple[Any, Dict[str, float]]:
+    """Run the pipeline once and time its stages
+
+    The time of a stage excludes the time of the stages it calls (e.g. the detection postprocessing is called
+    by the detection model), so that stage timings add up to the end-to-end latency. On GPU, the device is only
+    synchronized at the end of the run: the time of pending kernels goes to the stage waiting for their results.
+
+    Args:
+    ----
+        predictor: the OCR predictor
+        pages: the pages of the document
+        pdf: the document as a PDF file, rendered as part of the run if specified
+        synchronize: callable waiting for the device to complete its pending work (e.g. on GPU)
+
+    Returns:
+    -------
+        the output of the predictor and the time spent in each stage (in seconds)
+    """
+    start = time.perf_counter()
+    with Profiler() as profiler:
+        if pdf is not None:
+            with profile_stage("render"):
+                pages = DocumentFile.from_pdf(pdf)
+        out = predictor(pages)
+        if synchronize is not None:
+            synchronize()
+    total = time.perf_counter() - start
+    timings = {stage: stats["time"] for stage, stats in profiler.export().items()}
+    timings["other"] = max(total - sum(timings.values()), 0.0)
+    timings["total"] = total
+    return out, timings
+
+
+def synthesize_document(
+    num_pages: int,
+    height: int,
+    width: int,
+    num_words: int,
+    rotation: float = 0.0,
+    seed: int = 0,
+) -> List[np.ndarray]:
+    """Draw pages of random words, laid out in lines of text
+
+    Args:
+    ----
+        num_pages: number of pages
+        height: height of the pages
+        width: width of the pages
+        num_words: number of words per page
+        rotation: pages are rotated by a random angle in [-rotation, rotation] degrees
+        seed: seed of the random generator
+
+    Returns:
+    -------
+        the list of pages, of shape (H, W, 3)
+    """
+    rng = np.random.default_rng(seed)
+    chars = np.array(list(VOCABS["latin"]))
+    scale, thickness = 0.6, 1
+    (_, char_h), baseline = cv2.getTextSize("A", cv2.FONT_HERSHEY_SIMPLEX, scale, thickness)
+    line_h = 2 * (char_h + baseline)
+    margin = max(line_h, min(height, width) // 20)
+    pages = []
+    for _ in range(num_pages):
+        page = np.full((height, width, 3), 255, dtype=np.uint8)
+        x, y = margin, margin + char_h
+        for _ in range(num_words):
+            word = "".join(rng.choice(chars, size=rng.integers(2, 11)))
+            (word_w, _), _ = cv2.getTextSize(word, cv2.FONT_HERSHEY_SIMPLEX, scale, thickness)
+            if x + word_w > width - margin:
+                x, y = margin, y + line_h
+            if y > height - margin:
+                break
+            cv2.putText(page, word, (x, y), cv2.FONT_HERSHEY_SIMPLEX, scale, (0, 0, 0), thickness, cv2.LINE_AA)
+            x += word_w + char_h
+        if rotation:
+            angle = rng.uniform(-rotation, rotation)
+            matrix = cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1.0)
+            page = cv2.warpAffine(page, matrix, (width, height), borderValue=(255, 255, 255))
+        pages.append(page)
+    return pages
+
+
+def to_pdf(pages: List[np.ndarray]) -> bytes:
+    """Save pages as a PDF document, to benchmark its rendering"""
+    images = [Image.fromarray(page) for page in pages]
+    buffer = io.BytesIO()
+    # 144 dpi matches the default rendering scale of `read_pdf`
+    images[0].save(buffer, format="PDF", save_all=True, append_images=images[1:], resolution=144)
+    return buffer.getvalue()
+
+
+def summarize(durations: List[float]) -> Dict[str, float]:
+    """Statistics (in ms) of the durations of a stage"""
+    _durations = 1000 * np.asarray(durations)
+    return {
+        "mean": float(_durations.mean()),
+        "std": float(_durations.std()),
+        "p50": float(np.percentile(_durations, 50)),
+        "p95": float(np.percentile(_durations, 95)),
+        "p99": float(np.percentile(_durations, 99)),
+        "max": float(_durations.max()),
+    }
+
+
+def main(args):
+    predictor = ocr_predictor(
+        args.detection,
+        args.recognition,
+        pretrained=args.pretrained,
+        pretrained_backbone=False,
+        assume_straight_pages=args.rotation == 0,
+        det_bs=args.det_bs,
+        reco_bs=args.reco_bs,
+    )
+    synchronize = None
+    if is_torch_available() and args.gpu:
+        predictor = predictor.cuda()
+        synchronize = torch.cuda.synchronize
+
+    pages = synthesize_document(args.pages, args.height, args.width, args.words, args.rotation, args.seed)
+    pdf = to_pdf(pages) if args.pdf else None
+
+    timings: Dict[str, List[float]] = defaultdict(list)
+    num_words = 0
+    for it in range(args.warmup + args.it):
+        out, run_timings = run(predictor, pages, pdf, synchronize)
+        if it < args.warmup:
+            continue
+        for stage, duration in run_timings.items():
+            timings[stage].append(duration)
+        num_words += sum(len(line.words) for page in out.pages for block in page.blocks for line in block.lines)
+
+    totals = np.asarray(timings["total"])
+    report = {
+        "config": {
+            "detection": args.detection,
+            "recognition": args.recognition,
+            "pretrained": args.pretrained,
+            "pages": args.pages,
+            "height": args.height,
+            "width": args.width,
+            "words": args.words,
+            "rotation": args.rotation,
+            "pdf": args.pdf,
+            "det_bs": args.det_bs,
+            "reco_bs": args.reco_bs,
+            "iterations": args.it,
+            "seed": args.seed,
+        },
+        "environment": {
+            "doctr": doctr.__version__,
+            "backend": "tensorflow" if is_tf_available() else "pytorch",
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "gpu": args.gpu,
+        },
+        "throughput": {
+            "pages_per_s": args.pages * len(totals) / totals.sum(),
+            "words_per_s": num_words / totals.sum(),
+            "detected_words_per_page": num_words / (args.pages * len(totals)),
+        },
+        "stages": {stage: summarize(durations) for stage, durations in timings.items()},
+    }
+
+    print(f"{args.detection} + {args.recognition} ({args.it} runs on {args.pages} pages of {args.height}x{args.width})")
+    print(f"{'stage':<20}{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}  (ms)")
+    for stage, stats in report["stages"].items():
+        print(f"{stage:<20}" + "".join(f"{stats[key]:>10.2f}" for key in ("mean", "p50", "p95", "p99")))
+    throughput = report["throughput"]
+    print(f"throughput: {throughput['pages_per_s']:.2f} pages/s, {throughput['words_per_s']:.1f} words/s")
+
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+def parse_args():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="DocTR end-to-end benchmark on synthetic documents",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+
+    parser.add_argument("--detection", type=str, default="fast_base", help="Text detection model to benchmark")
+    parser.add_argument("--recognition", type=str, default="crnn_vgg16_bn", help="Text recognition model to benchmark")
+    parser.add_argument(
+        "--pretrained", dest="pretrained", help="Use pre-trained models from the modelzoo", action="store_true"
+    )
+    parser.add_argument("--pages", type=int, default=4, help="Number of pages of the document")
+    parser.add_argument("--height", type=int, default=1123, help="Height of the pages")
+    parser.add_argument("--width", type=int, default=794, help="Width of the pages")
+    parser.add_argument("--words", type=int, default=200, help="Number of words drawn on each page")
+    parser.add_argument("--rotation", type=float, default=0, help="Maximum rotation angle of the pages (in degrees)")
+    parser.add_argument("--pdf", dest="pdf", help="Render the document from a PDF file", action="store_true")
+    parser.add_argument("--det-bs", type=int, default=2, help="Batch size of the text detection")
+    parser.add_argument("--reco-bs", type=int, default=128, help="Batch size of the text recognition")
+    parser.add_argument("--gpu", dest="gpu", help="Should the benchmark be performed on GPU", action="store_true")
+    parser.add_argument("--warmup", type=int, default=2, help="Number of warmup runs")
+    parser.add_argument("--it", type=int, default=20, help="Number of iterations to run")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic documents")
+    parser.add_argument("--output", type=str, default=None, help="Path of the JSON report")
+    args = parser.parse_args()
+
+    return args
+
+
+if __name__ == "__main__":
+    parsed_args = parse_args()
+    main(parsed_args)
@@ -0,0 +1,101 @@
+# Copyright (C) 2021-2024, Mindee.
+
+# This program is licensed under the Apache License 2.0.
+# See LICENSE or go to <https://opensource.org/licenses/Apache-2.0> for full license details.
+
+"""Memory footprint of the OCR results, per word, for the element tree and the columnar document"""
+
+import gc
+import json
+import tracemalloc
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from doctr.models.builder import DocumentBuilder
+
+
+def synthesize_predictions(
+    num_pages: int, num_words: int, rotated: bool, seed: int
+) -> Tuple[List[np.ndarray], List[List[Tuple[str, float]]], List[List[Dict[str, Any]]]]:
+    """Random word boxes laid out in lines, with their text predictions and crop orientations"""
+    rng = np.random.default_rng(seed)
+    boxes, text_preds, crop_orientations = [], [], []
+    for _ in range(num_pages):
+        # Words of ~8% of the page width, on lines of ~2% of the page height
+        xmin = rng.random(num_words) * 0.9
+        ymin = rng.integers(0, 45, num_words) / 50
+        page_boxes = np.stack((xmin, ymin, xmin + 0.08, ymin + 0.015, rng.random(num_words)), axis=1)
+        if rotated:
+            page_boxes = np.stack(
+                (
+                    page_boxes[:, [0, 1]],
+                    page_boxes[:, [2, 1]],
+                    page_boxes[:, [2, 3]],
+                    page_boxes[:, [0, 3]],
+                ),
+                axis=1,
+            )
+        boxes.append(page_boxes.astype(np.float32))
+        # Like the recognition predictor, every word gets its own string & confidence
+        text_preds.append([(f"word{idx}", float(conf)) for idx, conf in enumerate(rng.random(num_words))])
+        crop_orientations.append([{"value": 0, "confidence": None} for _ in range(num_words)])
+    return boxes, text_preds, crop_orientations
+
+
+def measure(builder: DocumentBuilder, *args: Any) -> int:
+    """Memory allocated by the builder (in bytes) and still held by its output"""
+    gc.collect()
+    tracemalloc.start()
+    out = builder(*args)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del out
+    return current
+
+
+def main(args):
+    boxes, text_preds, crop_orientations = synthesize_predictions(args.pages, args.words, args.rotated, args.seed)
+    # The page images are shared, so that only the results are measured
+    pages = [np.zeros((args.height, args.width, 3), dtype=np.uint8)] * args.pages
+    page_shapes = [(args.height, args.width)] * args.pages
+    inputs = (pages, boxes, text_preds, page_shapes, crop_orientations)
+    num_words = args.pages * args.words
+
+    report: Dict[str, Any] = {"pages": args.pages, "words": num_words, "rotated": args.rotated, "results": {}}
+    print(f"{args.pages} pages, {num_words} words ({'rotated' if args.rotated else 'straight'} boxes)")
+    for name, columnar in (("elements", False), ("columnar", True)):
+        builder = DocumentBuilder(block_resolution="spatial", columnar=columnar)
+        footprint = measure(builder, *inputs)
+        report["results"][name] = {"bytes": footprint, "bytes_per_word": footprint / num_words}
+        print(f"{name:<10} {footprint / 1024**2:8.2f} MB  {footprint / num_words:7.1f} bytes/word")
+
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+def parse_args():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="DocTR memory footprint of the OCR results",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+
+    parser.add_argument("--pages", type=int, default=200, help="Number of pages of the document")
+    parser.add_argument("--words", type=int, default=500, help="Number of words on each page")
+    parser.add_argument("--height", type=int, default=1123, help="Height of the pages")
+    parser.add_argument("--width", type=int, default=794, help="Width of the pages")
+    parser.add_argument("--rotated", dest="rotated", help="Use rotated boxes", action="store_true")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic predictions")
+    parser.add_argument("--output", type=str, default=None, help="Path of the JSON report")
+    args = parser.parse_args()
+
+    return args
+
+
+if __name__ == "__main__":
+    parsed_args = parse_args()
+    main(parsed_args)
@@ -97,3 +97,30 @@ def test_pdf(mock_pdf):
     # As images
     num_pages = 2
     _check_doc_content(pages, num_pages)
+
+    # Page selection
+    selected_pages = io.DocumentFile.from_pdf(mock_pdf, pages=[-1])
+    _check_doc_content(selected_pages, 1)
+    assert np.array_equal(selected_pages[0], pages[1])
+    with pytest.raises(IndexError):
+        io.DocumentFile.from_pdf(mock_pdf, pages=[num_pages])
+
+    # Lazy rendering
+    lazy_pages = io.DocumentFile.from_pdf(mock_pdf, lazy=True)
+    assert isinstance(lazy_pages, io.PDFPages)
+    _check_doc_content(lazy_pages, num_pages)
+    assert all(np.array_equal(lazy_page, page) for lazy_page, page in zip(lazy_pages, pages))
+    assert isinstance(lazy_pages[1:], io.PDFPages) and len(lazy_pages[1:]) == 1
+    assert np.array_equal(lazy_pages[1:][0], pages[1])
+    lazy_pages.close()
+
+    # Pixel budget
+    max_pixels = 500 * 500
+    budget_pages = io.DocumentFile.from_pdf(mock_pdf, max_pixels=max_pixels)
+    assert all(abs(page.shape[0] * page.shape[1] - max_pixels) / max_pixels < 0.01 for page in budget_pages)
+
+    # Parallel rendering
+    parallel_pages = io.DocumentFile.from_pdf(mock_pdf, num_workers=2)
+    assert all(np.array_equal(parallel_page, page) for parallel_page, page in zip(parallel_pages, pages))
+    with pytest.raises(ValueError):
+        io.DocumentFile.from_pdf(mock_pdf, lazy=True, num_workers=2)
@@ -1,3 +1,5 @@
+import io
+import json
 from xml.etree.ElementTree import ElementTree
 
 import numpy as np
@@ -136,6 +138,10 @@ def test_word():
     assert word.confidence == conf
     assert word.geometry == geom
     assert word.crop_orientation == crop_orientation
+    # Slot-based attributes
+    assert not hasattr(word, "__dict__")
+    with pytest.raises(AttributeError):
+        word.unknown = 0
 
     # Render
     assert word.render() == word_str
@@ -171,6 +177,7 @@ def test_line():
     assert len(line.words) == len(words)
     assert all(isinstance(w, elements.Word) for w in line.words)
     assert line.geometry == geom
+    assert not hasattr(line, "__dict__")
 
     # Render
     assert line.render() == "hello world"
@@ -398,6 +405,13 @@ def test_document():
     # Export
     assert doc.export() == {"pages": [p.export() for p in pages]}
 
+    # Export JSON
+    assert json.loads(doc.export_as_json()) == json.loads(json.dumps(doc.export()))
+    fp = io.StringIO()
+    doc.export_as_ndjson(fp)
+    lines = fp.getvalue().splitlines()
+    assert [json.loads(line) for line in lines] == json.loads(json.dumps(doc.export()))["pages"]
+
     # Export XML
     assert isinstance(doc.export_as_xml(), list) and len(doc.export_as_xml()) == len(pages)
 
@@ -1,8 +1,11 @@
+import io
+import json
+
 import numpy as np
 import pytest
 
 from doctr.file_utils import CLASS_NAME
-from doctr.io import Document
+from doctr.io import ColumnarDocument, ColumnarPage, Document
 from doctr.io.elements import KIEDocument
 from doctr.models import builder
 
@@ -81,10 +84,80 @@ def test_documentbuilder():
     # Repr
     assert (
         repr(doc_builder) == "DocumentBuilder(resolve_lines=True, "
-        "resolve_blocks=True, paragraph_break=0.035, export_as_straight_boxes=False)"
+        "resolve_blocks=True, paragraph_break=0.035, export_as_straight_boxes=False, block_resolution='hierarchical')"
     )
 
 
+@pytest.mark.parametrize("rotated", [False, True])
+def test_documentbuilder_columnar(rotated):
+    rng = np.random.default_rng(0)
+    boxes = rng.random((50, 4)) * 0.9
+    boxes[:, 2:] = boxes[:, :2] + rng.random((50, 2)) * 0.1
+    if rotated:
+        boxes = np.stack((boxes[:, [0, 1]], boxes[:, [2, 1]], boxes[:, [2, 3]], boxes[:, [0, 3]]), axis=1)
+    else:
+        boxes = np.concatenate((boxes, rng.random((50, 1))), axis=1)
+    args = (
+        [np.zeros((100, 200, 3))] * 2,
+        [boxes, boxes[:0]],
+        [[(f"word{idx}", 0.5) for idx in range(50)], []],
+        [(100, 200), (100, 200)],
+        [[{"value": 0, "confidence": None}] * 50, []],
+    )
+    doc = builder.DocumentBuilder()(*args)
+    out = builder.DocumentBuilder(columnar=True)(*args)
+    assert isinstance(out, ColumnarDocument)
+    assert out.render() == doc.render()
+    assert out.pages[0].num_words == 50 and out.pages[1].num_blocks == 0
+    # Lazy objects
+    assert out.pages[0].blocks is out.pages[0].blocks
+    assert out.to_document().render() == doc.render()
+    word = out.pages[0].get_block(0).lines[0].words[0]
+    assert word.value == doc.pages[0].blocks[0].lines[0].words[0].value
+    assert word.crop_orientation == {"value": 0, "confidence": None}
+    # Direct export
+    export = out.export()
+    if not rotated:
+        assert export == doc.export()
+    assert len(export["pages"][0]["blocks"]) == len(doc.pages[0].blocks)
+    np.testing.assert_allclose(
+        export["pages"][0]["blocks"][0]["lines"][0]["geometry"],
+        doc.pages[0].blocks[0].lines[0].geometry,
+        atol=1e-6,
+    )
+    assert export["pages"][1]["blocks"] == []
+    # JSON export, straight from the arrays
+    for kwargs in ({}, {"flatten_geometry": True, "precision": 2}):
+        if not rotated:
+            assert out.export_as_json(**kwargs) == doc.export_as_json(**kwargs)
+            assert out.export_as_ndjson(**kwargs) == doc.export_as_ndjson(**kwargs)
+            assert out.pages[0].export_as_json(**kwargs) == doc.pages[0].export_as_json(**kwargs)
+        assert json.loads(out.export_as_json(**kwargs)) == json.loads(out.to_document().export_as_json(**kwargs))
+    buffer = io.StringIO()
+    out.export_as_json(buffer)
+    assert buffer.getvalue() == out.export_as_json()
+    assert repr(builder.DocumentBuilder(columnar=True)).endswith("columnar=True)")
+
+    with pytest.raises(ValueError):
+        builder.DocumentBuilder(columnar=True)(*args[:2], [[("hello", 1.0)], []], *args[3:])
+    with pytest.raises(ValueError):
+        page = out.pages[0]
+        ColumnarPage(
+            page.page,
+            page.values[:-1],
+            page.confidences,
+            page.geometries,
+            page.crop_orientations,
+            page.crop_orientation_confidences,
+            page.line_offsets,
+            page.line_geometries,
+            page.block_offsets,
+            page.block_geometries,
+            0,
+            (100, 200),
+        )
+
+
 def test_kiedocumentbuilder():
     num_pages = 2
 
@@ -160,7 +233,7 @@ def test_kiedocumentbuilder():
     # Repr
     assert (
         repr(doc_builder) == "KIEDocumentBuilder(resolve_lines=True, "
-        "resolve_blocks=True, paragraph_break=0.035, export_as_straight_boxes=False)"
+        "resolve_blocks=True, paragraph_break=0.035, export_as_straight_boxes=False, block_resolution='hierarchical')"
     )
 
 
@@ -208,3 +281,75 @@ def test_sort_boxes(input_boxes, sorted_idxs):
 def test_resolve_lines(input_boxes, lines):
     doc_builder = builder.DocumentBuilder()
     assert doc_builder._resolve_lines(np.asarray(input_boxes)) == lines
+
+
+@pytest.mark.parametrize(
+    "input_boxes, word_idcs, line_idcs, sub_lines",
+    [
+        [[[0.5, 0.5, 0.6, 0.6], [0, 0.5, 0.1, 0.6], [0.11, 0.5, 0.2, 0.6]], [0, 1, 2], None, [[1, 2], [0]]],
+        [[[0, 0.5, 0.1, 0.6], [0.11, 0.5, 0.2, 0.6], [0.05, 0.7, 0.1, 0.8]], [0, 1, 2], [0, 0, 1], [[0, 1], [2]]],
+        [[[0, 0.5, 0.1, 0.6], [0.11, 0.5, 0.2, 0.6], [0.05, 0.7, 0.1, 0.8]], [2, 1], [0, 1], [[2], [1]]],
+        [[[0, 0.5, 0.1, 0.6]], [0], None, [[0]]],
+    ],
+)
+def test_resolve_sub_lines(input_boxes, word_idcs, line_idcs, sub_lines):
+    doc_builder = builder.DocumentBuilder()
+    assert doc_builder._resolve_sub_lines(np.asarray(input_boxes), word_idcs, line_idcs) == sub_lines
+
+
+def _reference_resolve_lines(doc_builder, boxes):
+    # Line resolution word by word, with each line sorted and split on its own
+    idxs, boxes = doc_builder._sort_boxes(boxes)
+    y_med = np.median(boxes[:, 3] - boxes[:, 1])
+
+    def split_line(word_idcs):
+        word_idcs = [word_idcs[idx] for idx in boxes[word_idcs, 0].argsort().tolist()]
+        sub_lines = [[word_idcs[0]]]
+        for idx in word_idcs[1:]:
+            if boxes[idx, 0] - boxes[sub_lines[-1][-1], 2] < doc_builder.paragraph_break:
+                sub_lines[-1].append(idx)
+            else:
+                sub_lines.append([idx])
+        return sub_lines
+
+    lines, words = [], [idxs[0]]
+    y_center_sum = boxes[idxs[0]][[1, 3]].mean()
+    for idx in idxs[1:]:
+        if abs(boxes[idx][[1, 3]].mean() - y_center_sum / len(words)) >= y_med / 2:
+            lines.extend(split_line(words))
+            words, y_center_sum = [], 0
+        words.append(idx)
+        y_center_sum += boxes[idx][[1, 3]].mean()
+    lines.extend(split_line(words))
+    return lines
+
+
+@pytest.mark.parametrize("num_words", [500, 3000])
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_resolve_lines_tied_xmin(num_words, seed):
+    # Rounded coordinates, so that many words of a line share the same xmin
+    rng = np.random.default_rng(seed)
+    boxes = rng.random((num_words, 4)) * 0.9
+    boxes[:, 2:] = boxes[:, :2] + rng.random((num_words, 2)) * 0.1
+    boxes = boxes.round(2)
+    doc_builder = builder.DocumentBuilder()
+    assert doc_builder._resolve_lines(boxes) == _reference_resolve_lines(doc_builder, boxes)
+
+
+@pytest.mark.parametrize("num_words", [2, 10, 500])
+@pytest.mark.parametrize("rotated", [False, True])
+def test_resolve_blocks(num_words, rotated):
+    rng = np.random.default_rng(num_words)
+    boxes = rng.random((num_words, 4)) * 0.9
+    boxes[:, 2:] = boxes[:, :2] + rng.random((num_words, 2)) * 0.1
+    if rotated:
+        boxes = np.stack((boxes[:, [0, 1]], boxes[:, [2, 1]], boxes[:, [2, 3]], boxes[:, [0, 3]]), axis=1)
+    doc_builder = builder.DocumentBuilder()
+    lines = doc_builder._resolve_lines(boxes)
+    blocks = doc_builder._resolve_blocks(boxes, lines)
+    assert sorted(idx for block in blocks for line in block for idx in line) == list(range(num_words))
+    # The spatial linkage yields the same blocks as the hierarchical clustering
+    assert builder.DocumentBuilder(block_resolution="spatial")._resolve_blocks(boxes, lines) == blocks
+
+    with pytest.raises(ValueError):
+        builder.DocumentBuilder(block_resolution="kmeans")
@@ -1,9 +1,30 @@
 import numpy as np
 import pytest
 
+from doctr.models.detection.core import DetectionPostProcessor
 from doctr.models.detection.differentiable_binarization.base import DBPostProcessor
 from doctr.models.detection.fast.base import FASTPostProcessor
 from doctr.models.detection.linknet.base import LinkNetPostProcessor
+from doctr.utils.multithreading import set_num_threads
+
+
+def test_box_score():
+    pred = np.zeros((64, 96), dtype=np.float32)
+    pred[10:20, 20:60] = 0.8
+    pred[15:20, 20:40] = 0.4
+    points = np.array([[20, 10], [59, 10], [59, 19], [20, 19]])
+    assert DetectionPostProcessor.box_score(pred, points) == pytest.approx(0.7)
+    assert DetectionPostProcessor.box_score(pred, points[:, None], assume_straight_pages=False) == pytest.approx(0.7)
+    # Polygons crossing the borders of the map
+    points = np.array([[-10, 50], [120, 50], [120, 100], [-10, 100]])
+    pred[50:] = 0.5
+    assert DetectionPostProcessor.box_score(pred, points, assume_straight_pages=False) == pytest.approx(0.5)
+    # Score is the same with a larger (reused) mask buffer
+    points = np.array([[0, 0], [95, 0], [95, 63], [0, 63]])
+    score = pred[pred > 0].mean()
+    assert DetectionPostProcessor.box_score(pred, points, assume_straight_pages=False) == pytest.approx(score)
+    points = np.array([[20, 10], [59, 10], [59, 19], [20, 19]])
+    assert DetectionPostProcessor.box_score(pred, points, assume_straight_pages=False) == pytest.approx(0.7)
 
 
 def test_dbpostprocessor():
@@ -23,6 +44,13 @@ def test_dbpostprocessor():
     # Relative coords
     assert all(all(np.all(np.logical_and(v[:, :4] >= 0, v[:, :4] <= 1)) for v in sample) for sample in out)
     assert all(all(np.all(np.logical_and(v[:, :4] >= 0, v[:, :4] <= 1)) for v in sample) for sample in r_out)
+    # Pages are processed in parallel
+    set_num_threads(1)
+    try:
+        ref_out = postprocessor(mock_batch)
+    finally:
+        set_num_threads(None)
+    assert all(all(np.array_equal(v, ref) for v, ref in zip(*samples)) for samples in zip(out, ref_out))
     # Repr
     assert repr(postprocessor) == "DBPostProcessor(bin_thresh=0.3, box_thresh=0.1)"
     # Edge case when the expanded points of the polygon has two lists
@@ -61,6 +89,25 @@ def test_dbpostprocessor():
     assert isinstance(out, tuple) and len(out) == 4
     assert isinstance(r_out, np.ndarray) and r_out.shape == (4, 2)
 
+    # Vectorized box extraction matches the unclipping of each polygon
+    pred = np.zeros((64, 96), dtype=np.float32)
+    pred[8:20, 10:50] = 0.9
+    pred[30:40, 60:90] = 0.8
+    # Ring with a nested component, which isn't an external contour
+    pred[44:62, 4:40] = 0.7
+    pred[47:59, 7:37] = 0
+    pred[50:56, 12:30] = 0.9
+    bitmap = (pred > postprocessor.bin_thresh).astype(np.uint8)
+    out = postprocessor.bitmap_to_boxes(pred, bitmap)
+    assert out.shape == (3, 5)
+    for box, (x, y, w, h) in zip(out, [(4, 44, 36, 18), (60, 30, 30, 10), (10, 8, 40, 12)]):
+        _x, _y, _w, _h = postprocessor.polygon_to_box(np.array([[x, y], [x, y + h], [x + w, y + h], [x + w, y]]))
+        assert np.allclose(box[:4], np.clip([_x / 96, _y / 64, (_x + _w) / 96, (_y + _h) / 64], 0, 1))
+    r_out = r_postprocessor.bitmap_to_boxes(pred, bitmap)
+    assert r_out.shape == (3, 4, 2)
+    # Corners of horizontal boxes start from the top left one, clockwise
+    assert np.all(r_out[-1, 0] < r_out[-1, 2]) and r_out[-1, 1, 0] > r_out[-1, 3, 0]
+
 
 def test_linknet_postprocessor():
     postprocessor = LinkNetPostProcessor()
@@ -1,7 +1,7 @@
 import numpy as np
 import pytest
 
-from doctr.models.recognition.predictor._utils import remap_preds, split_crops
+from doctr.models.recognition.predictor._utils import bucket_crops, remap_preds, split_crops
 
 
 @pytest.mark.parametrize(
@@ -37,3 +37,14 @@ def test_remap_preds(preds, crop_map, dilation, pred):
     assert preds == pred
     assert all(isinstance(pred, tuple) for pred in preds)
     assert all(isinstance(pred[0], str) and isinstance(pred[1], float) for pred in preds)
+
+
+@pytest.mark.parametrize("channels_last", [True, False])
+def test_bucket_crops(channels_last):
+    widths = [16, 40, 100, 300, 1000, 30, 64]
+    crops = [np.zeros((32, w, 3) if channels_last else (3, 32, w), dtype=np.uint8) for w in widths]
+    buckets = bucket_crops(crops, 32, (128, 32, 64, 256), channels_last)
+    # Sorted widths, empty buckets are skipped and crops are sorted by aspect ratio
+    assert buckets == [(32, [0, 5]), (64, [1, 6]), (128, [2]), (256, [3, 4])]
+    # Crops are resized to the target height
+    assert bucket_crops([np.zeros((64, 128, 3), dtype=np.uint8)], 32, (32, 64, 128)) == [(64, [0])]
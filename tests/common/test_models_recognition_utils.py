@@ -1,5 +1,7 @@
+import numpy as np
 import pytest
 
+from doctr.models.recognition.crnn.base import decode_best_path
 from doctr.models.recognition.utils import merge_multi_strings, merge_strings
 
 
@@ -29,3 +31,18 @@ def test_merge_strings(a, b, merged):
 )
 def test_merge_multi_strings(seq_list, merged):
     assert merged == merge_multi_strings(seq_list, 1.4)
+
+
+def test_decode_best_path():
+    vocab = "abcé€"
+    blank = len(vocab)
+    best_path = np.array([[0, 0, 5, 0, 1, 1, 5, 5], [5, 5, 5, 5, 5, 5, 5, 5], [3, 4, 4, 5, 4, 2, 2, 2]])
+    char_probs = np.linspace(0.2, 0.9, best_path.size).reshape(best_path.shape)
+    words, char_confs = decode_best_path(best_path, char_probs, vocab, blank)
+    # Repeated labels are merged, unless separated by a blank
+    assert words == ["aab", "", "é€€c"]
+    assert [len(confs) for confs in char_confs] == [3, 0, 4]
+    # Confidence of the first time step of each character
+    assert char_confs[0] == pytest.approx(char_probs[0, [0, 3, 4]].tolist())
+    assert char_confs[2] == pytest.approx(char_probs[2, [0, 1, 4, 5]].tolist())
+    assert decode_best_path(best_path[:0], char_probs[:0], vocab, blank) == ([], [])
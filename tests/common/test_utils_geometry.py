@@ -209,6 +209,10 @@ def test_extract_crops(mock_pdf):
         )
     )
 
+    # Copies or views
+    assert not any(np.shares_memory(crop, doc_img) for crop in geometry.extract_crops(doc_img, rel_boxes))
+    assert all(np.shares_memory(crop, doc_img) for crop in geometry.extract_crops(doc_img, rel_boxes, copy=False))
+
     # No box
     assert geometry.extract_crops(doc_img, np.zeros((0, 4))) == []
 
@@ -243,5 +247,15 @@ def test_extract_rcrops(mock_pdf):
         assert all(isinstance(crop, np.ndarray) for crop in croped_imgs)
         assert all(crop.ndim == 3 for crop in croped_imgs)
 
+    # Channels first
+    for crop, ref_crop in zip(
+        geometry.extract_rcrops(doc_img.transpose(2, 0, 1), rel_boxes, channels_last=False),
+        geometry.extract_rcrops(doc_img, rel_boxes),
+    ):
+        assert np.all(crop == ref_crop)
+
+    # Empty box
+    assert geometry.extract_rcrops(doc_img, np.zeros((1, 4, 2)))[0].shape == (0, 0, 3)
+
     # No box
     assert geometry.extract_rcrops(doc_img, np.zeros((0, 4, 2))) == []
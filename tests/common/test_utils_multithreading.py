@@ -1,10 +1,18 @@
 import os
-from multiprocessing.pool import ThreadPool
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch
 
 import pytest
 
-from doctr.utils.multithreading import multithread_exec
+from doctr.utils import multithreading
+from doctr.utils.multithreading import (
+    get_num_threads,
+    multithread_exec,
+    prefetch_exec,
+    set_num_threads,
+    shutdown_thread_pools,
+)
 
 
 @pytest.mark.parametrize(
@@ -22,10 +30,79 @@ from doctr.utils.multithreading import multithread_exec
 def test_multithread_exec(input_seq, func, output_seq):
     assert list(multithread_exec(func, input_seq)) == output_seq
     assert list(multithread_exec(func, input_seq, 0)) == output_seq
+    assert list(multithread_exec(func, input_seq, 2, chunksize=1)) == output_seq
+    assert list(multithread_exec(func, iter(input_seq), 2, chunksize=2)) == output_seq
 
 
 @patch.dict(os.environ, {"DOCTR_MULTIPROCESSING_DISABLE": "TRUE"}, clear=True)
 def test_multithread_exec_multiprocessing_disable():
-    with patch.object(ThreadPool, "map") as mock_tp_map:
+    with patch.object(ThreadPoolExecutor, "submit") as mock_submit:
         multithread_exec(lambda x: x, [1, 2])
-    assert not mock_tp_map.called
+    assert not mock_submit.called
+
+
+def test_multithread_exec_thread_pool():
+    shutdown_thread_pools()
+    # The pool is created once, then reused
+    assert list(multithread_exec(lambda x: x, range(10), 2)) == list(range(10))
+    pool = multithreading._THREAD_POOLS[2]
+    assert list(multithread_exec(lambda x: x, range(10), 2)) == list(range(10))
+    assert multithreading._THREAD_POOLS[2] is pool
+    # Chunks
+    with pytest.raises(ValueError):
+        multithread_exec(lambda x: x, [1, 2], 2, chunksize=0)
+    chunk_threads = multithread_exec(lambda _: threading.get_ident(), range(8), 2, chunksize=4)
+    assert len(set(chunk_threads)) <= 2
+    # Errors are raised to the caller
+    with pytest.raises(ZeroDivisionError):
+        multithread_exec(lambda x: 1 / x, [1, 0, 2], 2)
+    # Nested calls are executed by the worker itself
+    nested = multithread_exec(lambda x: list(multithread_exec(lambda y: x * y, [1, 2], 2)), [1, 2, 3], 2)
+    assert list(nested) == [[1, 2], [2, 4], [3, 6]]
+    # Shutdown
+    shutdown_thread_pools()
+    assert multithreading._THREAD_POOLS == {}
+    assert list(multithread_exec(lambda x: x + 1, [1, 2], 2)) == [2, 3]
+    # Forked children start without the pools of their parent
+    multithreading._reset_thread_pools()
+    assert multithreading._THREAD_POOLS == {}
+
+
+def test_num_threads():
+    default_threads = get_num_threads()
+    assert default_threads >= 1
+    set_num_threads(3)
+    try:
+        assert get_num_threads() == 3
+        with patch("doctr.utils.multithreading._get_thread_pool", wraps=multithreading._get_thread_pool) as mock_pool:
+            assert list(multithread_exec(lambda x: x + 1, [1, 2])) == [2, 3]
+        mock_pool.assert_called_once_with(3)
+        with pytest.raises(ValueError):
+            set_num_threads(0)
+    finally:
+        set_num_threads(None)
+    assert get_num_threads() == default_threads
+    with patch.dict(os.environ, {"DOCTR_NUM_THREADS": "5"}):
+        assert get_num_threads() == 5
+    with patch.dict(os.environ, {"DOCTR_NUM_THREADS": "0"}):
+        assert get_num_threads() == default_threads
+
+
+def test_prefetch_exec():
+    assert list(prefetch_exec(lambda x: 2 * x, [1, 2, 3])) == [2, 4, 6]
+    assert list(prefetch_exec(lambda x: 2 * x, iter(range(10)), queue_size=1)) == [2 * x for x in range(10)]
+    assert list(prefetch_exec(lambda x: x, [])) == []
+    # Errors are raised in the consumer thread
+    with pytest.raises(ZeroDivisionError):
+        list(prefetch_exec(lambda x: 1 / x, [1, 0, 2]))
+    # Stopping the iteration early doesn't leave the worker blocked
+    results = prefetch_exec(lambda x: x, range(100), queue_size=1)
+    assert next(results) == 0
+    results.close()
+
+
+@patch.dict(os.environ, {"DOCTR_MULTIPROCESSING_DISABLE": "TRUE"}, clear=True)
+def test_prefetch_exec_multiprocessing_disable():
+    with patch("threading.Thread") as mock_thread:
+        assert list(prefetch_exec(lambda x: 2 * x, [1, 2])) == [2, 4]
+    assert not mock_thread.called
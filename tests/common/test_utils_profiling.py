@@ -0,0 +1,65 @@
+import logging
+import threading
+import time
+
+from doctr.utils.multithreading import prefetch_exec
+from doctr.utils.profiling import Profiler, profile_stage, profiled
+
+
+def test_profile_stage():
+    # Disabled by default
+    with profile_stage("stage", items=2) as counts:
+        counts["other"] = 1
+    profiler = Profiler()
+    with profiler:
+        with profile_stage("outer", shape=(2, 3), pages=2) as counts:
+            time.sleep(0.02)
+            with profile_stage("inner", shape=(2, 3)):
+                time.sleep(0.05)
+            counts["crops"] = 5
+        with profile_stage("inner", shape=(4, 3)):
+            pass
+    # Inactive once exited
+    with profile_stage("outer"):
+        pass
+
+    stats = profiler.export()
+    assert set(stats.keys()) == {"outer", "inner"}
+    assert stats["outer"]["calls"] == 1 and stats["inner"]["calls"] == 2
+    assert stats["outer"]["counts"] == {"pages": 2, "crops": 5}
+    assert stats["inner"]["shapes"] == {"2x3": 1, "4x3": 1}
+    # Nested stages are excluded from the time of their parent
+    assert 0.02 <= stats["outer"]["time"] < 0.05
+    assert stats["inner"]["time"] >= 0.05
+    assert stats["outer"]["peak_memory"] is None or stats["outer"]["peak_memory"] > 0
+    assert repr(profiler) == "Profiler(stages=['inner', 'outer'])"
+
+    # Statistics are aggregated over several activations
+    with profiler:
+        with profile_stage("outer", pages=1):
+            pass
+    assert profiler.export()["outer"]["calls"] == 2
+    assert profiler.export()["outer"]["counts"]["pages"] == 3
+    profiler.reset()
+    assert profiler.export() == {}
+
+
+def test_profiled(caplog):
+    @profiled("square")
+    def square(x):
+        return x**2
+
+    assert square(2) == 4
+    with Profiler() as profiler:
+        assert square(3) == 9
+        # Profilers are bound to the context of their thread
+        thread = threading.Thread(target=square, args=(4,))
+        thread.start()
+        thread.join()
+        # but are propagated to the prefetching threads
+        assert list(prefetch_exec(square, [1, 2])) == [1, 4]
+    assert profiler.export()["square"]["calls"] == 3
+
+    with caplog.at_level(logging.INFO):
+        profiler.log()
+    assert "square: 3 calls" in caplog.text
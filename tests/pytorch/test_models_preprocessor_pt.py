@@ -45,3 +45,35 @@ def test_preprocessor(batch_size, output_size, input_tensor, expected_batches, e
     assert all(b.shape[-2:] == output_size for b in out)
     assert all(torch.all(b == expected_value) for b in out)
     assert len(repr(processor).split("\n")) == 4
+
+
+def test_preprocessor_views():
+    processor = PreProcessor((32, 128), 2)
+    page = np.full((256, 512, 3), 255, dtype=np.uint8)
+    # Views on a page, rotated ones (negative strides) & read-only ones
+    read_only = page[:64, :256]
+    read_only.flags.writeable = False
+    crops = [page[10:42, 20:148], np.rot90(page[:128, :64]), read_only]
+    with torch.no_grad():
+        out = processor(crops)
+    assert len(out) == 2 and out[0].shape == (2, 3, 32, 128) and out[1].shape == (1, 3, 32, 128)
+    assert all(torch.all(b == 0.5) for b in out)
+    # The page is left untouched
+    assert np.all(page == 255)
+
+
+@pytest.mark.parametrize("symmetric_pad", [False, True])
+def test_preprocessor_build_batch(symmetric_pad):
+    processor = PreProcessor(
+        (32, 128), 4, mean=(0.7, 0.6, 0.5), std=(0.2, 0.3, 0.4), preserve_aspect_ratio=True, symmetric_pad=symmetric_pad
+    )
+    samples = [
+        np.random.randint(0, 255, (20, 200, 3), dtype=np.uint8),
+        np.random.rand(64, 32, 3).astype(np.float32),
+        torch.randint(0, 255, (3, 32, 128), dtype=torch.uint8),
+    ]
+    out = processor.build_batch(samples)
+    assert out.shape == (3, 3, 32, 128) and out.dtype == torch.float32
+    # Same as transforming, stacking then normalizing the samples
+    ref = processor.normalize(torch.stack([processor.sample_transforms(sample) for sample in samples]))
+    assert torch.allclose(out, ref)
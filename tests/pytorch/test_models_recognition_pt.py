@@ -8,6 +8,7 @@ import pytest
 import torch
 
 from doctr.models import recognition
+from doctr.models.preprocessor import PreProcessor
 from doctr.models.recognition.crnn.pytorch import CTCPostProcessor
 from doctr.models.recognition.master.pytorch import MASTERPostProcessor
 from doctr.models.recognition.parseq.pytorch import PARSeqPostProcessor
@@ -81,6 +82,78 @@ def test_reco_postprocessors(post_processor, input_shape, mock_vocab):
     assert repr(processor) == f"{post_processor.__name__}(vocab_size={len(mock_vocab)})"
 
 
+def test_ctc_postprocessor_char_confs(mock_vocab):
+    processor = CTCPostProcessor(mock_vocab)
+    logits = torch.rand(2, 30, len(mock_vocab) + 1)
+    decoded = processor(logits, return_char_confs=True)
+    assert [(word, conf) for word, conf, _ in decoded] == processor(logits)
+    probs = torch.softmax(logits, dim=-1).max(dim=-1).values
+    for (word, conf, char_confs), seq_probs in zip(decoded, probs):
+        assert len(char_confs) == len(word)
+        assert all(isinstance(char_conf, float) and conf <= char_conf <= 1 for char_conf in char_confs)
+        assert all(any(abs(char_conf - prob) < 1e-6 for prob in seq_probs.tolist()) for char_conf in char_confs)
+
+
+@pytest.mark.parametrize("max_len", [None, 5])
+@pytest.mark.parametrize("eos_bias", [0.0, 0.5, 2.0])
+def test_parseq_incremental_decoding(eos_bias, max_len):
+    model = recognition.parseq(pretrained=False).eval()
+    # Favour the EOS token so that the sequences end at different steps
+    model.head.bias.data[model.vocab_size] += eos_bias
+    with torch.no_grad():
+        features = model.feat_extractor(torch.rand(4, 3, 32, 128))["features"]
+        logits = model.decode_autoregressive(features, max_len)
+        # Reference: decoding the whole sequence at each step
+        model.exportable = True
+        ref_logits = model.decode_autoregressive(features, max_len)
+    assert logits.shape == ref_logits.shape
+    assert torch.allclose(logits, ref_logits, atol=1e-5)
+
+
+@pytest.mark.parametrize("eos_bias", [0.0, 0.6, 2.0])
+def test_master_incremental_decoding(eos_bias):
+    model = recognition.master(pretrained=False, pretrained_backbone=False, max_length=20).eval()
+    # Favour the EOS token so that the sequences end at different steps
+    model.linear.bias.data[model.vocab_size] += eos_bias
+    with torch.no_grad():
+        encoded = torch.rand(4, 64, model.d_model)
+        logits = model.decode(encoded)
+        # Reference: decoding the whole sequence at each step
+        model.exportable = True
+        ref_logits = model.decode(encoded)
+    assert logits.shape == ref_logits.shape
+    # Steps following the EOS token aren't decoded
+    is_eos = (ref_logits.argmax(-1) == model.vocab_size).int()
+    is_decoded = is_eos.cumsum(dim=1) - is_eos == 0
+    assert torch.allclose(logits[is_decoded], ref_logits[is_decoded], atol=1e-5)
+    assert torch.all(logits[~is_decoded] == 0)
+    out, ref_out = model.postprocessor(logits), model.postprocessor(ref_logits)
+    assert [word for word, _ in out] == [word for word, _ in ref_out]
+    assert np.allclose([conf for _, conf in out], [conf for _, conf in ref_out], atol=1e-5)
+
+
+@pytest.mark.parametrize("eos_bias", [0.0, 2.0, 3.0])
+def test_sar_greedy_decoding(eos_bias):
+    model = recognition.sar_resnet31(pretrained=False, pretrained_backbone=False).eval()
+    # Favour the EOS token so that the sequences end at different steps
+    model.decoder.output_dense.bias.data[len(model.vocab)] += eos_bias
+    with torch.no_grad():
+        features = model.feat_extractor(torch.rand(8, 3, 32, 128))["features"]
+        encoded = model.encoder(features.max(dim=-2).values.permute(0, 2, 1).contiguous())
+        logits = model.decoder.decode_greedy(features, encoded)
+        # Reference: decoding all the steps of the whole batch
+        ref_logits = model.decoder(features, encoded)
+    assert logits.shape == ref_logits.shape
+    # Steps following the EOS token aren't decoded
+    is_eos = (ref_logits.argmax(-1) == len(model.vocab)).int()
+    is_decoded = is_eos.cumsum(dim=1) - is_eos == 0
+    assert torch.allclose(logits[is_decoded], ref_logits[is_decoded], atol=1e-4)
+    assert torch.all(logits[~is_decoded] == 0)
+    out, ref_out = model.postprocessor(logits), model.postprocessor(ref_logits)
+    assert [word for word, _ in out] == [word for word, _ in ref_out]
+    assert np.allclose([conf for _, conf in out], [conf for _, conf in ref_out], atol=1e-4)
+
+
 @pytest.mark.parametrize(
     "arch_name",
     [
@@ -113,6 +186,30 @@ def test_recognition_zoo(arch_name):
     assert all(isinstance(word, str) and isinstance(conf, float) for word, conf in out)
 
 
+@pytest.mark.parametrize("arch_name", ["crnn_vgg16_bn", "crnn_mobilenet_v3_small"])
+def test_recognition_zoo_bucketed(arch_name):
+    predictor = recognition.zoo.recognition_predictor(
+        arch_name, pretrained=False, pretrained_backbone=False, bucket_widths=(32, 64, 128, 256)
+    )
+    crops = [(255 * np.random.rand(32, width, 3)).astype(np.uint8) for width in (200, 20, 100, 50, 400)]
+    out = predictor(crops)
+    assert isinstance(out, list) and len(out) == len(crops)
+    assert all(isinstance(word, str) and isinstance(conf, float) for word, conf in out)
+    assert set(predictor._bucket_pre_processors.keys()) == {32, 64, 128, 256}
+    # Predictions are returned in the order of the crops
+    assert out == [predictor([crop])[0] for crop in crops]
+    # Buckets can be set after the predictor is built
+    predictor = RecognitionPredictor(predictor.pre_processor, predictor.model)
+    predictor.bucket_widths = (32, 64, 128, 256)
+    assert predictor(crops) == out
+    # Buckets need a fixed output size
+    with pytest.raises(ValueError):
+        RecognitionPredictor(PreProcessor(32, batch_size=2), predictor.model, bucket_widths=(32, 64))
+    predictor = RecognitionPredictor(PreProcessor(32, batch_size=2), predictor.model)
+    with pytest.raises(ValueError):
+        predictor.bucket_widths = (32, 64)
+
+
 @pytest.mark.parametrize(
     "arch_name, input_shape",
     [
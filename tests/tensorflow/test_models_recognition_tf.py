@@ -113,6 +113,20 @@ def test_recognitionpredictor(mock_pdf, mock_vocab):
     return predictor
 
 
+def test_ctc_postprocessor_char_confs(mock_vocab):
+    processor = CTCPostProcessor(mock_vocab)
+    logits = tf.random.uniform(shape=[2, 30, len(mock_vocab) + 1], minval=0, maxval=1)
+    decoded = processor(logits, return_char_confs=True)
+    assert [(word, conf) for word, conf, _ in decoded] == processor.ctc_best_path(logits, mock_vocab, len(mock_vocab))
+    probs = tf.math.reduce_max(tf.nn.softmax(logits, axis=-1), axis=-1).numpy()
+    for (word, conf, char_confs), seq_probs in zip(decoded, probs):
+        assert len(char_confs) == len(word)
+        assert all(isinstance(char_conf, float) and conf <= char_conf <= 1 for char_conf in char_confs)
+        assert all(any(abs(char_conf - prob) < 1e-6 for prob in seq_probs.tolist()) for char_conf in char_confs)
+    with pytest.raises(ValueError):
+        processor(logits, beam_width=2, return_char_confs=True)
+
+
 @pytest.mark.parametrize(
     "arch_name",
     [
@@ -164,6 +178,30 @@ def test_crnn_beam_search(arch_name):
     )
 
 
+@pytest.mark.parametrize("arch_name", ["crnn_vgg16_bn", "crnn_mobilenet_v3_small"])
+def test_recognition_zoo_bucketed(arch_name):
+    predictor = recognition.zoo.recognition_predictor(
+        arch_name, pretrained=False, pretrained_backbone=False, bucket_widths=(32, 64, 128, 256)
+    )
+    crops = [(255 * np.random.rand(32, width, 3)).astype(np.uint8) for width in (200, 20, 100, 50, 400)]
+    out = predictor(crops)
+    assert isinstance(out, list) and len(out) == len(crops)
+    assert all(isinstance(word, str) and isinstance(conf, float) for word, conf in out)
+    assert set(predictor._bucket_pre_processors.keys()) == {32, 64, 128, 256}
+    # Predictions are returned in the order of the crops
+    assert out == [predictor([crop])[0] for crop in crops]
+    # Buckets can be set after the predictor is built
+    predictor = RecognitionPredictor(predictor.pre_processor, predictor.model)
+    predictor.bucket_widths = (32, 64, 128, 256)
+    assert predictor(crops) == out
+    # Buckets need a fixed output size
+    with pytest.raises(ValueError):
+        RecognitionPredictor(PreProcessor(32, batch_size=2), predictor.model, bucket_widths=(32, 64))
+    predictor = RecognitionPredictor(PreProcessor(32, batch_size=2), predictor.model)
+    with pytest.raises(ValueError):
+        predictor.bucket_widths = (32, 64)
+
+
 def test_recognition_zoo_error():
     with pytest.raises(ValueError):
         _ = recognition.zoo.recognition_predictor("my_fancy_model", pretrained=False)
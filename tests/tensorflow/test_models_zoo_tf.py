@@ -3,7 +3,7 @@ import pytest
 
 from doctr import models
 from doctr.file_utils import CLASS_NAME
-from doctr.io import Document, DocumentFile
+from doctr.io import Document, DocumentFile, Page
 from doctr.io.elements import KIEDocument
 from doctr.models import detection, recognition
 from doctr.models.detection.predictor import DetectionPredictor
@@ -78,6 +78,74 @@ def test_ocrpredictor(mock_pdf, mock_vocab, assume_straight_pages, straighten_pa
     assert out.pages[0].language["value"] == language
 
 
+@pytest.mark.parametrize("assume_straight_pages", [True, False])
+def test_ocrpredictor_pipelined(mock_pdf, mock_vocab, assume_straight_pages):
+    det_predictor = DetectionPredictor(
+        PreProcessor(output_size=(512, 512), batch_size=1),
+        detection.db_mobilenet_v3_large(
+            pretrained=True,
+            pretrained_backbone=False,
+            input_shape=(512, 512, 3),
+            assume_straight_pages=assume_straight_pages,
+        ),
+    )
+    reco_predictor = RecognitionPredictor(
+        PreProcessor(output_size=(32, 128), batch_size=16, preserve_aspect_ratio=True),
+        recognition.crnn_vgg16_bn(pretrained=False, pretrained_backbone=False, vocab=mock_vocab),
+    )
+    doc = DocumentFile.from_pdf(mock_pdf)
+
+    predictor = OCRPredictor(
+        det_predictor,
+        reco_predictor,
+        assume_straight_pages=assume_straight_pages,
+        detect_orientation=True,
+    )
+    out = predictor(doc)
+    predictor.pipelined = True
+    pipelined_out = predictor(doc)
+    assert isinstance(pipelined_out, Document)
+    assert len(pipelined_out.pages) == 2
+    # Same predictions with page batches processed one after the other
+    assert pipelined_out.render() == out.render()
+    for page, pipelined_page in zip(out.pages, pipelined_out.pages):
+        assert pipelined_page.page_idx == page.page_idx
+        assert pipelined_page.orientation == page.orientation
+        for word, pipelined_word in zip(
+            [word for block in page.blocks for line in block.lines for word in line.words],
+            [word for block in pipelined_page.blocks for line in block.lines for word in line.words],
+        ):
+            np.testing.assert_allclose(np.array(pipelined_word.geometry), np.array(word.geometry))
+            assert pipelined_word.value == word.value
+
+
+def test_ocrpredictor_stream(mock_pdf, mock_vocab):
+    det_predictor = DetectionPredictor(
+        PreProcessor(output_size=(512, 512), batch_size=2),
+        detection.db_mobilenet_v3_large(pretrained=True, pretrained_backbone=False, input_shape=(512, 512, 3)),
+    )
+    reco_predictor = RecognitionPredictor(
+        PreProcessor(output_size=(32, 128), batch_size=16, preserve_aspect_ratio=True),
+        recognition.crnn_vgg16_bn(pretrained=False, pretrained_backbone=False, vocab=mock_vocab),
+    )
+    doc = DocumentFile.from_pdf(mock_pdf)
+    predictor = OCRPredictor(det_predictor, reco_predictor)
+    out = predictor(doc)
+
+    # Pages are pulled from the iterable one at a time
+    pages = list(predictor.stream(iter(doc), window=1))
+    assert len(pages) == 2
+    assert all(isinstance(page, Page) for page in pages)
+    assert [page.page_idx for page in pages] == [0, 1]
+    assert Document(pages=pages).render() == out.render()
+    # Default window
+    assert len(list(predictor.stream(doc))) == 2
+    assert len(list(predictor.stream([]))) == 0
+    for window in (0, -1):
+        with pytest.raises(ValueError):
+            next(predictor.stream(doc, window=window))
+
+
 def test_trained_ocr_predictor(mock_payslip):
     doc = DocumentFile.from_images(mock_payslip)
 